@@ -1,5 +1,8 @@
 # Main package __init__.py
 from .src.odoo_python_api_wrapper import OdooTransaction, OdooBackend
+from .src.odoo_python_api_wrapper import AsyncOdooBackend, AsyncOdooTransaction
+from .src.odoo_python_api_wrapper import CachePolicy
+from .src.odoo_python_api_wrapper import PersistentRecordCache
 from .src.odoo_python_api_wrapper import OdooDataClass
 from .src.odoo_python_api_wrapper import OdooWrapperInterface
 from .src.odoo_python_api_wrapper import Klass
@@ -9,6 +12,10 @@ from .src.odoo_python_api_wrapper import ObjectWrapper
 __all__ = [
     'OdooTransaction', 
     'OdooBackend', 
+    'AsyncOdooBackend', 
+    'AsyncOdooTransaction', 
+    'CachePolicy', 
+    'PersistentRecordCache', 
     'OdooDataClass', 
     'OdooWrapperInterface', 
     'Klass', 
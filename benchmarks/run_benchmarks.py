@@ -0,0 +1,157 @@
+"""
+End-to-end benchmarks of the wrapper against the bundled fake Odoo server, no Odoo instance needed.
+
+    python benchmarks/run_benchmarks.py --records 10000 --latency 0.002
+    python benchmarks/run_benchmarks.py --only commit --json results.json
+
+Each workload runs on freshly seeded data with a new backend and reports wall time, RPC calls by model and
+method and peak Python memory, so runs before and after a change can be compared.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from odoo_python_api_wrapper import OdooBackend, Klass
+from odoo_python_api_wrapper.fake_server import FakeOdooServer
+from odoo_python_api_wrapper.generate_wrappers import generate
+
+MODELS = {'res.partner': 'Partner', 'res.partner.category': 'Category', 'account.move': 'Move', 'account.move.line': 'MoveLine'}
+
+
+class Bench:
+    def __init__(self, server:FakeOdooServer, records:int, wrappers_dir:str):
+        self.server = server
+        self.records = records
+        self.wrappers_dir = wrappers_dir
+        self.db: Any = None
+
+    def backend(self) -> OdooBackend:
+        return OdooBackend(self.server.url, username="admin", api_key="admin")
+
+    def seed(self) -> None:
+        store = self.server.store
+        for table in store.data.values():
+            table.clear()
+        n = self.records
+        categories = store.seed('res.partner.category', [{'name': f'Category {i}'} for i in range(20)])
+        parents = store.seed('res.partner', [{'name': f'Company {i}', 'email': f'c{i}@example.com', 'active': True} for i in range(max(1, n // 20))])
+        store.seed('res.partner', [{'name': f'Contact {i}', 'email': f'p{i}@example.com', 'active': True, 'credit': i * 1.5,
+                                    'date': '2024-01-01', 'parent_id': parents[i % len(parents)],
+                                    'category_id': [categories[i % len(categories)]]} for i in range(n)])
+        moves = store.seed('account.move', [{'name': f'INV/{i}', 'invoice_date': '2024-02-01', 'partner_id': parents[i % len(parents)]}
+                                            for i in range(max(1, n // 10))])
+        store.seed('account.move.line', [{'name': f'Line {i}', 'quantity': i % 7, 'price': 10.0 + i % 100, 'move_id': moves[i % len(moves)],
+                                          'partner_id': parents[i % len(parents)]} for i in range(n)])
+
+    # The workloads, each gets a fresh backend and returns a note for the report.
+
+    def generate_wrappers(self) -> str:
+        trans = self.backend().begin()
+        with contextlib.redirect_stdout(io.StringIO()):
+            written = generate(trans, [Klass(trans, model, name) for model, name in MODELS.items()], self.wrappers_dir, force=True)
+            unchanged = generate(trans, [Klass(trans, model, name) for model, name in MODELS.items()], self.wrappers_dir)
+        return f"{len(written)} written, then {len(MODELS) - len(unchanged)} unchanged"
+
+    def bulk_import(self) -> str:
+        trans = self.backend().begin()
+        for i in range(self.records):
+            p = self.db.Partner(trans)
+            p.name = f'Imported {i}'
+            p.email = f'i{i}@example.com'
+            p.credit = float(i)
+        trans.commit()
+        return f"{self.records} partners created"
+
+    def search(self) -> str:
+        trans = self.backend().begin()
+        partners = trans.search(self.db.Partner, [('name', 'like', 'Contact')])
+        return f"{len(partners)} partners read"
+
+    def get_by_id(self) -> str:
+        trans = self.backend().begin()
+        ids = sorted(id for id, r in self.server.store.data['res.partner'].items() if r['name'].startswith('Contact'))
+        trans.search(self.db.Partner, [('id', 'in', ids)])
+        for id in ids:
+            trans.get(self.db.Partner, 'id', id)
+        return f"{len(ids)} cached gets after one id search"
+
+    def relation_walk(self) -> str:
+        trans = self.backend().begin()
+        lines = trans.search(self.db.MoveLine, [('quantity', '>=', 0)])
+        names = {l.move_id.partner_id.name for l in lines}
+        children = sum(len(p.child_ids) for p in trans.search(self.db.Partner, [('name', 'like', 'Company')]))
+        return f"{len(lines)} lines to {len(names)} partners, {children} children"
+
+    def commit(self) -> str:
+        trans = self.backend().begin()
+        partners = trans.search(self.db.Partner, [('name', 'like', 'Contact')])
+        for i, p in enumerate(partners):
+            p.email = f'changed{i}@example.com' if i % 2 else 'same@example.com'
+            p.credit = p.credit + 1
+        trans.commit()
+        return f"{len(partners)} partners written"
+
+    WORKLOADS = ['generate_wrappers', 'bulk_import', 'search', 'get_by_id', 'relation_walk', 'commit']
+
+    def run(self, name:str) -> dict[str, Any]:
+        self.seed()
+        workload: Callable[[], str] = getattr(self, name)
+        before = Counter(self.server.calls)
+        tracemalloc.start()
+        start = time.perf_counter()
+        note = workload()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        calls = Counter(self.server.calls)
+        calls.subtract(before)
+        rpc = {f"{model}.{method}": n for (model, method), n in sorted(calls.items()) if n and model not in ('http', 'conn')}
+        return {'workload': name, 'seconds': seconds, 'rpc_calls': sum(rpc.values()), 'rpc': rpc,
+                'peak_memory_mb': peak / 1024 / 1024, 'note': note}
+
+
+def main(argv:list[str]|None = None) -> list[dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=10000, help="partners and move lines seeded before each workload")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the fake server waits on each call")
+    parser.add_argument('--only', nargs='*', choices=Bench.WORKLOADS, help="workloads to run, all by default")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with FakeOdooServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as wrappers_dir:
+        bench = Bench(server, args.records, wrappers_dir)
+        os.makedirs(os.path.join(wrappers_dir, 'db'))
+        trans = bench.backend().begin()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate(trans, [Klass(trans, model, name) for model, name in MODELS.items()], wrappers_dir)
+        sys.path.insert(0, wrappers_dir)
+        bench.db = importlib.import_module('db')
+
+        print(f"{'workload':<18} {'seconds':>9} {'rpcs':>6} {'peak MB':>8}  rpc calls / note")
+        for name in args.only or Bench.WORKLOADS:
+            r = bench.run(name)
+            results.append(r)
+            print(f"{r['workload']:<18} {r['seconds']:9.3f} {r['rpc_calls']:6d} {r['peak_memory_mb']:8.1f}  {r['note']}")
+            print(f"{'':<45}{', '.join(f'{k}: {v}' for k, v in r['rpc'].items())}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'records': args.records, 'latency': args.latency, 'results': results}, f, indent=1)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
 # src/__init__.py
 from .api_wrapper import OdooTransaction, OdooBackend
-from .data_class import OdooDataClass
+from .async_api import AsyncOdooBackend, AsyncOdooTransaction
+from .cache_policy import CachePolicy
+from .metrics import Metrics
+from .profiler import RpcProfiler
+from .persistent_cache import PersistentRecordCache
+from .query_cache import QueryCache
+from .data_class import OdooDataClass, model_class
 from .data_class_interface import OdooWrapperInterface
 from .generate_wrappers import Klass
 from .keepass_passwords import KeePass, KeePassCred
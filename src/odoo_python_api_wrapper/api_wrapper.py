@@ -1,26 +1,40 @@
 from __future__ import annotations  # This is crucial for forward references
 import copy
 from datetime import date, datetime
+import logging
 import re
+import sys
 import threading
+import time
 from .data_class_interface import OdooWrapperInterface
+from .domain import Predicate, UnsupportedDomain, compile_domain, references
+from .cache_policy import CachePolicy
+from .columns import ColumnBuilder
+from .metrics import Metrics
+from .persistent_cache import PersistentRecordCache
+from .profiler import RpcProfiler
+from .query_cache import QueryCache
+from .record_store import ConcurrentRecordStore, RecordStore
 from typing import TYPE_CHECKING, TypeVar
 if TYPE_CHECKING:
     from .data_class import OdooDataClass
     from .data_class import OdooManyToManyHelper
 
 from collections import defaultdict
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator
 from .utils import Timer
 import xmlrpc.client
+import base64
 import json
-import random
-import urllib
-import urllib.request
+from .connection_pool import ConnectionPool
+from .transports import READ_METHODS, OdooRpcTransport, XmlRpcTransport, make_transport, not_record_error
 from .keepass_passwords import KeePass
 from enum import Enum
 
 T = TypeVar('T', bound='OdooWrapperInterface')
+_log = logging.getLogger(__name__)
+
 class NoLock:
     """A dummy lock that does nothing, useful for debugging"""
     def __enter__(self) -> None:
@@ -30,23 +44,57 @@ class NoLock:
         pass
 
 class OdooTransaction:    
-    # lock = threading.RLock()
+    # A transaction belongs to one thread, the backend cache it shares with other threads does its own locking.
     lock = NoLock()
 
     def __init__(self, backend:OdooBackend):
         self.backend = backend
         self.objects:dict[str, OdooWrapperInterface] = {}
-        self.cache:dict[str, OdooWrapperInterface] = {}
+        self.cache:RecordStore = RecordStore()
         self.deletes:list[OdooWrapperInterface] = []
-        self.verbose_logs = True
+        self._children: dict[tuple[str,str,int], list[int]] = {} # (model, one2many, parent id) -> child ids read by _prefetch_children.
+        self._missing: set[str] = set() # "model:id" of related records the prefetch did not get back, deleted or not readable.
+        self.verbose_logs = True # logs what search/get/get2 do at DEBUG level, when the logger is enabled for it.
         self.aborted = False
-        self.rpcmodel = xmlrpc.client.ServerProxy('{}/xmlrpc/2/object'.format(self.url), allow_none=True)
+        self.profiler: RpcProfiler|None = None # set to trace every RPC of the transaction, see profile().
+
+    @property
+    def rpcmodel(self) -> xmlrpc.client.ServerProxy:
+        # Shared by all transactions, the backend's connection pool makes it thread safe.
+        return self.backend.rpcmodel
+
+    def _debug(self) -> bool:
+        return self.verbose_logs and _log.isEnabledFor(logging.DEBUG)
+
+    def _execute_kw(self, model:str, method:str, args:list, kwargs:dict[str,Any]|None=None) -> Any:
+        query_cache = self.backend.query_cache
+        if query_cache is not None and method not in READ_METHODS: # create, write, unlink and actions may change results.
+            try:
+                return self._execute_kw_profiled(model, method, args, kwargs)
+            finally: # also when it failed, part of a batch may have been applied.
+                query_cache.invalidate(model)
+        return self._execute_kw_profiled(model, method, args, kwargs)
+
+    def _execute_kw_profiled(self, model:str, method:str, args:list, kwargs:dict[str,Any]|None=None) -> Any:
+        profiler = self.profiler
+        if profiler is None:
+            return self.backend.transport.execute_kw(model, method, args, kwargs)
+        self.backend.metrics.take_transfer()
+        start = time.perf_counter()
+        result = self.backend.transport.execute_kw(model, method, args, kwargs)
+        profiler.record(model, method, args, time.perf_counter() - start, result, self.backend.metrics.take_transfer())
+        return result
+
+    def profile(self, n_plus_one:int = 5, **kwargs) -> RpcProfiler:
+        """Traces every RPC of this transaction, the report of the calls and of the N+1 patterns is printed at commit."""
+        self.profiler = RpcProfiler(n_plus_one, **kwargs)
+        return self.profiler
 
     def _key(self, x:OdooWrapperInterface) -> str:
         if not x.id: raise ValueError(f"Object must have an ID to be saved {x}")
         return f"{x.MODEL}:{x.id}"
     def _gen_working_id(self) -> int:
-        with self.lock:
+        with self.backend._working_id_lock:
             self.backend.working_id -= 1
             return self.backend.working_id
 
@@ -58,15 +106,31 @@ class OdooTransaction:
             if ret:
                 return ret # type: ignore
             elif x.transaction != self:
+                # No need to add to the transaction as the copy will have added itself in the constructor.
+                adopted = x._adopt(self) if hasattr(x, '_adopt') else None # type: ignore
+                if adopted is not None:
+                    return adopted
                 deep_copy = copy.deepcopy(x, memo={'trans':self}) # type: ignore
-                # No need to add to the transaction as it will have added itself in the constructor.
                 return deep_copy
             else:
                 self.objects[key] = x
                 self.cache[key] = x
-                self.backend.cache[key] = x
                 return x
 
+    def _publish(self, x:OdooWrapperInterface) -> None:
+        # Saved records go to the backend cache as read only snapshots, which other transactions adopt without copying.
+        if not x.id or x.id < 0:
+            return
+        key = self._key(x)
+        snapshot = getattr(x, '_snapshot', None)
+        if snapshot is None:
+            self.backend.cache[key] = x
+            return
+        current = dict.get(self.backend.cache, key)
+        if current is not None and current.peek_wrapped_oject() is x.peek_wrapped_oject():
+            return # unchanged since it was published.
+        self.backend.cache[key] = snapshot(self.backend.snapshots)
+
     def extend(self, e:list[T]) -> list[T]:
         with self.lock:
             ret = []
@@ -96,74 +160,139 @@ class OdooTransaction:
     def api_key(self): return self.backend.api_key
     
        
+    def _get_cached(self, model:str, field:str, value:Any) -> OdooWrapperInterface|None:
+        # Answers get() from the transaction and backend caches, without any RPC.
+        if field == "id":
+            assert value
+            key = f"{model}:{value}"
+            if key in self.cache:
+                self.backend.metrics.cache_lookup(model, True)
+                return self.cache[key]
+            self.backend.metrics.cache_lookup(model, False)
+            o = self.backend.cache.fetch(key)
+            return self.append(o) if o is not None else None
+                    
+        for o in self.cache.lookup(model, field, value):
+            if getattr(o,field) == value:
+                self.backend.metrics.cache_lookup(model, True)
+                if self._debug(): _log.debug("Get: %s  -- %s = %s (cache hit)", model, field, value)
+                return o
+        self.backend.metrics.cache_lookup(model, False)
+        for o in self.backend.cache.lookup(model, field, value):
+            if getattr(o,field) == value and self.backend.cache.hit(o):
+                if self._debug(): _log.debug("Get: %s  -- %s = %s (backend cache hit)", model, field, value)
+                return self.append(o)
+        self.backend.cache.miss(model)
+        return None
+
   #   record = env['event.registration'].search([('id', '=', 14)])
     def get(self, wrapper:type[T], field:str, value:Any) -> T|None:
+        self.backend.load_persisted(wrapper)
         with self.lock:
             model: str = wrapper._get_model()
+            ret = self._get_cached(model, field, value)
+            if ret is not None:
+                return ret # type: ignore
             
-            if field == "id":
-                assert value
-                key = f"{model}:{value}"
-                if key in self.cache:
-                    return self.cache[key]# type: ignore
-                if key in self.backend.cache:
-                    return self.append(self.backend.cache[key])# type: ignore
-                        
-            for _,o in enumerate(self.cache.values()):
-                if o.MODEL == model and getattr(o,field) == value:
-                    if self.verbose_logs: print(f"Get: {model}  -- {field} = {value} (cache hit)")
-                    return o # type: ignore
-            for _,o in enumerate(self.backend.cache.values()):
-                if o.MODEL == model and getattr(o,field) == value:
-                    if self.verbose_logs: print(f"Get: {model}  -- {field} = {value} (backend cache hit)")
-                    return self.append(o) # type: ignore
-            
-            if self.verbose_logs: print(f"Get: {model}  -- {field} = {value} (cache miss)")
+            if self._debug(): _log.debug("Get: %s  -- %s = %s (cache miss)", model, field, value)
             ret = self.search(wrapper, [(field, "=", value)],getting=True)
             if ret:
                 return ret[0]
             
-    def _matches_search(self, c:OdooWrapperInterface, search:list[tuple[str,str,Any]]):
-        for s in search:
-            sqv = getattr(c, s[0])
-            if s[1] == "=":
-                if isinstance(sqv,OdooWrapperInterface):
-                    if sqv.id != s[2]:
-                        return False
-                elif sqv != s[2]:
-                    return False
-            elif s[1] == "in":
-                if sqv not in s[2]:
-                    return False
-            else:
-                raise ValueError(f"Unknown search operator {s[1]}")
-        return True
+    def _predicate(self, model:str, search) -> Predicate|None:
+        # The search compiled for the cached records, None when only the server can answer it.
+        try:
+            return compile_domain(model, OdooTransaction._convert_search(search), self._cached_record)
+        except UnsupportedDomain:
+            return None
+
+    def _cached_record(self, model:str, id:int) -> OdooWrapperInterface|None:
+        key = f"{model}:{id}"
+        return self.cache.get(key) or self.backend.cache.get(key)
+
+    def _matches_search(self, c:OdooWrapperInterface, search) -> bool:
+        predicate = self._predicate(c.MODEL, search)
+        if predicate is None:
+            raise ValueError(f"Search {search} cannot be evaluated locally")
+        return predicate(c)
+
+    def _local_search(self, cache:RecordStore, model:str, search) -> list[OdooWrapperInterface]|None:
+        # The cached records matching the search, None when it cannot be evaluated locally.
+        predicate = self._predicate(model, search)
+        if predicate is None:
+            return None
+        # In a plain conjunction the first '=' or 'in' term narrows it down to the records sharing its value.
+        candidates = None
+        if all(not isinstance(s, str) for s in search):
+            for s in search:
+                if not self._indexable(model, s[0]):
+                    continue
+                if s[1] == "=" and s[2] is not False and s[2] is not None and not isinstance(s[2], (list, tuple)):
+                    candidates = cache.lookup(model, s[0], s[2])
+                    break
+                if s[1] == "in" and isinstance(s[2], (list, tuple, set)) and False not in s[2] and None not in s[2]:
+                    candidates = cache.lookup_in(model, s[0], s[2])
+                    break
+        if candidates is None:
+            candidates = cache.of_model(model)
+        try:
+            return [x for x in candidates if predicate(x)]
+        except UnsupportedDomain:
+            return None
+
+    @staticmethod
+    def _indexable(model:str, field:str) -> bool:
+        # The index buckets the attribute values: x2many by their whole list and dates as date objects, so it
+        # cannot find the records containing an id or matching a date string.
+        from .data_class import model_class
+        from .fields import DateField, DatetimeField, Many2many, One2many
+        cls = model_class(model)
+        return '.' not in field and not isinstance(getattr(cls, field, None), (One2many, Many2many, DateField, DatetimeField))
+
+    @staticmethod
+    def _unsaved(search) -> bool:
+        # A conjunction with an '=' on a working id, only records of this transaction can match it.
+        return all(not isinstance(s, str) for s in search) and \
+            any(s[1] == "=" and isinstance(s[2], int) and not isinstance(s[2], bool) and s[2] < 0 for s in search)
+
+    def _reindex(self, x:OdooWrapperInterface) -> None:
+        self.cache.reindex(x)
+        self.backend.cache.reindex(x)
+    def _get2_cached(self, model:str, search:list[tuple[str,str,Any]]) -> OdooWrapperInterface|None:
+        # Answers get2() from the transaction and backend caches, without any RPC.
+        if len(search) == 1 and search[0][0] == "id" and search[0][1] == "=":
+            key = f"{model}:{search[0][2]}"
+            if key in self.cache:
+                self.backend.metrics.cache_lookup(model, True)
+                return self.cache[key]
+            self.backend.metrics.cache_lookup(model, False)
+            o = self.backend.cache.fetch(key)
+            return self.append(o) if o is not None else None
+        for x in self._local_search(self.cache, model, search) or []:
+            self.backend.metrics.cache_lookup(model, True)
+            return x
+        self.backend.metrics.cache_lookup(model, False)
+        for x in self._local_search(self.backend.cache, model, search) or []:
+            if self.backend.cache.hit(x):
+                return self.append(x)
+        self.backend.cache.miss(model)
+        return None
+
   #   record = env['event.registration'].search([('id', '=', 14)])
     def get2(self, wrapper:type[T], search:list[tuple[str,str,Any]]) -> T|None:
+        self.backend.load_persisted(wrapper)
         with self.lock:
             model: str = wrapper._get_model() # type: ignore
-            only_local_search = True
-
-            if len(search) == 1 and search[0][0] == "id" and search[0][1] == "=":
-                key = f"{model}:{search[0][2]}"
-                if key in self.cache:
-                    return self.cache[key]# type: ignore
-                if key in self.backend.cache:
-                    return self.append(self.backend.cache[key])# type: ignore
-            else:
-                for cache in [self.cache, self.backend.cache]:
-                    for x in cache.values():
-                        if x.MODEL != model:
-                            continue
-                        if self._matches_search(x, search):
-                            return self.append(x) # type: ignore
+            ret = self._get2_cached(model, search)
+            if ret is not None:
+                return ret # type: ignore
 
             # Confirmed cache miss, record is not saved.
 
-            if len(search) == 1 and search[0][0] == "id" and search[0][1] == "=" and search[0][2] < 0:
+            if OdooTransaction._unsaved(search):
                 return None
 
-            if self.verbose_logs: print(f"Get2: {model}  -- {search} (cache miss)")
+            if self._debug(): _log.debug("Get2: %s  -- %s (cache miss)", model, search)
             ret = self.search(wrapper, search,getting=True)
             if ret:
                 return ret[0]
@@ -188,15 +317,9 @@ class OdooTransaction:
         return value
 
     def search_limit_order(self, wrapper:type[T], search, order:str, limit:int=1,fields=[],) -> T|None:
-        search_2 = []
-        for s in search:
-            if len(s) == 1:
-                search_2.append(s)  
-            else:                
-                search_2.append((s[0], s[1], OdooTransaction.convert_value(s[2])))
-                        
+        search_2 = OdooTransaction._convert_search(search)
         model: str = wrapper._get_model() # type: ignore
-        for x in self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'search_read', [search_2], {'fields': fields, 'limit': limit, 'order':order}):# type: ignore
+        for x in self._execute_kw(model, 'search_read', [search_2], {'fields': fields, 'limit': limit, 'order':order}):# type: ignore
             existing = self.cache.get(f"{model}:{x['id']}")
             if existing:
                 assert isinstance(existing, wrapper)
@@ -212,75 +335,329 @@ class OdooTransaction:
   #   record = env['event.registration'].search([('id', '=', 14)])
     def search(self, wrapper:type[T], search, fields=[], getting:bool=False) -> list[T]:
         p = '  ' if getting else ''
+        self.backend.load_persisted(wrapper)
 
         with self.lock:
             model: str = wrapper._get_model() # type: ignore
-            # Manually search for items in transaction if searching for an unsaved record.
-            if len(search) == 1 and search[0][1] == "=" and isinstance(search[0][2], int) and search[0][2] < 0:
-                ret = []
-                for x in self.cache.values():
-                    if x.MODEL != model:
-                        continue
-                    if self._matches_search(x, search):
-                        ret.append(x)
-
-                if self.verbose_logs: print(f"{p}Search: {model}  -- {search} (searched local for -ve id)")
+            ret = self._search_cached(model, search, p)
+            if ret is not None:
+                return ret # type: ignore
+        ids = OdooTransaction._id_in(search)
+        if ids is not None:
+            return self._search_ids(wrapper, model, ids, fields, p)
+        search_2 = OdooTransaction._convert_search(search)
+
+        query_cache = self.backend.query_cache
+        key = self._query_key(model, search_2, fields)
+        if key is not None:
+            assert query_cache is not None
+            cached_ids = query_cache.get(key)
+            if cached_ids is not None:
+                if self._debug(): _log.debug("%sSearch: %s  -- %s (query cache hit)", p, model, search)
+                return self._search_ids(wrapper, model, list(cached_ids), fields, p)
+            generation = query_cache.generation(model)
+
+        with Timer() as t:
+            ret = []
+            for page in self._search_read_ordered(model, search_2, fields):
+                with self.lock:
+                    for x in page:
+                        ret.append(self._wrap_row(wrapper, model, x))
+            if key is not None:
+                query_cache.put(key, [x.id for x in ret], generation) # type: ignore
+
+            if self._debug():
+                if search and len(search[0]) == 3 and search[0][0] == "id" and search[0][1] == "=" and not getting:
+                    _log.debug("%sSearch %2.1f: %s  -- %s (opportunity)", p, t.elapsed, model, search)
+                else: 
+                    _log.debug("%sSearch %2.1f: %s  -- %s", p, t.elapsed, model, search)
+
+        return ret
+
+    def _search_cached(self, model:str, search, p:str='') -> list[OdooWrapperInterface]|None:
+        # The searches that can be answered from the caches, None when the server has to be asked.
+        # Manually search for items in transaction if searching for an unsaved record, the server has none of them.
+        if OdooTransaction._unsaved(search):
+            ret = self._local_search(self.cache, model, search) or []
+
+            if self._debug(): _log.debug("%sSearch: %s  -- %s (searched local for -ve id)", p, model, search)
+            return ret
+        if model in self.backend.cache.complete:
+            ret = self._search_complete(model, search)
+            if ret is not None:
+                if self._debug(): _log.debug("%sSearch: %s  -- %s (searched local, every record is cached)", p, model, search)
                 return ret
-            if len(search) == 1 and search[0][1] == "in" and isinstance(search[0][2], list):
-                ret = []
-                for x in search[0][2]:
-                    xo = self.get(wrapper, search[0][0], x)
-                    if xo:
-                        ret.append(xo)
-                    else:
-                        ret = None
-                        break
-                if ret:
-                    if self.verbose_logs: print(f"{p}Search: {model}  -- {search} (searched local for in)")
-                    return ret
+        if len(search) == 1 and search[0][1] == "in" and isinstance(search[0][2], list) and search[0][0] != "id":
+            ret = []
+            for x in search[0][2]:
+                xo = self._get_cached(model, search[0][0], x)
+                if xo:
+                    ret.append(xo)
+                else:
+                    return None
+            if ret:
+                if self._debug(): _log.debug("%sSearch: %s  -- %s (searched local for in)", p, model, search)
+                return ret
+        return None
+
+    def _search_complete(self, model:str, search) -> list[OdooWrapperInterface]|None:
+        # Searches the saved records of a model the backend cache has all of, as this transaction sees them.
+        # Archived records are left out unless the search is on active, like the server does. Ordered by id.
+        predicate = self._predicate(model, search)
+        if predicate is None:
+            return None
+        active = not references(search, 'active')
+        deleted = {x.id for x in self.deletes if x.MODEL == model}
+        records = {x.id: x for x in self.backend.cache.of_model(model) if x.id and x.id > 0}
+        records.update((x.id, x) for x in self.cache.of_model(model) if x.id and x.id > 0)
+        ret = []
+        try:
+            for id in sorted(records):
+                x = records[id]
+                if id in deleted or (active and x.get_value('active', True) is False) or not predicate(x):
+                    continue
+                if x.transaction is not self:
+                    if not self.backend.cache.hit(x):
+                        return None # outlived its ttl, the model is no longer complete.
+                    x = self.append(x)
+                ret.append(x)
+        except UnsupportedDomain:
+            return None
+        return ret
+
+    @staticmethod
+    def _convert_search(search) -> list:
         search_2 = []
         for s in search:
             if len(s) == 1:
                 search_2.append(s)  
             else:                
                 search_2.append((s[0], s[1], OdooTransaction.convert_value(s[2])))
+        return search_2
+
+    def _wrap_row(self, wrapper:type[T], model:str, x:dict[str,Any], keep:bool=True) -> T:
+        # First check if this object is already in the transactions.
+        existing = self.cache.get(f"{model}:{x['id']}")
+        if existing:
+            return existing # type: ignore
+        id = x["id"]
+        # Field names repeat in every row, interning them keeps one copy of each.
+        ret = wrapper(self, id, {sys.intern(k): v for k, v in x.items() if k != "id"})
+        if keep:
+            self._publish(ret)
+        else:
+            # Not held by the transaction nor the backend cache, it joins the transaction when it is changed.
+            key = self._key(ret)
+            self.objects.pop(key, None)
+            self.cache.pop(key, None)
+        return ret # type: ignore
+
+    def _search_read_pages(self, model:str, search:list, fields=[], page_size:int|None=None, order:str|None=None, keyset:bool=True,
+                           context:dict[str,Any]|None=None) -> Iterator[list[dict[str,Any]]]:
+        """
+        Yields search_read results one page at a time, fetching the next page on a background thread
+        while the caller works through the current one.
+        With keyset the pages are ordered by id and each page asks for ids above the last one seen,
+        otherwise offset/limit is used with the given (or the model's default) order.
+        """
+        page_size = page_size or self.backend.search_page_size
+        if keyset:
+            order = 'id'
+        self.uid # authenticate before the prefetch thread needs it.
+
+        def fetch(after_id:int|None, offset:int) -> list[dict[str,Any]]:
+            kwargs: dict[str,Any] = {'fields': fields, 'limit': page_size}
+            domain = search
+            if keyset:
+                if after_id is not None:
+                    domain = list(search) + [('id', '>', after_id)]
+            elif offset:
+                kwargs['offset'] = offset
+            if order:
+                kwargs['order'] = order
+            if context:
+                kwargs['context'] = context
+            rows = self._execute_kw(model, 'search_read', [domain], kwargs)
+            if not fields and self.backend.persistent_cache is not None:
+                self.backend.persistent_cache.store(model, rows)
+            return rows # type: ignore
+
+        prefetcher: ThreadPoolExecutor|None = None
+        try:
+            page = fetch(None, 0)
+            offset = 0
+            while page:
+                offset += len(page)
+                next_page = None
+                if len(page) >= page_size:
+                    if prefetcher is None:
+                        prefetcher = ThreadPoolExecutor(max_workers=1)
+                    next_page = prefetcher.submit(fetch, page[-1]['id'], offset)
+                yield page
+                page = next_page.result() if next_page else None
+        finally:
+            if prefetcher:
+                prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    def _query_key(self, model:str, search_2, fields=[]) -> tuple|None:
+        # The field types tell the query cache which terms depend on other models, read once per model.
+        query_cache = self.backend.query_cache
+        if query_cache is None:
+            return None
+        return query_cache.key(model, search_2, fields, self.backend.field_types(model))
+
+    def _search_read_ordered(self, model:str, search:list, fields=[]) -> Iterator[list[dict[str,Any]]]:
+        """
+        search_read in the model's default order. A result that fits in one page costs a single call. A longer one
+        is listed as ids, in that order, and read in chunks: with offset/limit rows written meanwhile could be skipped
+        or read twice.
+        """
+        size = self.backend.search_page_size
+        first = self._execute_kw(model, 'search_read', [search], {'fields': fields, 'limit': size})
+        if not fields and self.backend.persistent_cache is not None:
+            self.backend.persistent_cache.store(model, first)
+        if len(first) < size:
+            yield first
+            return
+        ids = self._execute_kw(model, 'search', [search])
+        rows = {x['id']: x for x in first}
+        for n in range(0, len(ids), size):
+            chunk = ids[n:n+size]
+            for page in self._id_pages(model, [id for id in chunk if id not in rows], fields):
+                rows.update((x['id'], x) for x in page)
+            yield [rows.pop(id) for id in chunk if id in rows] # rows deleted since the ids were listed are left out.
+
+    @staticmethod
+    def _id_in(search) -> list[int]|None:
+        if len(search) == 1 and len(search[0]) == 3 and search[0][0] == "id" and search[0][1] == "in" and isinstance(search[0][2], list):
+            return search[0][2]
+        return None
 
+    def _cached_ids(self, model:str, ids:Iterable[int]) -> tuple[dict[int, OdooWrapperInterface], list[int]]:
+        # Splits ids into the records found in the caches and the saved ids that have to be read.
+        found: dict[int, OdooWrapperInterface] = {}
+        missing: list[int] = []
+        for id in dict.fromkeys(ids):
+            x = self._get_cached(model, "id", id) if id else None
+            if x is not None:
+                found[id] = x
+            elif isinstance(id, int) and id > 0 and f"{model}:{id}" not in self._missing:
+                missing.append(id)
+        return found, missing
+
+    def _id_pages(self, model:str, ids:list[int], fields=[], context:dict[str,Any]|None=None) -> Iterator[list[dict[str,Any]]]:
+        """search_read of ids in chunks of search_page_size, instead of one get() per id."""
+        size = self.backend.search_page_size
+        for n in range(0, len(ids), size):
+            chunk = ids[n:n+size]
+            # A chunk fits in one page, the extra row keeps the reader from asking for a next, empty, page.
+            yield from self._search_read_pages(model, [('id', 'in', chunk)], fields, page_size=len(chunk) + 1, context=context)
+
+    def _search_ids(self, wrapper:type[T], model:str, ids:list[int], fields=[], p:str='') -> list[T]:
+        # ('id', 'in', ids): cached records are used as they are and only the missing ids are read, in the requested order.
+        found, missing = self._cached_ids(model, ids)
         with Timer() as t:
-            ret = []
+            for page in self._id_pages(model, missing, fields):
+                with self.lock:
+                    for x in page:
+                        id = x['id']
+                        found[id] = self._wrap_row(wrapper, model, x)
+        if self._debug(): _log.debug("%sSearch %2.1f: %s  -- id in %d ids (%d read)", p, t.elapsed, model, len(ids), len(missing))
+        return [found[id] for id in dict.fromkeys(ids) if id in found] # type: ignore
+
+    def _fetch_ids(self, wrapper:type[T], ids:Iterable[int]) -> None:
+        """
+        Loads the records of ids that are not cached yet, without adding the cached ones to the transaction.
+        Archived records are read too, as Odoo's read does. The ids that do not come back are not asked for again.
+        """
+        self.backend.load_persisted(wrapper)
+        model: str = wrapper._get_model() # type: ignore
+        missing = []
+        for id in dict.fromkeys(ids):
+            key = f"{model}:{id}"
+            if id and id > 0 and key not in self.cache and key not in self.backend.cache and key not in self._missing:
+                missing.append(id)
+        unread = set(missing)
+        for page in self._id_pages(model, missing, context={'active_test': False}):
             with self.lock:
-                for x in self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'search_read', [search_2], {'fields': fields, 'limit': 5000}):# type: ignore
-                    # First check if this object is already in the transactions.
-                    existing = self.cache.get(f"{model}:{x['id']}")
-                    if existing:
-                        ret.append(existing)
-                    else:
-                        id = x["id"]
-                        del x["id"]
-                        nr:T = wrapper(self, id, x) # type: ignore
-                        ret.append(nr) 
-
-            if self.verbose_logs and search in [ # these are search, not get. And they could be lazy. It is fetching them just in case.
-                    [('name', '=', 'Kelsey Janssen'), ('function', 'in', ['Owner', 'Manager', 'Consultant'])],
-                    [('name', '=', 'Sharon Smith'), ('function', 'in', ['Owner', 'Manager', 'Consultant'])]
-                ]:
-                print("debug")
-            if self.verbose_logs and search not in[
-                    [('related_cto_numbers', '=', False)],
-                    ['&', ('sync_date', '=', False), ('name', '!=', False)],
-                    ['&', ('matched_status', '=', 'new'), ('related_cto_numbers', '!=', 'No match')],
-
-                ]:
-
-                if (search[0][0] == "id" and search[0][1] == "=") and not getting:
-                    print(f"{p}Search {t.elapsed:2.1f}: {model}  -- {search} (opportunity)")
-                else: 
-                    print(f"{p}Search {t.elapsed:2.1f}: {model}  -- {search}")
-                    pass
-                if len(search) == 1 and search[0][1] == "=" and isinstance(search[0][2], int) and search[0][2] < 0:
-                    print(f"{p}Search {t.elapsed:2.1f}: {model}  -- {search} (negative id)")
-                pass
-
-        return ret
+                for x in page:
+                    unread.discard(x['id'])
+                    self._wrap_row(wrapper, model, x)
+        self._missing.update(f"{model}:{id}" for id in unread)
+
+    def _prefetch_many2one(self, model:str, field:str, wrapper:type[T]) -> None:
+        # Like Odoo's ORM prefetching: resolving field on one record reads it for every record of model in the transaction.
+        ids = []
+        for x in self.cache.of_model(model):
+            value = x.peek_wrapped_oject().get(field)
+            if isinstance(value, int) and not isinstance(value, bool):
+                ids.append(value)
+            elif isinstance(value, (list, tuple)) and value:
+                ids.append(value[0])
+        self._fetch_ids(wrapper, ids)
+
+    def _prefetch_x2many(self, model:str, field:str, wrapper:type[T]) -> None:
+        # Reads the ids listed in field for every record of model in the transaction that has not resolved it yet.
+        ids = []
+        for x in self.cache.of_model(model):
+            if field in (getattr(x, '_related', None) or ()):
+                continue
+            value = x.peek_wrapped_oject().get(field)
+            if isinstance(value, list):
+                ids.extend(v for v in value if isinstance(v, int))
+        self._fetch_ids(wrapper, ids)
+
+    def _prefetch_children(self, model:str, field:str, wrapper:type[T], inverse:str) -> None:
+        # For one2many fields that were not read: one search on inverse for every parent of model in the transaction.
+        parents = []
+        for x in self.cache.of_model(model):
+            if (x.id and x.id > 0 and field not in (getattr(x, '_related', None) or ()) and x.peek_wrapped_oject().get(field) is None
+                    and (model, field, x.id) not in self._children):
+                parents.append(x.id)
+        child_model: str = wrapper._get_model() # type: ignore
+        size = self.backend.search_page_size
+        for n in range(0, len(parents), size):
+            chunk = parents[n:n+size]
+            children: dict[int, list[int]] = {id: [] for id in chunk}
+            for page in self._search_read_pages(child_model, [(inverse, 'in', chunk)]):
+                with self.lock:
+                    for x in page:
+                        parent = x.get(inverse)
+                        if isinstance(parent, (list, tuple)):
+                            parent = parent[0] if parent else None
+                        if parent in children:
+                            children[parent].append(x['id'])
+                        self._wrap_row(wrapper, child_model, x)
+            for id, ids in children.items():
+                self._children[(model, field, id)] = ids
+
+    def read_columns(self, model:str, domain, fields:list[str]=[], page_size:int|None=None) -> dict[str, Any]:
+        """
+        Reads model straight into columns, {field: values}, for analytics over many rows. The values are numpy arrays
+        when numpy is installed, lists otherwise. many2one fields are split into ids and a "<field>.name" column and
+        dates are parsed. No records are created and the caches are neither used nor filled. Without fields every field is read.
+        """
+        types = self.backend.field_types(model)
+        fields = [f for f in (fields or types) if f != 'id']
+        builder = ColumnBuilder(['id'] + fields, {**types, 'id': 'id'})
+        for page in self._search_read_pages(model, OdooTransaction._convert_search(domain), fields, page_size=page_size):
+            builder.add(page)
+        return builder.columns()
+
+    def search_iter(self, wrapper:type[T], search, fields=[], page_size:int|None=None, order:str|None=None) -> Iterator[T]:
+        """
+        Like search, but yields records as each page arrives instead of loading the whole result first.
+        Without an order the pages are read by ascending id (keyset pagination), with an order offset/limit is used.
+        Records the transaction does not have yet are neither kept by it nor published to the backend cache, so
+        only the current and the prefetched page are held. A record joins the transaction when it is changed, changing
+        it raises ValueError if the transaction read the record again in the meantime.
+        """
+        model: str = wrapper._get_model() # type: ignore
+        for page in self._search_read_pages(model, OdooTransaction._convert_search(search), fields, page_size, order, keyset=order is None):
+            for x in page:
+                with self.lock:
+                    nr = self._wrap_row(wrapper, model, x, keep=False)
+                yield nr
 
     def search_singleton(self, wrapper:type[T], search, fields=[]) -> T|None: 
         with self.lock:
@@ -300,39 +677,89 @@ class OdooTransaction:
 
 
     def search_raw(self, model:str, search, fields=[]) -> list[OdooWrapperInterface]:
+        # In the model's default order, like search. search_raw_iter reads by id.
+        from .object_wrapper import ObjectWrapper
         with self.lock:
-            ret = []
-            for x in self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'search_read', [search], {'fields': fields, 'limit': 5000}):# type: ignore
-                from .object_wrapper import ObjectWrapper
-                ret.append(ObjectWrapper(self, model,x)) # type: ignore
-            return ret
+            return [ObjectWrapper(self, model, x) for page in self._search_read_ordered(model, search, fields) for x in page] # type: ignore
+
+    def search_raw_iter(self, model:str, search, fields=[], page_size:int|None=None, order:str|None=None, keyset:bool|None=None) -> Iterator[OdooWrapperInterface]:
+        # Raw rows are not added to the transaction, so memory stays bounded by the page size.
+        from .object_wrapper import ObjectWrapper
+        if keyset is None:
+            keyset = order is None
+        for page in self._search_read_pages(model, search, fields, page_size, order, keyset):
+            for x in page:
+                yield ObjectWrapper(self, model,x) # type: ignore
     
     def read(self, model:str, id, fields) -> OdooWrapperInterface:
         with self.lock:
             from .object_wrapper import ObjectWrapper
-            return ObjectWrapper(self, model, self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'read', [[id]], {'fields': fields})[0])# type: ignore
+            return ObjectWrapper(self, model, self._execute_kw(model, 'read', [[id]], {'fields': fields})[0])# type: ignore
     
     def create(self, model:str, rec:list[dict[str,Any]]) -> list[int]:
         with self.lock:
-            return self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'create', rec) # type: ignore
-
-    def write(self, model:str, id_pk, rec):
-        with self.lock:
+            return self._execute_kw(model, 'create', rec) # type: ignore
 
-            # loop through all keys in rec and sanitize values
-            for k,v in list(rec.items()):
-                if v is None:
-                    rec[k] = False
-                else:
-                    rec[k] = OdooTransaction.convert_value(v)
+    @staticmethod
+    def _sanitize(rec:dict[str,Any]) -> dict[str,Any]:
+        # loop through all keys in rec and sanitize values
+        for k,v in list(rec.items()):
+            if v is None:
+                rec[k] = False
+            else:
+                rec[k] = OdooTransaction.convert_value(v)
+        return rec
 
-            if self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'write', [[id_pk], rec]):
+    def write(self, model:str, id_pk:int|list[int], rec):
+        with self.lock:
+            OdooTransaction._sanitize(rec)
+            ids = id_pk if isinstance(id_pk, list) else [id_pk]
+            if self._execute_kw(model, 'write', [ids, rec]):
                 return True
             return False
 
+    @staticmethod
+    def _freeze(v:Any) -> Any:
+        if isinstance(v, dict):
+            return tuple(sorted((k, OdooTransaction._freeze(x)) for k,x in v.items()))
+        if isinstance(v, (list, tuple)):
+            return tuple(OdooTransaction._freeze(x) for x in v)
+        return (type(v), v) # keep 1, 1.0 and True apart.
+
+    def _write_batched(self, model:str, to_update:list[dict[str,Any]], to_updatem:list[OdooWrapperInterface], on_written) -> None:
+        # Records with identical changes share one write([ids], vals), other groups are sent concurrently.
+        groups: dict[Any, list[int]] = {}
+        for i, em in enumerate(to_update):
+            if em:
+                OdooTransaction._sanitize(em)
+                groups.setdefault(OdooTransaction._freeze(em), []).append(i)
+
+        size = max(1, self.backend.write_batch_size)
+        chunks = [idx[n:n+size] for idx in groups.values() for n in range(0, len(idx), size)]
+        def send(chunk:list[int]) -> list[int]:
+            self.write(model, [to_updatem[i].id for i in chunk], to_update[chunk[0]])
+            return chunk
+
+        if len(chunks) <= 1 or self.backend.rpc_workers <= 1:
+            for chunk in chunks:
+                on_written(send(chunk))
+            return
+
+        self.uid # authenticate once before the workers start.
+        with ThreadPoolExecutor(max_workers=self.backend.rpc_workers) as pool:
+            futures = [pool.submit(send, chunk) for chunk in chunks]
+            errors = []
+            for f in futures:
+                try:
+                    on_written(f.result())
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+
     def update_many_to(self, model:str, special_command):
         with self.lock:
-            return self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'write', special_command)
+            return self._execute_kw(model, 'write', special_command)
 
     def delete(self, to_delete:OdooWrapperInterface) -> None:
         if to_delete.id > 0:
@@ -347,21 +774,41 @@ class OdooTransaction:
                 model = wrapper
             else:
                 model: str = wrapper._get_model() # type: ignore
-            # if rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'unlink', [ids]):
-            #     return True
-            # return False
-            for id in ids:
-                if id:
-                    self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, 'unlink', [id])
+            ids = [id for id in ids if id]
+            if self.backend.persistent_cache is not None:
+                self.backend.persistent_cache.discard(model, ids)
+            size = max(1, self.backend.unlink_chunk_size)
+            failed: list[tuple[int, Exception]] = []
+            for n in range(0, len(ids), size):
+                self._unlink_chunk(model, ids[n:n+size], failed)
+            if failed:
+                raise ValueError(f"Could not unlink {model} ids {[id for id,_ in failed]}: {failed[0][1]}") from failed[0][1]
+
+    def _unlink_chunk(self, model:str, ids:list[int], failed:list[tuple[int, Exception]]) -> None:
+        # unlink is all or nothing, so split a failing chunk until the records that fail are isolated. Odoo reports
+        # every constraint the same way, only errors no record causes (connection, access rights) stop the split.
+        try:
+            self._execute_kw(model, 'unlink', [ids])
+            return
+        except Exception as e:
+            if not_record_error(e):
+                raise
+            error = e
+        if len(ids) == 1:
+            failed.append((ids[0], error))
+            return
+        half = len(ids) // 2
+        self._unlink_chunk(model, ids[:half], failed)
+        self._unlink_chunk(model, ids[half:], failed)
 
     def execute_action(self, model:str, action:str,search):
         with self.lock:
-            if self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, action, search):
+            if self._execute_kw(model, action, search):
                 return True
             return False
     def execute_action2(self, model:str, action:str,p1,p2):
         with self.lock:
-            if self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, model, action, [p1,p2]):
+            if self._execute_kw(model, action, [p1,p2]):
                 return True
             return False
 
@@ -369,60 +816,33 @@ class OdooTransaction:
         with self.lock:
 
             try:
-                # Create the URL for the controller endpoint
-                endpoint = f"{self.url}/{path}"
-
                 # Set up headers with proper authentication
+                credentials = base64.b64encode(f"{self.backend.username}:{self.backend.api_key}".encode()).decode()
                 headers = {
                     'Content-Type': 'application/json',
-                    'Accept': 'application/json'
+                    'Accept': 'application/json',
+                    'Authorization': f"Basic {credentials}",
                 }
 
-                # Import requests if not already imported
-                import requests
-                import json
-
-                # Create session with authentication
-                session = requests.Session()
-                session.auth = (self.backend.username, self.backend.api_key)
-
                 # Make the request
-                response = session.post(
-                    endpoint,
-                    headers=headers,
-                    json=post_json
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
+                response, content = self.backend.pool.request(f"/{path}", json.dumps(post_json).encode(), headers)
+
+                if response.status == 200:
+                    result = json.loads(content)
                 else:
-                    print(f"Error: {response.status_code} - {response.text}")
-                    raise Exception(f"Failed to call controller: {response.text}")
+                    _log.error("Error: %s - %s", response.status, content.decode('UTF-8', 'replace'))
+                    raise Exception(f"Failed to call controller: {content.decode('UTF-8', 'replace')}")
 
             except Exception as e:
-                print(f"Error calling controller: {str(e)}")
+                _log.error("Error calling controller: %s", e)
 
     def _execute_actionj(self, rpc_service, rpc_method, params):
         with self.lock:
-            url = f"{self.url}/jsonrpc"
-            data = {
-                "jsonrpc": "2.0",
-                "method": "call",
-                "params": {"service": rpc_service, "method": rpc_method, "args": 
+            return self.backend.transport.call(rpc_service, rpc_method,
                         [self.db, 
                             self.uid if rpc_service != "common" else self.backend.username, 
                             self.api_key]+
-                            params},
-                "id": random.randint(0, 1000000000),
-            }
-            req = urllib.request.Request(url=url, data=json.dumps(data).encode(), headers={
-                "Content-Type":"application/json",
-            })
-            reply = json.loads(urllib.request.urlopen(req).read().decode('UTF-8'))
-            if reply.get("error"):
-                raise Exception(reply["error"])
-            
-            return reply["id"]
+                            params)
 
     def execute_actionj(self, model, method, params):
         return self._execute_actionj("object", "execute", [model,method]+params)
@@ -436,12 +856,12 @@ class OdooTransaction:
     def install_module(self, module:str):
         raise Exception("This has not been tested.")
         with self.lock:
-            return self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, 'ir.module.module', 'button_install', [[module]])
+            return self._execute_kw('ir.module.module', 'button_install', [[module]])
 
     def uninstall_module(self, module:str):
         raise Exception("This has not been tested.")
         with self.lock:
-            return self.rpcmodel.execute_kw(self.db, self.uid, self.api_key, 'ir.module.module', 'button_immediate_uninstall', [[module]])
+            return self._execute_kw('ir.module.module', 'button_immediate_uninstall', [[module]])
 
     def _get_changes_early_save(self, v:OdooWrapperInterface):
         from .data_class import OdooManyToManyHelper
@@ -525,13 +945,20 @@ class OdooTransaction:
                 if id(self.objects[keys[i]]) == id(self.objects[keys[j]]):
                     duplicates.append((keys[i], keys[j]))
         if duplicates:
-            print(f"Found {len(duplicates)} duplicates")
+            _log.warning("Found %d duplicates", len(duplicates))
         return duplicates
     
     def abort(self) -> None:
         self.aborted = True
 
     def commit(self) -> None:
+        try:
+            self._commit()
+        finally:
+            if self.profiler is not None:
+                self.profiler.finish()
+
+    def _commit(self) -> None:
         if self.aborted:
             raise ValueError("Transaction was aborted")
 
@@ -577,16 +1004,15 @@ class OdooTransaction:
                     # print(f"created {to_create}")
 
                 for x in to_createm:
-                    self.backend.cache[self._key(x)] = copy.deepcopy(x, memo={'trans':self})# type: ignore
+                    self._publish(x)
 
             for model in models: 
                 to_update,to_updatem = self._get_changes(model, False)
+                if to_updatem and self.backend.persistent_cache is not None: # the rows kept on disk are about to go stale.
+                    self.backend.persistent_cache.discard(model, [x.id for x in to_updatem])
 
-                for i, em in enumerate(to_update):
-                    if em:
-                        emdo = to_updatem[i]  
-                        self.write(model, emdo.id, em)
-
+                def written(chunk:list[int]) -> None:
+                    for i in chunk:
                         for k,v in to_update[i].items(): # delete any keys that were saved
                             to_updatem[i].wrapped_oject[k] = v
 
@@ -595,8 +1021,10 @@ class OdooTransaction:
                             except KeyError as e:
                                 if not k == "category_id" and not k == "consultant": # Many to many puts 2 changes in the list...
                                     raise e  # an error here may indicate a transaction shared between threads...
+
+                self._write_batched(model, to_update, to_updatem, written)
                 for x in to_updatem:
-                    self.backend.cache[self._key(x)] = copy.deepcopy(x, memo={'trans':self})# type: ignore
+                    self._publish(x)
 
             delete_groups = defaultdict(list)
             for d in self.deletes:
@@ -606,19 +1034,42 @@ class OdooTransaction:
             for cls, ids in delete_groups.items():
                 self.execute_delete(cls, ids)
 
-            self.backend.cache.update(self.cache)
+            for x in list(self.cache.values()):
+                self._publish(x)
 
             self.deletes.clear()
             self.cache.clear()
             self.objects.clear()
+            self._children.clear()
             
 
 
+class _SnapshotTransaction(OdooTransaction):
+    """
+    The transaction of the snapshots in the backend cache, their relations are resolved through it.
+    It keeps no records itself, so snapshots evicted from the backend cache are not held on to, and is never committed.
+    """
+    def __init__(self, backend:OdooBackend):
+        super().__init__(backend)
+        self.verbose_logs = False
+
+    def append(self, x:T) -> T:
+        if x.transaction is self:
+            return x
+        return super().append(x)
+
+    def commit(self) -> None:
+        raise ValueError("Snapshots are read only")
+
+
 # TODO: Create a TRANS_ID in the object that doesn't change once mappeed into a trans.
 # USE THAT FOR EQUALS as well.
 
 class OdooBackend:
-    def __init__(self, db, save_order = []):
+    def __init__(self, db, save_order = [], pool_size:int = 8, pool_idle_timeout:float = 60.0,
+                 transport:str|type[OdooRpcTransport]|OdooRpcTransport = "xmlrpc", cache_policy:CachePolicy|None = None,
+                 persistent_cache:str|PersistentRecordCache|None = None, username:str|None = None, api_key:str|None = None,
+                 query_cache:QueryCache|None = None):
         if db.startswith('http'):
             self.url = db
             match = re.search(r"https?://([^.]+)", self.url)
@@ -627,25 +1078,200 @@ class OdooBackend:
             self.url = f"https://{db}.odoo.com"
             self.db = db
 
-        p = KeePass().get_login(re.sub(r"https?", "api", self.url))
-        self.username = p.login
-        self.api_key = p.password
+        if username is not None and api_key is not None:
+            self.username = username
+            self.api_key = api_key
+        else:
+            p = KeePass().get_login(re.sub(r"https?", "api", self.url))
+            self.username = p.login
+            self.api_key = p.password
         self.modelCache:dict[str,list[str]] = {}
         self._lazy_uid:str|None = None
+        self._uid_lock = threading.Lock()
         
         self.save_order = save_order
 
-        self.cache:dict[str, OdooWrapperInterface] = {}
+        # Shared by the transactions of every thread, so it is lock striped. cache_policy bounds every model, see set_cache_policy.
+        self.cache:ConcurrentRecordStore = ConcurrentRecordStore(policy=cache_policy)
         self.working_id = -100
+        self._working_id_lock = threading.Lock()
+        self._watermarks: dict[str, str] = {} # model -> latest write_date seen by refresh()
+        self._field_types: dict[str, dict[str, str]] = {}
+
+        # Optional SQLite file that keeps search_read rows between runs, see load_persisted.
+        if isinstance(persistent_cache, str):
+            persistent_cache = PersistentRecordCache(persistent_cache)
+        self.persistent_cache: PersistentRecordCache|None = persistent_cache
+        self._persist_loaded: set[str] = set()
+        self._persist_lock = threading.Lock()
+        # Optional ids of repeated searches, dropped when the model is written, see QueryCache.
+        self.query_cache: QueryCache|None = query_cache
+
+        self.write_batch_size = 500 # ids per write() call when records share the same changes.
+        self.rpc_workers = 4 # concurrent calls used when a commit has several writes to send.
+        self.search_page_size = 5000 # rows per search_read page in search, search_iter and search_raw.
+        self.unlink_chunk_size = 500 # ids per unlink() call, failing chunks are split to find the bad record.
+
+        # Keep-alive connections shared by every transaction and RPC of this backend.
+        self.pool = ConnectionPool(self.url, size=pool_size, idle_timeout=pool_idle_timeout)
+        # "xmlrpc" or "jsonrpc", every call of the transactions goes through it.
+        self.transport: OdooRpcTransport = make_transport(transport, self)
+        # Owner of the read only snapshots of saved records kept in cache.
+        self.snapshots: OdooTransaction = _SnapshotTransaction(self)
+        # RPC counters and latencies, bytes on the wire and cache hit ratios, see Metrics.
+        self.metrics = Metrics(self.cache)
+        self.pool.observer = self.metrics.transferred
 
 
     @property
     def uid(self) -> str|None:
         if not self._lazy_uid:
-            rpcmodel = xmlrpc.client.ServerProxy('{}/xmlrpc/2/common'.format(self.url))
-            self.version:str = rpcmodel.version() # type: ignore
-            self._lazy_uid = rpcmodel.authenticate(self.db, self.username, self.api_key, {}) # type: ignore
+            with self._uid_lock: # concurrent callers authenticate once.
+                if not self._lazy_uid:
+                    self.version:str = self.transport.version()
+                    self._lazy_uid = self.transport.authenticate()
         return self._lazy_uid
 
+    @property
+    def rpcmodel(self) -> xmlrpc.client.ServerProxy:
+        # The raw XML-RPC object endpoint, for callers that use execute_kw directly.
+        transport = self.transport if isinstance(self.transport, XmlRpcTransport) else XmlRpcTransport(self)
+        return transport.proxy("object")
+
     def begin(self) -> OdooTransaction:
         return OdooTransaction(self)
+
+    def refresh(self, model:str|type[OdooWrapperInterface]|None = None) -> tuple[int, int]:
+        """
+        Brings the cached records of model (or of every cached model) up to date. Only the records written since
+        the last refresh are read, and the cached ids are checked with a search to drop deleted records.
+        Returns the number of cached records updated and removed.
+        """
+        if model is None:
+            updated = removed = 0
+            for m in self.cache.models():
+                u, r = self.refresh(m)
+                updated += u
+                removed += r
+            return updated, removed
+        if not isinstance(model, str):
+            model = model._get_model() # type: ignore
+        assert isinstance(model, str)
+        cached = {x.id: x for x in self.cache.of_model(model) if x.id and x.id > 0}
+        if not cached:
+            return 0, 0
+        trans = self.begin()
+        wrapper = type(next(iter(cached.values())))
+
+        # write_date only has second precision, so rows written in the same second as the watermark are read again.
+        watermark = self._watermarks.get(model) or max((x.peek_wrapped_oject().get('write_date') or '' for x in cached.values()), default='')
+        latest = watermark
+        updated = 0
+        written = False
+        # Archived records are read too, so the cached ones get their active flag updated.
+        if watermark:
+            pages = trans._search_read_pages(model, [('write_date', '>=', watermark)], context={'active_test': False})
+        else:
+            pages = trans._id_pages(model, list(cached), context={'active_test': False})
+        for page in pages:
+            for row in page:
+                written = written or (row.get('write_date') or '') > watermark
+                latest = max(latest, row.get('write_date') or '')
+                if row['id'] in cached or model in self.cache.complete:
+                    trans._wrap_row(wrapper, model, row) # replaces the cached record.
+                    updated += 1
+        if latest:
+            self._watermarks[model] = latest
+
+        ids = list(cached)
+        existing: set[int] = set()
+        for i in range(0, len(ids), self.search_page_size):
+            existing.update(trans._execute_kw(model, 'search', [[('id', 'in', ids[i:i + self.search_page_size])]],
+                                              {'context': {'active_test': False}}))
+        gone = [id for id in ids if id not in existing]
+        for id in gone:
+            self.cache.pop(f"{model}:{id}", None)
+        if self.persistent_cache is not None:
+            self.persistent_cache.discard(model, gone)
+        if self.query_cache is not None and (written or gone):
+            self.query_cache.invalidate(model) # the watermark moved, the kept searches may have other results now.
+        return updated, len(gone)
+
+    def load_persisted(self, wrapper:type[OdooWrapperInterface]) -> int:
+        """
+        Fills the cache with the records of wrapper's model kept in persistent_cache, the first time the model is used.
+        The kept rows are checked against the server's write_date in bulk, changed rows are read again and deleted ones dropped.
+        Returns the number of records loaded.
+        """
+        if self.persistent_cache is None:
+            return 0
+        model: str = wrapper._get_model() # type: ignore
+        if model in self._persist_loaded:
+            return 0
+        with self._persist_lock:
+            if model in self._persist_loaded:
+                return 0
+            rows = self.persistent_cache.load(model)
+            trans = self.begin()
+            ids = list(rows)
+            current: dict[int, str] = {}
+            for i in range(0, len(ids), self.search_page_size):
+                for x in trans._execute_kw(model, 'search_read', [[('id', 'in', ids[i:i + self.search_page_size])]],
+                                           {'fields': ['write_date'], 'context': {'active_test': False}}):
+                    current[x['id']] = str(x['write_date'])
+            stale = [id for id in ids if current.get(id) != rows[id]['write_date']]
+            self.persistent_cache.discard(model, stale)
+            loaded = 0
+            for id, row in rows.items():
+                if id in current and row['write_date'] == current[id] and f"{model}:{id}" not in self.cache:
+                    trans._wrap_row(wrapper, model, row)
+                    loaded += 1
+            changed = [id for id in stale if id in current]
+            for i in range(0, len(changed), self.search_page_size):
+                for page in trans._search_read_pages(model, [('id', 'in', changed[i:i + self.search_page_size])]):
+                    for x in page:
+                        trans._wrap_row(wrapper, model, x)
+                        loaded += 1
+            self._persist_loaded.add(model)
+            return loaded
+
+    def preload(self, wrapper:type[OdooWrapperInterface]) -> int:
+        """
+        Reads every record of wrapper's model, archived ones too, into the cache and pins them there. Searches on the
+        model are then answered from the cache when the domain can be evaluated locally, until a record is evicted.
+        refresh() keeps it up to date, adding the records created since. Returns the number of records read.
+        """
+        model: str = wrapper._get_model() # type: ignore
+        self.pin(model)
+        trans = self.begin()
+        count = 0
+        for page in trans._search_read_pages(model, [('active', 'in', [True, False])] if 'active' in self.field_types(model) else []):
+            for row in page:
+                trans._wrap_row(wrapper, model, row)
+                count += 1
+        self.cache.complete.add(model)
+        return count
+
+    def field_types(self, model:str) -> dict[str, str]:
+        """The Odoo type ('char', 'many2one', 'date'...) of every field of model, read once per backend."""
+        types = self._field_types.get(model)
+        if types is None:
+            info = self.transport.execute_kw(model, 'fields_get', [], {'attributes': ['type']})
+            types = self._field_types[model] = {f: d['type'] for f, d in info.items()}
+        return types
+
+    def set_cache_policy(self, model:str|None = None, max_entries:int|None = None, max_bytes:int|None = None,
+                         ttl:float|None = None, pinned:bool = False) -> None:
+        """Bounds the records cached for model, or for every model without its own policy when model is None."""
+        self.cache.set_policy(model, CachePolicy(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, pinned=pinned))
+
+    def pin(self, model:str) -> None:
+        self.set_cache_policy(model, pinned=True)
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        return self.cache.stats()
+
+    def close(self) -> None:
+        self.pool.close()
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
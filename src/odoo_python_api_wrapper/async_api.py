@@ -0,0 +1,185 @@
+from __future__ import annotations  # This is crucial for forward references
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, TypeVar
+from .api_wrapper import OdooBackend, OdooTransaction
+from .data_class_interface import OdooWrapperInterface
+
+T = TypeVar('T', bound='OdooWrapperInterface')
+
+
+class AsyncOdooBackend(OdooBackend):
+    """
+    OdooBackend whose transactions are awaited. RPCs run on a pool of max_concurrency threads over
+    the keep-alive connection pool, so independent calls awaited together are sent in parallel.
+    """
+    def __init__(self, db, save_order = [], max_concurrency:int = 16, **kwargs):
+        kwargs.setdefault('pool_size', max_concurrency)
+        super().__init__(db, save_order, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._executor: ThreadPoolExecutor|None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="odoo-rpc")
+        return self._executor
+
+    def begin(self) -> AsyncOdooTransaction: # type: ignore
+        return AsyncOdooTransaction(OdooTransaction(self))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        super().close()
+
+
+class AsyncOdooTransaction:
+    """
+    Awaitable front for an OdooTransaction. Cache lookups and record wrapping happen on the event loop
+    with the same caches and change tracking as the wrapped transaction, only the RPCs are run on the
+    backend's threads. Records belong to `transaction`, so create new ones with Klass(trans.transaction).
+    Do not use the transaction for anything else while a commit is awaited.
+    """
+    def __init__(self, transaction:OdooTransaction):
+        self.transaction = transaction
+
+    def __getattr__(self, attr):
+        # append, extend, delete, abort, cache... have no I/O and are used as is.
+        return getattr(self.transaction, attr)
+
+    def __setattr__(self, attr, value):
+        if attr == 'transaction':
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self.transaction, attr, value)
+
+    @property
+    def backend(self) -> AsyncOdooBackend:
+        return self.transaction.backend # type: ignore
+
+    async def _run(self, fn:Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.backend.executor, fn, *args)
+
+    async def _execute_kw(self, model:str, method:str, args:list, kwargs:dict[str,Any]|None=None) -> Any:
+        return await self._run(self.transaction._execute_kw, model, method, args, kwargs)
+
+    async def _uid(self) -> Any:
+        if not self.backend._lazy_uid:
+            await self._run(lambda: self.backend.uid)
+        return self.backend.uid
+
+    async def _load_persisted(self, wrapper:type[OdooWrapperInterface]) -> None:
+        if self.backend.persistent_cache is not None and wrapper._get_model() not in self.backend._persist_loaded:
+            await self._run(self.backend.load_persisted, wrapper)
+
+    async def search(self, wrapper:type[T], search, fields=[], getting:bool=False) -> list[T]:
+        trans = self.transaction
+        await self._load_persisted(wrapper)
+        model: str = wrapper._get_model() # type: ignore
+        ret = trans._search_cached(model, search, '  ' if getting else '')
+        if ret is not None:
+            return ret # type: ignore
+        await self._uid()
+        ids = OdooTransaction._id_in(search)
+        if ids is not None:
+            return await self._search_ids(wrapper, model, ids, fields)
+        search_2 = OdooTransaction._convert_search(search)
+        # Same query cache as OdooTransaction.search.
+        query_cache = self.backend.query_cache
+        key = await self._run(trans._query_key, model, search_2, fields) if query_cache is not None else None
+        if key is not None:
+            assert query_cache is not None
+            cached_ids = query_cache.get(key)
+            if cached_ids is not None:
+                return await self._search_ids(wrapper, model, list(cached_ids), fields)
+            generation = query_cache.generation(model)
+        pages = await self._run(lambda: list(trans._search_read_ordered(model, search_2, fields)))
+        ret = [trans._wrap_row(wrapper, model, x) for page in pages for x in page]
+        if key is not None:
+            query_cache.put(key, [x.id for x in ret], generation) # type: ignore
+        return ret
+
+    async def _search_ids(self, wrapper:type[T], model:str, ids:list[int], fields=[]) -> list[T]:
+        trans = self.transaction
+        found, missing = trans._cached_ids(model, ids)
+        if missing:
+            pages = await self._run(lambda: list(trans._id_pages(model, missing, fields)))
+            for page in pages:
+                for x in page:
+                    id = x['id']
+                    found[id] = trans._wrap_row(wrapper, model, x)
+        return [found[id] for id in dict.fromkeys(ids) if id in found] # type: ignore
+
+    async def search_iter(self, wrapper:type[T], search, fields=[], page_size:int|None=None) -> AsyncIterator[T]:
+        # Pages are read by ascending id, the next page is requested before the current one is handed out.
+        # As with OdooTransaction.search_iter, records are only kept by the transaction once they are changed.
+        trans = self.transaction
+        model: str = wrapper._get_model() # type: ignore
+        page_size = page_size or self.backend.search_page_size
+        search_2 = OdooTransaction._convert_search(search)
+        def fetch(after_id:int|None):
+            domain = search_2 if after_id is None else search_2 + [('id', '>', after_id)]
+            return self._execute_kw(model, 'search_read', [domain], {'fields': fields, 'limit': page_size, 'order': 'id'})
+        await self._uid()
+        page = await fetch(None)
+        while page:
+            next_page = asyncio.ensure_future(fetch(page[-1]['id'])) if len(page) >= page_size else None
+            try:
+                for x in page:
+                    yield trans._wrap_row(wrapper, model, x, keep=False)
+            except BaseException:
+                if next_page:
+                    next_page.cancel()
+                raise
+            page = await next_page if next_page else None
+
+    async def search_first(self, wrapper:type[T], search, fields=[]) -> T|None:
+        ret = await self.search(wrapper, search, fields)
+        return ret[0] if ret else None
+
+    async def search_singleton(self, wrapper:type[T], search, fields=[]) -> T|None:
+        ret = await self.search(wrapper, search, fields)
+        if len(ret) > 1:
+            raise ValueError(f"Expected 1 record, got {len(ret)}")
+        return ret[0] if ret else None
+
+    async def get(self, wrapper:type[T], field:str, value:Any) -> T|None:
+        await self._load_persisted(wrapper)
+        ret = self.transaction._get_cached(wrapper._get_model(), field, value)
+        if ret is not None:
+            return ret # type: ignore
+        ret = await self.search(wrapper, [(field, "=", value)], getting=True)
+        return ret[0] if ret else None
+
+    async def get2(self, wrapper:type[T], search:list[tuple[str,str,Any]]) -> T|None:
+        await self._load_persisted(wrapper)
+        ret = self.transaction._get2_cached(wrapper._get_model(), search)
+        if ret is not None:
+            return ret # type: ignore
+        if OdooTransaction._unsaved(search):
+            return None
+        ret = await self.search(wrapper, search, getting=True)
+        return ret[0] if ret else None
+
+    async def search_raw(self, model:str, search, fields=[]) -> list[OdooWrapperInterface]:
+        return await self._run(self.transaction.search_raw, model, search, fields)
+
+    async def read_columns(self, model:str, domain, fields:list[str]=[], page_size:int|None=None) -> dict[str, Any]:
+        return await self._run(self.transaction.read_columns, model, domain, fields, page_size)
+
+    async def read(self, model:str, id, fields) -> OdooWrapperInterface:
+        return await self._run(self.transaction.read, model, id, fields)
+
+    async def create(self, model:str, rec:list[dict[str,Any]]) -> list[int]:
+        return await self._run(self.transaction.create, model, rec)
+
+    async def write(self, model:str, id_pk:int|list[int], rec) -> bool:
+        return await self._run(self.transaction.write, model, id_pk, rec)
+
+    async def execute_action(self, model:str, action:str, search) -> bool:
+        return await self._run(self.transaction.execute_action, model, action, search)
+
+    async def commit(self) -> None:
+        await self._run(self.transaction.commit)
@@ -0,0 +1,105 @@
+from __future__ import annotations  # This is crucial for forward references
+from collections import OrderedDict
+import sys
+import threading
+import time
+from typing import Any
+from .data_class_interface import OdooWrapperInterface
+
+
+class CachePolicy:
+    """
+    Limits for the records of one model in the backend cache. When a limit is passed the least recently
+    used records are evicted, records older than ttl seconds are dropped when next looked up.
+    Pinned models are never evicted, use it for small reference models that are read all the time.
+    """
+    def __init__(self, max_entries:int|None=None, max_bytes:int|None=None, ttl:float|None=None, pinned:bool=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.pinned = pinned
+
+    def __repr__(self) -> str:
+        return f"CachePolicy(max_entries={self.max_entries}, max_bytes={self.max_bytes}, ttl={self.ttl}, pinned={self.pinned})"
+
+
+def approx_size(x:OdooWrapperInterface) -> int:
+    # Roughly what a cached record costs: its field dict and values. Field names are shared between records.
+    wo = x.peek_wrapped_oject()
+    return sys.getsizeof(wo) + sum(sys.getsizeof(v) for v in wo.values())
+
+
+class ModelUsage:
+    """LRU order, memory estimate and hit/miss/eviction counters of one model in a cache."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, tuple[float, int]] = OrderedDict() # key -> (stored at, bytes), least recently used first.
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stored(self, key:str, size:int, policy:CachePolicy) -> list[str]:
+        """Records key and returns the keys to evict to get back under the policy's limits."""
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+            self.entries[key] = (time.monotonic(), size)
+            self.bytes += size
+            return self._over(policy, key)
+
+    def over_limits(self, policy:CachePolicy) -> list[str]:
+        with self.lock:
+            return self._over(policy, None)
+
+    def _over(self, policy:CachePolicy, keep:str|None) -> list[str]:
+        if policy.pinned:
+            return []
+        evict = []
+        entries = len(self.entries)
+        size = self.bytes
+        for k, (_, s) in self.entries.items():
+            if ((policy.max_entries is None or entries <= policy.max_entries) and
+                    (policy.max_bytes is None or size <= policy.max_bytes)) or k == keep:
+                break
+            evict.append(k)
+            entries -= 1
+            size -= s
+        return evict
+
+    def removed(self, key:str, evicted:bool=False) -> None:
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+                if evicted:
+                    self.evictions += 1
+
+    def used(self, key:str, policy:CachePolicy) -> bool:
+        """Counts a hit and marks key as recently used. False when the entry outlived the ttl."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and policy.ttl is not None and not policy.pinned and time.monotonic() - entry[0] > policy.ttl:
+                self.misses += 1
+                return False
+            if entry is not None:
+                self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def missed(self) -> None:
+        with self.lock:
+            self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else None,
+            }
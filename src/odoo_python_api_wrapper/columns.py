@@ -0,0 +1,76 @@
+from __future__ import annotations  # This is crucial for forward references
+from datetime import date, datetime
+from typing import Any
+
+try: # columns are returned as numpy arrays when it is installed, as lists otherwise.
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _date(v:Any) -> date|None:
+    return date.fromisoformat(v[:10]) if v else None
+
+def _datetime(v:Any) -> datetime|None:
+    return datetime.fromisoformat(v) if v else None
+
+
+class ColumnBuilder:
+    """
+    Collects search_read rows into one list per field, converted once all pages are in.
+    many2one fields give an id column (0 when empty) and a "<field>.name" column.
+    """
+    def __init__(self, fields:list[str], types:dict[str,str]):
+        self.fields = fields
+        self.types = types
+        self.values: dict[str, list[Any]] = {f: [] for f in fields}
+        self.names: dict[str, list[Any]] = {f: [] for f in fields if types.get(f) == 'many2one'}
+
+    def add(self, rows:list[dict[str,Any]]) -> None:
+        for f in self.fields:
+            if f in self.names:
+                ids = self.values[f]
+                names = self.names[f]
+                for row in rows:
+                    v = row.get(f)
+                    if v:
+                        ids.append(v[0])
+                        names.append(v[1])
+                    else:
+                        ids.append(0)
+                        names.append(None)
+            else:
+                self.values[f].extend(row.get(f) for row in rows)
+
+    def columns(self) -> dict[str, Any]:
+        ret: dict[str, Any] = {}
+        for f in self.fields:
+            ret[f] = self._convert(self.values[f], self.types.get(f, ''))
+            if f in self.names:
+                ret[f"{f}.name"] = self._convert(self.names[f], 'char')
+        return ret
+
+    def _convert(self, values:list[Any], ttype:str) -> Any:
+        if ttype in ('float', 'monetary'):
+            values = [float('nan') if v is False or v is None else v for v in values]
+            return np.array(values, dtype=np.float64) if np is not None else values
+        if ttype in ('integer', 'many2one', 'id'):
+            values = [0 if v is False or v is None else v for v in values]
+            return np.array(values, dtype=np.int64) if np is not None else values
+        if ttype == 'boolean':
+            return np.array(values, dtype=bool) if np is not None else [bool(v) for v in values]
+        if ttype == 'date':
+            if np is not None: # numpy parses the ISO strings in one pass.
+                return np.array([v[:10] if v else 'NaT' for v in values], dtype='datetime64[D]')
+            return [_date(v) for v in values]
+        if ttype == 'datetime':
+            if np is not None:
+                return np.array([v.replace(' ', 'T') if v else 'NaT' for v in values], dtype='datetime64[s]')
+            return [_datetime(v) for v in values]
+        values = [None if v is False else v for v in values]
+        if np is not None:
+            ret = np.empty(len(values), dtype=object) # np.array would turn lists of ids into a 2d array.
+            for i, v in enumerate(values):
+                ret[i] = v
+            return ret
+        return values
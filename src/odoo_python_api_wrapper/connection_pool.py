@@ -0,0 +1,123 @@
+from __future__ import annotations  # This is crucial for forward references
+import gzip
+import http.client
+import ssl
+import threading
+import time
+import urllib.parse
+import xmlrpc.client
+from typing import Any, Callable
+
+# Errors raised when a kept-alive connection was closed by the server while it sat in the pool.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                            http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of persistent HTTP/1.1 connections to one Odoo server.
+    At most `size` connections are open at once, connections idle for longer than `idle_timeout` seconds are closed.
+    """
+    def __init__(self, url:str, size:int=8, idle_timeout:float=60.0, timeout:float|None=None):
+        parsed = urllib.parse.urlsplit(url)
+        self.https = parsed.scheme == 'https'
+        self.host = parsed.netloc
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._ssl_context = ssl.create_default_context() if self.https else None
+        self.observer: Callable[[str, int, int], None]|None = None # called with the path and bytes sent and received of each request.
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.https:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        self._slots.acquire()
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, since = self._idle.pop() # most recently used first, it is the least likely to be closed.
+                if now - since < self.idle_timeout:
+                    return conn, True
+                conn.close()
+        return self._connect(), False
+
+    def _release(self, conn:http.client.HTTPConnection, reuse:bool) -> None:
+        try:
+            if reuse:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+            else:
+                conn.close()
+        finally:
+            self._slots.release()
+
+    def request(self, path:str, body:bytes, headers:dict[str,str],
+                replayable:Callable[[], bool]|None = None) -> tuple[http.client.HTTPResponse, bytes]:
+        """
+        POST body to path and return the response with its (decompressed) content.
+        When a kept-alive connection turns out to be closed, the request is sent again on another one if it was
+        not sent yet, or if `replayable` says so: once sent, the server may have run it before the connection broke,
+        so only requests that change nothing, like reads, can be sent twice.
+        """
+        headers = {'Accept-Encoding': 'gzip', **headers}
+        while True:
+            conn, reused = self._acquire()
+            sent = False
+            try:
+                conn.request('POST', path, body, headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                self._release(conn, False)
+                if reused and (not sent or (replayable is not None and replayable())):
+                    continue # the server dropped an idle connection, try again on another one.
+                raise
+            except BaseException:
+                self._release(conn, False)
+                raise
+            self._release(conn, not response.will_close)
+            if self.observer is not None:
+                self.observer(path, len(body), len(data))
+            if response.getheader('Content-Encoding', '').lower() == 'gzip':
+                data = gzip.decompress(data)
+            return response, data
+
+    def close(self) -> None:
+        with self._lock:
+            for conn, _ in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class PooledTransport(xmlrpc.client.Transport):
+    """
+    xmlrpc transport that sends every request over a shared ConnectionPool, so a ServerProxy using it is thread safe.
+    `replayable` tells from a request body whether the call can be sent again after the connection broke.
+    """
+    def __init__(self, pool:ConnectionPool, replayable:Callable[[bytes], bool]|None = None):
+        super().__init__()
+        self.pool = pool
+        self.replayable = replayable
+
+    def request(self, host, handler, request_body, verbose=False) -> Any:
+        replayable = self.replayable
+        response, data = self.pool.request(handler, request_body, {
+            'Content-Type': 'text/xml',
+            'User-Agent': self.user_agent,
+        }, (lambda: replayable(request_body)) if replayable is not None else None)
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(host + handler, response.status, response.reason, dict(response.getheaders()))
+        parser, unmarshaller = self.getparser()
+        parser.feed(data)
+        parser.close()
+        return unmarshaller.close()
+
+    def close(self) -> None:
+        pass # connections belong to the pool.
@@ -13,7 +13,45 @@ class OdooManyToManyHelper:
 
 T = TypeVar('T')
 
+def _parse_date(value:Any) -> date:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+def _parse_datetime(value:Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value) # also reads a bare date as midnight.
+
+def _many2one_value(x:OdooWrapperInterface) -> Any:
+    # The name is kept so domains with like on the many2one can still be answered from the cache.
+    wo = x.peek_wrapped_oject()
+    name = wo.get('display_name') or wo.get('name')
+    return [x.id, name] if isinstance(name, str) and x.id and x.id > 0 else x.id
+
+_model_classes: dict[str, type['OdooDataClass']] = {}
+
+def model_class(model:str) -> type['OdooDataClass']|None:
+    """The wrapper class of an Odoo model, the most derived one when a generated class was extended."""
+    return _model_classes.get(model)
+
 class OdooDataClass(OdooWrapperInterface):
+    # Caches hold many records: no instance __dict__, and the changes and related_records dicts are created on first use.
+    __slots__ = ('trans', '_MODEL', 'a__wo', '_changes', '_related', '_decoded', '_id', '_hash', '_wo_shared')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        try:
+            model = cls._get_model()
+        except NotImplementedError:
+            return
+        existing = _model_classes.get(model)
+        if model and (existing is None or issubclass(cls, existing)):
+            _model_classes[model] = cls
+
     @property
     def MODEL(self)->str:
         return self._MODEL
@@ -26,9 +64,10 @@ class OdooDataClass(OdooWrapperInterface):
             self.a__wo = wo
         else:
             self.a__wo:dict[str,Any] = {}
-        self._changes:dict[str,Any] = {}
-        
-        self.related_records: dict[str,list[OdooWrapperInterface]] = {}
+        self._wo_shared = False # a__wo is shared with a snapshot or another transaction's copy, copy it before writing.
+        self._changes:dict[str,Any]|None = None
+        self._related:dict[str,list[OdooWrapperInterface]]|None = None
+        self._decoded:dict[str,tuple[Any,Any,Any]]|None = None # prop -> (raw value, parser, typed value)
         if id:
             self._id = id
         else:
@@ -52,9 +91,58 @@ class OdooDataClass(OdooWrapperInterface):
         memo[key] = new_node
         new_node.a__wo = copy.deepcopy(self.a__wo, memo)
         new_node._changes = copy.deepcopy(self._changes, memo)
-        new_node.related_records = copy.deepcopy(self.related_records, memo)
+        new_node._related = copy.deepcopy(self._related, memo)
+        return new_node
+
+    def _frozen_wo(self) -> dict[str,Any]:
+        # a__wo as it can be read from any transaction: related records are replaced by [id, name] as search_read
+        # returns them, and resolved x2many fields by the ids they resolved to, as a__wo holds the write commands
+        # after a commit.
+        fixes = {k: _many2one_value(v) for k, v in self.a__wo.items() if isinstance(v, OdooWrapperInterface)}
+        for k, related in (self._related or {}).items():
+            ids = [r.id for r in related if r.id and r.id > 0]
+            if self.a__wo.get(k) != ids:
+                fixes[k] = ids
+        if not fixes:
+            return self.a__wo
+        return {**self.a__wo, **fixes}
+
+    def _snapshot(self, trans:OdooTransaction) -> 'OdooDataClass':
+        """Read only copy of the committed state for the backend cache. It shares a__wo until either side changes it."""
+        snap = copy.copy(self)
+        snap.trans = trans
+        snap._changes = None
+        snap._related = None
+        snap._decoded = None
+        snap.a__wo = self._frozen_wo()
+        if snap.a__wo is self.a__wo:
+            self._wo_shared = True
+        snap._wo_shared = True
+        return snap
+
+    def _adopt(self, trans:OdooTransaction) -> 'OdooDataClass|None':
+        """Copy of this record in trans, sharing a__wo instead of deep copying the records it refers to. None if it has changes."""
+        if self._changes:
+            return None
+        new_node:OdooDataClass = type(self)(trans, self._id, None) # type: ignore
+        new_node.a__wo = self._frozen_wo()
+        if new_node.a__wo is self.a__wo:
+            self._wo_shared = True
+        new_node._wo_shared = True
         return new_node
 
+    def _join(self) -> None:
+        # Records yielded by search_iter join their transaction when changed. If it read the record again since,
+        # the change would go to a copy commit never sees.
+        if self.trans.append(self) is not self:
+            raise ValueError(f"{self.MODEL}:{self.id} was read again by the transaction after search_iter yielded it, change that copy instead.")
+
+    def _own_wo(self) -> dict[str,Any]:
+        if self._wo_shared:
+            self.a__wo = dict(self.a__wo)
+            self._wo_shared = False
+        return self.a__wo
+
     @property
     def id(self) -> int:
         return self._id
@@ -87,30 +175,60 @@ class OdooDataClass(OdooWrapperInterface):
 
     @property
     def changes (self)->dict[str,Any]: 
+        if self._changes is None:
+            self._changes = {}
         return self._changes
+
+    @property
+    def related_records(self) -> dict[str,list[OdooWrapperInterface]]:
+        if self._related is None:
+            self._related = {}
+        return self._related
+
+    @related_records.setter
+    def related_records(self, value:dict[str,list[OdooWrapperInterface]]) -> None:
+        self._related = value
     @property
     def wrapped_oject (self)->dict[str,Any]: # type: ignore
-        if self.MODEL == 'res.partner':
-            return self.a__wo
+        return self._own_wo() # callers may write to it.
+
+    def peek_wrapped_oject(self) -> dict[str,Any]:
         return self.a__wo
  
     def get_value(self, prop, value_if_none=None):# -> Any:
-        if prop in self.changes:
-            return self.changes[prop]
+        if self._changes and prop in self._changes:
+            return self._changes[prop]
         if prop in self.a__wo:
             return self.a__wo[prop]
         return value_if_none
 
+    def _decode(self, prop, raw, parse):
+        # Typed values are kept until the raw value is replaced, by set_data or by a commit writing a__wo.
+        decoded = self._decoded
+        if decoded is None:
+            decoded = self._decoded = {}
+        else:
+            hit = decoded.get(prop)
+            if hit is not None and hit[0] is raw and hit[1] is parse:
+                return hit[2]
+        value = parse(raw)
+        decoded[prop] = (raw, parse, value)
+        return value
+
     def get_value_float(self, prop) -> float|None:
         ret= self.get_value(prop)
         if ret is None:
             return None
-        return float(ret)
+        if type(ret) is float:
+            return ret
+        return self._decode(prop, ret, float)
     def get_value_int(self, prop) -> int|None:
         ret= self.get_value(prop)
         if ret is None:
             return None 
-        return int(ret)
+        if type(ret) is int:
+            return ret
+        return self._decode(prop, ret, int)
     def get_value_bool(self, prop) -> bool|None:
         ret= self.get_value(prop)
         if ret is None:
@@ -125,33 +243,30 @@ class OdooDataClass(OdooWrapperInterface):
         ret= self.get_value(prop)
         if ret is None or ret is False:
             return None
-        try:
-            return datetime.strptime(ret, "%Y-%m-%d").date()
-        except ValueError:
-            return datetime.strptime(ret, "%Y-%m-%d")
+        return self._decode(prop, ret, _parse_date)
     def get_value_datetime(self, prop) -> datetime|None:
         ret= self.get_value(prop)
         if ret is None or ret is False:
             return None
-        try:
-            return datetime.strptime(ret, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            return datetime.strptime(ret, "%Y-%m-%d")
+        return self._decode(prop, ret, _parse_datetime)
     def get_many2one(self, prop: str, model_class:type[T], when_none:T|None=None) -> T | None:# -> Any | Any | int | None | OdooWrapperInterface:# -> Any | Any | int | None | OdooWrapperInterface:
         assert issubclass(model_class, OdooWrapperInterface)
         obj_field_name =prop
-        existing_in_change = self.changes.get(obj_field_name)
+        existing_in_change = self._changes.get(obj_field_name) if self._changes else None
         if existing_in_change: 
             return existing_in_change
         value = self.get_value(obj_field_name, when_none) 
 
         if value and not isinstance(value, OdooWrapperInterface):
-            if isinstance(value, int):
-                match = self.trans.get(model_class, "id", value) # First element is the id, second the name.
-            else:
-                match = self.trans.get(model_class, "id", value[0]) # First element is the id, second the name.
+            id = value if isinstance(value, int) else value[0] # First element is the id, second the name.
+            key = f"{model_class._get_model()}:{id}"
+            missing = key in self.trans._missing
+            if key not in self.trans.cache and key not in self.trans.backend.cache and not missing:
+                self.trans._prefetch_many2one(self.MODEL, obj_field_name, model_class)
+                missing = key in self.trans._missing
+            match = self.trans.get(model_class, "id", id) if not missing else None
             if match:
-                self.a__wo[obj_field_name] = match
+                self._own_wo()[obj_field_name] = match
                 return match
         if value:
             return value # type: ignore
@@ -160,16 +275,30 @@ class OdooDataClass(OdooWrapperInterface):
     def set_many2one(self, prop:str, value:'OdooWrapperInterface|None') -> None:  
         self.set_data(prop, value)
     
+    def _x2many_cached(self, field_name:str, other_model_class:type[OdooWrapperInterface]) -> bool:
+        other_model = other_model_class._get_model()
+        ids = self.get_value(field_name)
+        for x in ids if isinstance(ids, list) else []:
+            key = f"{other_model}:{x}"
+            if key not in self.trans.cache and key not in self.trans.backend.cache and key not in self.trans._missing:
+                return False
+        return True
+
     def get_one2many(self, field_name: str, other_model_class:type[T], field_in_other_model:str) -> list[T]:
         assert issubclass(other_model_class, OdooWrapperInterface)
         # ids = self.wrapped_oject.get(field_name)
         ret:list[TT]|None = self.related_records.get(field_name) # type: ignore
         if ret is None:
+            if self.get_value(field_name) and not self._x2many_cached(field_name, other_model_class):
+                self.trans._prefetch_x2many(self.MODEL, field_name, other_model_class)
+            elif self.get_value(field_name) is None and self.id > 0 and (self.MODEL, field_name, self.id) not in self.trans._children:
+                self.trans._prefetch_children(self.MODEL, field_name, other_model_class, field_in_other_model)
             self.related_records[field_name] = ret = SingleList()
+            other_model = other_model_class._get_model()
             if self.get_value(field_name):
                 db_search = []
                 for x in self.get_value(field_name): # type: ignore
-                    key = f"{other_model_class.MODEL}:{x}"
+                    key = f"{other_model}:{x}"
                     o = self.transaction.objects.get(key)
                     if o:
                         ret.append(o)
@@ -178,6 +307,11 @@ class OdooDataClass(OdooWrapperInterface):
                 if db_search:                  
                     ret.extend(self.transaction.extend(
                         self.trans.search(other_model_class,[('id', 'in', db_search)])))
+            elif (self.MODEL, field_name, self.id) in self.trans._children:
+                for x in self.trans._children.pop((self.MODEL, field_name, self.id)):
+                    o = self.transaction.cache.get(f"{other_model}:{x}")
+                    if o:
+                        ret.append(o)
             elif self.get_value('id'):
                 related = self.trans.search(other_model_class,[(field_in_other_model, '=', self.id)])
                 ret.extend(self.transaction.extend(related))
@@ -193,6 +327,8 @@ class OdooDataClass(OdooWrapperInterface):
         ids = self.a__wo.get(field_name)
         ret:list[TT]|None = self.related_records.get(field_name) # type: ignore
         if ret is None:
+            if self.get_value(field_name) and not self._x2many_cached(field_name, other_model_class):
+                self.trans._prefetch_x2many(self.MODEL, field_name, other_model_class)
             self.related_records[field_name] = ret = []
             if self.get_value(field_name):
                 related = self.trans.search(other_model_class,[('id', 'in', self.get_value(field_name))])
@@ -205,6 +341,7 @@ class OdooDataClass(OdooWrapperInterface):
             new_values = [new_values]
 
         assert issubclass(other_model_class, OdooWrapperInterface)
+        self._join()
 
         rr_list = self.related_records.get(field_name)
         if not rr_list:
@@ -235,13 +372,16 @@ class OdooDataClass(OdooWrapperInterface):
         if isinstance(value, OdooWrapperInterface) and value.transaction != self.transaction:
             raise ValueError("Cannot set a value that is not in the same transaction.")
         if prop != 'id':
-            self.trans.append(self)
+            self._join()
 
+        if self._decoded:
+            self._decoded.pop(prop, None)
         db_val: Any | None = self.a__wo.get(prop)
-        if db_val == value and prop in self.changes:
-            del self.changes[prop]
+        if db_val == value and self._changes and prop in self._changes:
+            del self._changes[prop]
         elif db_val != value:  
             self.changes[prop] = value
+        self.trans._reindex(self)
         
     def set_value_money(self, prop, value:float) -> None: 
         self.set_data(prop, round(float(value),2))
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
     from .api_wrapper import OdooTransaction
 
 class OdooWrapperInterface(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def id(self)->int: # type: ignore
@@ -38,6 +40,10 @@ class OdooWrapperInterface(ABC):
     def wrapped_oject (self)->dict[str,Any]: # type: ignore
         pass
     
+    def peek_wrapped_oject(self) -> dict[str,Any]:
+        """wrapped_oject for reading only, it can be shared with copies of the record in other transactions."""
+        return self.wrapped_oject
+
     @property
     def MODEL (self)->str: 
         raise NotImplementedError('MODEL property not implemented')
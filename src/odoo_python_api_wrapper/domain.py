@@ -0,0 +1,278 @@
+from __future__ import annotations  # This is crucial for forward references
+import re
+from typing import Any, Callable
+from .data_class_interface import OdooWrapperInterface
+
+Predicate = Callable[[OdooWrapperInterface], bool]
+Resolver = Callable[[str, int], 'OdooWrapperInterface|None'] # (model, id) -> cached record
+
+
+class UnsupportedDomain(Exception):
+    """The domain, or the value of a record it needs, cannot be evaluated locally. Ask the server instead."""
+
+
+_MISSING = object()
+_NULL = object() # False and None, kept apart from 0 which equals False in python.
+_OPERATORS = ('&', '|', '!')
+_compiled: dict[Any, Predicate] = {}
+_COMPILED_MAX = 512
+
+
+def _raw(x:OdooWrapperInterface, field:str) -> Any:
+    if field == 'id':
+        return x.id
+    value = x.get_value(field, _MISSING)
+    if value is _MISSING:
+        raise UnsupportedDomain(f"{field} is not loaded")
+    return value
+
+
+def _scalar(value:Any) -> Any:
+    """The value as Odoo compares it: records and many2one [id, name] pairs by id, None and False as _NULL."""
+    if value is None or value is False:
+        return _NULL
+    if isinstance(value, OdooWrapperInterface):
+        return value.id
+    if isinstance(value, (list, tuple)):
+        if _pair(value):
+            return value[0]
+        raise UnsupportedDomain("x2many value")
+    return value
+
+
+def _pair(value:Any) -> bool:
+    """Whether value is a many2one as search_read returns it: [id, name]."""
+    return isinstance(value, (list, tuple)) and len(value) == 2 and isinstance(value[0], int) and isinstance(value[1], str)
+
+
+def _ids(value:Any) -> list[Any]|None:
+    """The ids of an x2many value, None for other fields."""
+    if _pair(value):
+        return None # many2one, compared on its id by _scalar.
+    if isinstance(value, (list, tuple)):
+        if any(not isinstance(v, (int, OdooWrapperInterface)) for v in value):
+            raise UnsupportedDomain("x2many commands") # changes not committed yet.
+        return [_scalar(v) for v in value]
+    if isinstance(value, OdooWrapperInterface) or value is None or value is False or isinstance(value, (int, str, float)):
+        return None
+    raise UnsupportedDomain(f"{type(value).__name__} value")
+
+
+def _text(value:Any) -> str|None:
+    """What like operators match against: the string, or a many2one's name."""
+    if value is None or value is False:
+        return None
+    if isinstance(value, str):
+        return value
+    if _pair(value):
+        return value[1]
+    if isinstance(value, OdooWrapperInterface):
+        name = value.get_value('display_name', None) or value.get_value('name', None)
+        if isinstance(name, str):
+            return name
+    raise UnsupportedDomain("like on a value without text")
+
+
+def _relation(value:Any) -> bool:
+    return isinstance(value, OdooWrapperInterface) or _pair(value)
+
+
+def _like(op:str, pattern:Any) -> Callable[[str], bool]:
+    pattern = str(pattern)
+    flags = re.IGNORECASE | re.DOTALL if 'ilike' in op else re.DOTALL
+    if not op.startswith('='):
+        if '%' in pattern or '_' in pattern: # Odoo wraps the value in % without escaping it, so these stay wildcards.
+            pattern = f"%{pattern}%"
+            op = '=' + op
+    if op.startswith('='): # =like, =ilike: the value is the SQL pattern.
+        regex = re.compile(''.join('.*' if c == '%' else '.' if c == '_' else re.escape(c) for c in pattern) + r'\Z', flags)
+        return lambda s: regex.match(s) is not None
+    if 'ilike' in op:
+        folded = pattern.casefold()
+        return lambda s: folded in s.casefold()
+    return lambda s: pattern in s
+
+
+def _compare(op:str, a:Any, b:Any) -> bool:
+    try:
+        if op == '<': return a < b
+        if op == '>': return a > b
+        if op == '<=': return a <= b
+        return a >= b
+    except TypeError:
+        raise UnsupportedDomain(f"cannot compare {type(a).__name__} with {type(b).__name__}")
+
+
+def _term(model:str, field:str, op:str, value:Any, resolve:Resolver|None) -> Predicate:
+    op = op.lower()
+    if '.' in field:
+        raise UnsupportedDomain(f"path {field}")
+    if op == '=?':
+        if value is None or value is False:
+            return lambda x: True
+        op = '='
+    if op == '<>':
+        op = '!='
+
+    if op in ('=', '!='):
+        negate = op == '!='
+        if isinstance(value, (list, tuple)):
+            raise UnsupportedDomain(f"{op} with a list")
+        target = _scalar(value)
+        by_name = isinstance(target, str)
+        def eq(x:OdooWrapperInterface) -> bool:
+            raw = _raw(x, field)
+            ids = _ids(raw)
+            if ids is not None: # x2many: = id means it contains id, = False means it is empty.
+                hit = (not ids) if target is _NULL else target in ids
+            else:
+                if by_name and _relation(raw):
+                    raise UnsupportedDomain("many2one compared with a name")
+                hit = _scalar(raw) == target
+            return hit != negate
+        return eq
+
+    if op in ('in', 'not in'):
+        negate = op == 'not in'
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        wanted = {_scalar(v) for v in values}
+        with_null = _NULL in wanted
+        by_name = any(isinstance(v, str) for v in wanted)
+        def member(x:OdooWrapperInterface) -> bool:
+            raw = _raw(x, field)
+            ids = _ids(raw)
+            if ids is not None:
+                hit = bool(wanted.intersection(ids)) or (with_null and not ids)
+            else:
+                if by_name and _relation(raw):
+                    raise UnsupportedDomain("many2one compared with a name")
+                hit = _scalar(raw) in wanted
+            return hit != negate
+        return member
+
+    if op in ('<', '>', '<=', '>='):
+        if value is None or value is False:
+            return lambda x: False
+        target = _scalar(value)
+        def compare(x:OdooWrapperInterface) -> bool:
+            v = _scalar(_raw(x, field))
+            return v is not _NULL and _compare(op, v, target)
+        return compare
+
+    if op in ('like', 'ilike', 'not like', 'not ilike', '=like', '=ilike'):
+        negate = op.startswith('not ')
+        if value is None or value is False:
+            return lambda x: (_text(_raw(x, field)) is None) != negate
+        matches = _like(op[4:] if negate else op, value)
+        def like(x:OdooWrapperInterface) -> bool:
+            raw = _raw(x, field)
+            if _ids(raw) is not None:
+                raise UnsupportedDomain("like on x2many")
+            s = _text(raw)
+            if s is None:
+                return negate
+            return matches(s) != negate
+        return like
+
+    if op in ('child_of', 'parent_of'):
+        # Only on the record itself, by following its parent_id through the cached records.
+        if field != 'id' or resolve is None:
+            raise UnsupportedDomain(f"{op} on {field}")
+        roots = {_scalar(v) for v in (value if isinstance(value, (list, tuple)) else [value])}
+        def ancestors(id:int) -> list[int]:
+            chain = [id]
+            while True:
+                rec = resolve(model, chain[-1])
+                if rec is None:
+                    raise UnsupportedDomain(f"{model}:{chain[-1]} is not cached")
+                parent = _scalar(_raw(rec, 'parent_id'))
+                if parent is _NULL or parent in chain:
+                    return chain
+                chain.append(parent)
+        if op == 'child_of':
+            return lambda x: not roots.isdisjoint(ancestors(x.id))
+        def parent_of(x:OdooWrapperInterface) -> bool:
+            return any(x.id in ancestors(root) for root in roots if root is not _NULL)
+        return parent_of
+
+    raise UnsupportedDomain(f"operator {op}")
+
+
+def _freeze(value:Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def compile_domain(model:str, domain:list|tuple, resolve:Resolver|None = None) -> Predicate:
+    """
+    Turns an Odoo domain, in prefix notation with implicit '&' between terms, into a predicate on records.
+    Values are compared as Odoo does: many2one by id, False for empty, negative operators also match empty
+    values. Raises UnsupportedDomain, when compiling or when called, for what only the server can answer.
+    Predicates are kept by domain, except the child_of and parent_of ones that are bound to `resolve`.
+    """
+    try:
+        key = (model, _freeze(domain))
+        predicate = _compiled.get(key)
+    except TypeError: # unhashable values, compiled every time.
+        key = predicate = None
+    if predicate is not None:
+        return predicate
+    predicate = _compile(model, domain, resolve)
+    if key is not None and not any(isinstance(t, (list, tuple)) and len(t) == 3 and t[1] in ('child_of', 'parent_of') for t in domain):
+        if len(_compiled) >= _COMPILED_MAX:
+            _compiled.clear()
+        _compiled[key] = predicate
+    return predicate
+
+
+def _compile(model:str, domain:list|tuple, resolve:Resolver|None) -> Predicate:
+    nodes: list[Any] = []
+    for item in domain:
+        if isinstance(item, str):
+            if item not in _OPERATORS:
+                raise UnsupportedDomain(f"operator {item}")
+            nodes.append(item)
+        elif isinstance(item, (list, tuple)) and len(item) == 3:
+            field, op, value = item
+            if field in (0, 1, True, False) and op == '=' and value in (0, 1, True, False): # TRUE_LEAF / FALSE_LEAF
+                constant = field == value
+                nodes.append(lambda x, c=constant: c)
+            else:
+                nodes.append(_term(model, field, op, value, resolve))
+        else:
+            raise UnsupportedDomain(f"term {item!r}")
+
+    pos = 0
+    def parse() -> Predicate:
+        nonlocal pos
+        if pos >= len(nodes):
+            raise UnsupportedDomain("incomplete domain")
+        node = nodes[pos]
+        pos += 1
+        if node == '!':
+            inner = parse()
+            return lambda x: not inner(x)
+        if node == '&' or node == '|':
+            left = parse()
+            right = parse()
+            if node == '&':
+                return lambda x: left(x) and right(x)
+            return lambda x: left(x) or right(x)
+        return node
+
+    parts = []
+    while pos < len(nodes):
+        parts.append(parse())
+    if not parts:
+        return lambda x: True
+    if len(parts) == 1:
+        return parts[0]
+    return lambda x: all(p(x) for p in parts)
+
+
+def references(domain:list|tuple, field:str) -> bool:
+    """Whether a term of domain is on field."""
+    return any(isinstance(t, (list, tuple)) and len(t) == 3 and t[0] == field for t in domain)
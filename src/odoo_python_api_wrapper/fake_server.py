@@ -0,0 +1,347 @@
+"""
+In-memory stand-in for an Odoo server, to measure and test the wrapper without a real database.
+It speaks /xmlrpc/2/common, /xmlrpc/2/object and /jsonrpc and implements search_read, search, search_count,
+read, create, write, unlink and fields_get on the models of its schema, plus ir.model and ir.model.fields.
+
+    with FakeOdooServer(latency=0.002) as server:
+        backend = OdooBackend(server.url, username="admin", api_key="admin")
+"""
+from __future__ import annotations  # This is crucial for forward references
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+from typing import Any
+import xmlrpc.client
+
+# model -> field -> type, or (type, relation) or ('one2many', relation, inverse field)
+DEFAULT_SCHEMA: dict[str, dict[str, Any]] = {
+    'res.partner': {
+        'name': 'char', 'email': 'char', 'active': 'boolean', 'credit': 'float', 'date': 'date',
+        'parent_id': ('many2one', 'res.partner'), 'child_ids': ('one2many', 'res.partner', 'parent_id'),
+        'category_id': ('many2many', 'res.partner.category'),
+    },
+    'res.partner.category': {'name': 'char'},
+    'account.move': {
+        'name': 'char', 'invoice_date': 'date', 'partner_id': ('many2one', 'res.partner'),
+        'line_ids': ('one2many', 'account.move.line', 'move_id'),
+    },
+    'account.move.line': {
+        'name': 'char', 'quantity': 'integer', 'price': 'float',
+        'move_id': ('many2one', 'account.move'), 'partner_id': ('many2one', 'res.partner'),
+    },
+}
+
+
+class FakeOdooError(Exception): pass
+
+
+class FakeOdooAccessError(FakeOdooError): pass # sent the way Odoo sends an AccessError.
+
+
+class FakeOdooStore:
+    """The records of the fake server, by model and id, and the number of calls by (model, method)."""
+    def __init__(self, schema:dict[str, dict[str, Any]]|None = None, latency:float = 0.0):
+        self.schema: dict[str, dict[str, tuple]] = {
+            model: {f: (t,) if isinstance(t, str) else tuple(t) for f, t in fields.items()}
+            for model, fields in (schema or DEFAULT_SCHEMA).items()}
+        self.data: dict[str, dict[int, dict[str, Any]]] = {model: {} for model in self.schema}
+        self.latency = latency # seconds added to every model call.
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self.orders: dict[str, str] = {} # model -> default order, Odoo's _order, by id when not set.
+        self.lock = threading.Lock()
+        self._next_id = 1
+        self._version = 0 # bumped on every change, it invalidates the one2many indexes.
+        self._children: dict[tuple[str, str], tuple[int, dict[int, list[int]]]] = {}
+
+    def seed(self, model:str, rows:list[dict[str, Any]]) -> list[int]:
+        """Adds rows without going through RPC, returns their ids."""
+        with self.lock:
+            return [self._create(model, dict(row)) for row in rows]
+
+    def call(self, model:str, method:str, args:list, kwargs:dict[str, Any]) -> Any:
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.calls[(model, method)] += 1
+            return self._call(model, method, args, kwargs or {})
+
+    def _now(self) -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _type(self, model:str, field:str) -> tuple:
+        return self.schema.get(model, {}).get(field, ('',))
+
+    def _match(self, model:str, rec:dict[str, Any], domain:list) -> bool:
+        stack: list[bool] = []
+        for term in reversed(domain):
+            if term == '&':
+                stack.append(stack.pop() & stack.pop())
+            elif term == '|':
+                stack.append(stack.pop() | stack.pop())
+            elif term == '!':
+                stack.append(not stack.pop())
+            else:
+                stack.append(self._term(model, rec, *term))
+        return all(stack)
+
+    def _term(self, model:str, rec:dict[str, Any], field:str, op:str, value:Any) -> bool:
+        ftype = self._type(model, field)[0]
+        rv = self._read_field(model, rec, field) if ftype == 'one2many' else rec.get(field, False)
+        if ftype in ('one2many', 'many2many'):
+            values = set(value) if isinstance(value, (list, tuple)) else {value}
+            if op in ('=', 'in'):
+                return bool(set(rv or []) & values) if value else not rv
+            if op in ('!=', 'not in'):
+                return not set(rv or []) & values if value else bool(rv)
+            raise FakeOdooError(f"Unsupported operator {op} on {field}")
+        if op == '=': return rv == value
+        if op == '!=': return rv != value
+        if op == 'in': return rv in value
+        if op == 'not in': return rv not in value
+        if op in ('>', '<', '>=', '<='):
+            if rv is False or value is False:
+                return False
+            return {'>': rv > value, '<': rv < value, '>=': rv >= value, '<=': rv <= value}[op]
+        if op in ('not like', 'not ilike'):
+            return not self._term(model, rec, field, op[4:], value)
+        if op in ('like', 'ilike', '=like', '=ilike'):
+            if ftype == 'many2one': # matched on the name of the related record.
+                rv = (self._read_field(model, rec, field) or [0, False])[1]
+            if not isinstance(rv, str):
+                return False
+            # like and ilike wrap the value in % without escaping it, its own % and _ are wildcards too.
+            value = str(value) if op.startswith('=') else f"%{value}%"
+            pattern = ''.join('.*' if c == '%' else '.' if c == '_' else re.escape(c) for c in value)
+            return re.fullmatch(pattern, rv, re.IGNORECASE | re.DOTALL if 'ilike' in op else re.DOTALL) is not None
+        raise FakeOdooError(f"Unsupported operator {op}")
+
+    def _read_field(self, model:str, rec:dict[str, Any], field:str) -> Any:
+        ftype = self._type(model, field)
+        value = rec.get(field, False)
+        if ftype[0] == 'many2one' and value:
+            target = self.data[ftype[1]].get(value)
+            return [value, target.get('name', '') if target else '']
+        if ftype[0] == 'one2many':
+            return self._child_ids(ftype[1], ftype[2]).get(rec['id'], [])
+        if ftype[0] == 'many2many':
+            return list(value or [])
+        return value
+
+    def _child_ids(self, model:str, inverse:str) -> dict[int, list[int]]:
+        version, index = self._children.get((model, inverse), (-1, {}))
+        if version != self._version:
+            index = {}
+            for id, r in sorted(self.data[model].items()):
+                if r.get(inverse):
+                    index.setdefault(r[inverse], []).append(id)
+            self._children[(model, inverse)] = (self._version, index)
+        return index
+
+    def _row(self, model:str, rec:dict[str, Any], fields:list[str]|None) -> dict[str, Any]:
+        names = fields or list(self.schema[model]) + ['write_date']
+        row = {f: self._read_field(model, rec, f) for f in names}
+        row['id'] = rec['id']
+        return row
+
+    def _commands(self, old:list[int], commands:Any) -> list[int]:
+        # x2many write commands: (4, id) link, (3, id) unlink, (5,) clear, (6, 0, ids) replace. A list of ids replaces.
+        if not commands or not isinstance(commands[0], (list, tuple)):
+            return list(commands or [])
+        ids = list(old or [])
+        for c in commands:
+            if c[0] == 4 and c[1] not in ids:
+                ids.append(c[1])
+            elif c[0] == 3 and c[1] in ids:
+                ids.remove(c[1])
+            elif c[0] == 5:
+                ids = []
+            elif c[0] == 6:
+                ids = list(c[2])
+        return ids
+
+    def _set(self, model:str, rec:dict[str, Any], vals:dict[str, Any]) -> None:
+        for field, value in vals.items():
+            ftype = self._type(model, field)[0]
+            if ftype == 'many2many':
+                value = self._commands(rec.get(field), value)
+            elif ftype == 'one2many':
+                continue # the children hold the relation.
+            rec[field] = value
+        rec['write_date'] = self._now()
+        self._version += 1
+
+    def _create(self, model:str, vals:dict[str, Any]) -> int:
+        table = self.data[model]
+        id = vals.pop('id', None) or self._next_id
+        self._next_id = max(self._next_id, id + 1)
+        rec: dict[str, Any] = {'id': id}
+        if 'active' in self.schema.get(model, {}):
+            rec['active'] = True
+        self._set(model, rec, vals)
+        table[id] = rec
+        return id
+
+    def _call(self, model:str, method:str, args:list, kwargs:dict[str, Any]) -> Any:
+        if model == 'ir.model':
+            rows = [{'id': i + 1, 'model': m, 'name': m} for i, m in enumerate(self.schema)]
+            return [r for r in rows if self._match(model, r, args[0] if args else [])]
+        if model == 'ir.model.fields':
+            rows = []
+            for m, fields in self.schema.items():
+                for f, t in fields.items():
+                    rows.append({'id': len(rows) + 1, 'model': m, 'name': f, 'ttype': t[0],
+                                 'relation': t[1] if len(t) > 1 else False, 'relation_field': t[2] if len(t) > 2 else False,
+                                 'required': False, 'readonly': False, 'on_delete': 'set null', 'write_date': '2024-01-01 00:00:00'})
+            return [r for r in rows if self._match(model, r, args[0] if args else [])]
+        if model not in self.data:
+            raise FakeOdooError(f"Object {model} doesn't exist")
+        table = self.data[model]
+        if method in ('search_read', 'search', 'search_count'):
+            domain = args[0] if args else kwargs.get('domain', [])
+            if 'active' in self.schema.get(model, {}) and (kwargs.get('context') or {}).get('active_test', True) \
+                    and not any(isinstance(t, (list, tuple)) and t[0] == 'active' for t in domain):
+                domain = [('active', '=', True)] + list(domain) # archived records are left out, as Odoo does.
+            recs = [r for r in table.values() if self._match(model, r, domain)]
+            order = (kwargs.get('order') or self.orders.get(model) or 'id').split(',')[0].split()
+            recs.sort(key=lambda r: (r.get(order[0]) is False, r.get(order[0])), reverse=len(order) > 1 and order[1].lower() == 'desc')
+            offset = kwargs.get('offset') or 0
+            limit = kwargs.get('limit')
+            recs = recs[offset:offset + limit if limit else None]
+            if method == 'search':
+                return [r['id'] for r in recs]
+            if method == 'search_count':
+                return len(recs)
+            return [self._row(model, r, kwargs.get('fields')) for r in recs]
+        if method == 'read':
+            fields = kwargs.get('fields') or (args[1] if len(args) > 1 else None)
+            return [self._row(model, table[id], fields) for id in args[0] if id in table]
+        if method == 'create':
+            vals = args[0]
+            if isinstance(vals, dict):
+                return self._create(model, dict(vals))
+            return [self._create(model, dict(v)) for v in vals]
+        if method == 'write':
+            ids, vals = args[0], args[1]
+            for id in ids if isinstance(ids, list) else [ids]:
+                if id not in table:
+                    raise FakeOdooError(f"Record {model}:{id} does not exist")
+                self._set(model, table[id], vals)
+            return True
+        if method == 'unlink':
+            ids = args[0] if isinstance(args[0], list) else [args[0]]
+            missing = [id for id in ids if id not in table]
+            if missing:
+                raise FakeOdooError(f"Record {model}:{missing[0]} does not exist")
+            for id in ids:
+                del table[id]
+            self._version += 1
+            return True
+        if method == 'fields_get':
+            return {'id': {'type': 'integer'}, 'write_date': {'type': 'datetime'},
+                    **{f: {'type': t[0]} for f, t in self.schema[model].items()}}
+        raise FakeOdooError(f"Method {method} is not implemented by the fake server")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, like Odoo behind its proxy.
+    # The headers and the body go out in separate writes, with Nagle's algorithm the body then waits for the
+    # client's delayed ACK, about 40ms on every call.
+    disable_nagle_algorithm = True
+    server: _HTTPServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        store = self.server.store
+        store.calls[('http', self.path)] += 1
+        if self.path.startswith('/xmlrpc/2/'):
+            content_type = 'text/xml'
+            try:
+                params, method = xmlrpc.client.loads(body, use_builtin_types=True)
+                result = self._dispatch(self.path.rpartition('/')[2], method, list(params))
+                out = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+            except Exception as e:
+                out = xmlrpc.client.dumps(xmlrpc.client.Fault(4 if isinstance(e, FakeOdooAccessError) else 1, str(e)), methodresponse=True)
+        elif self.path == '/jsonrpc':
+            content_type = 'application/json'
+            request = json.loads(body)
+            try:
+                params = request['params']
+                result = self._dispatch(params['service'], params['method'], params['args'])
+                out = json.dumps({'jsonrpc': '2.0', 'id': request.get('id'), 'result': result})
+            except Exception as e:
+                error: dict[str, Any] = {'message': str(e)}
+                if isinstance(e, FakeOdooAccessError):
+                    error['data'] = {'name': 'odoo.exceptions.AccessError', 'message': str(e)}
+                out = json.dumps({'jsonrpc': '2.0', 'id': request.get('id'), 'error': error})
+        else:
+            self.send_error(404)
+            return
+        data = out.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, service:str, method:str, args:list) -> Any:
+        if service == 'common':
+            if method == 'version':
+                return {'server_version': '17.0', 'server_serie': '17.0'}
+            if method in ('authenticate', 'login'):
+                return 2
+            raise FakeOdooError(f"Unknown method common.{method}")
+        if service == 'object' and method == 'execute_kw':
+            model, model_method = args[3], args[4]
+            return self.server.store.call(model, model_method, args[5] if len(args) > 5 else [], args[6] if len(args) > 6 else {})
+        if service == 'object' and method == 'execute':
+            return self.server.store.call(args[3], args[4], args[5:], {})
+        raise FakeOdooError(f"Unknown method {service}.{method}")
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    store: FakeOdooStore
+
+
+class FakeOdooServer:
+    """Runs a FakeOdooStore behind an HTTP server on a free local port, in a background thread."""
+    def __init__(self, schema:dict[str, dict[str, Any]]|None = None, latency:float = 0.0, host:str = '127.0.0.1', port:int = 0):
+        self.store = FakeOdooStore(schema, latency)
+        self._host = host
+        self._port = port
+        self._httpd: _HTTPServer|None = None
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise ValueError("The server is not started")
+        return f"http://{self._host}:{self._httpd.server_address[1]}"
+
+    @property
+    def calls(self) -> Counter[tuple[str, str]]:
+        return self.store.calls
+
+    def start(self) -> FakeOdooServer:
+        self._httpd = _HTTPServer((self._host, self._port), _Handler)
+        self._httpd.store = self.store
+        threading.Thread(target=self._httpd.serve_forever, name="fake-odoo", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> FakeOdooServer:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
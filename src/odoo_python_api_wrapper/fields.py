@@ -0,0 +1,203 @@
+from __future__ import annotations  # This is crucial for forward references
+import importlib
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar, overload
+from .data_class import OdooDataClass, _parse_date, _parse_datetime, model_class
+from .data_class_interface import OdooWrapperInterface
+
+T = TypeVar('T') # what the attribute returns, for the relations the annotation gives it: Many2one[Partner|None].
+
+
+class Field(Generic[T]):
+    """
+    Descriptor for one field of a generated wrapper. Reading it looks the raw value up in the record's
+    changes and a__wo and converts it, the property returns `default` when the field is not set.
+    """
+    __slots__ = ('name', 'default', 'readonly', 'attr')
+    setter = 'set_data'
+
+    def __init__(self, name:str, default:Any=None, readonly:bool=False):
+        self.name = name
+        self.default = default
+        self.readonly = readonly
+        self.attr = name
+
+    def __set_name__(self, owner:type, attr:str) -> None:
+        self.attr = attr
+
+    def raw(self, obj:OdooDataClass) -> Any:
+        changes = obj._changes
+        if changes and self.name in changes:
+            return changes[self.name]
+        return obj.a__wo.get(self.name)
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> T|None:
+        return raw
+
+    def get(self, obj:OdooDataClass, when_none:Any=None) -> Any:
+        ret = self.decode(obj, self.raw(obj))
+        return when_none if ret is None else ret
+
+    def value(self, obj:OdooDataClass) -> Any:
+        ret = self.decode(obj, self.raw(obj))
+        return self.default if ret is None else ret
+
+    @overload
+    def __get__(self, obj:None, owner:type|None=None) -> Field[T]: ...
+    @overload
+    def __get__(self, obj:OdooDataClass, owner:type|None=None) -> T: ...
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        name = self.name # value() inlined, this is what attribute reads in loops go through.
+        changes = obj._changes
+        ret = self.decode(obj, changes[name] if changes and name in changes else obj.a__wo.get(name))
+        return self.default if ret is None else ret
+
+    def __set__(self, obj:OdooDataClass, value:Any) -> None:
+        if self.readonly:
+            raise AttributeError(f"{self.attr} is read only")
+        getattr(obj, self.setter)(self.name, value)
+
+
+class FloatField(Field[float]):
+    __slots__ = ()
+    setter = 'set_value_float'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> float|None:
+        if raw is None or type(raw) is float:
+            return raw
+        return obj._decode(self.name, raw, float)
+
+
+class IntField(Field[int]):
+    __slots__ = ()
+    setter = 'set_value_int'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> int|None:
+        if raw is None or type(raw) is int:
+            return raw
+        return obj._decode(self.name, raw, int)
+
+
+class BoolField(Field[bool]):
+    __slots__ = ()
+    setter = 'set_value_bool'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> bool|None:
+        return None if raw is None else bool(raw)
+
+
+class StrField(Field[str]):
+    __slots__ = ()
+    setter = 'set_value_str'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> str|None:
+        if raw is None or raw is False:
+            return None
+        return raw if type(raw) is str else str(raw)
+
+
+class DateField(Field[date]):
+    __slots__ = ()
+    setter = 'set_value_date'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> date|None:
+        if raw is None or raw is False:
+            return None
+        return obj._decode(self.name, raw, _parse_date)
+
+    def get_str(self, obj:OdooDataClass, format:str = '%Y-%m-%d', when_none:Any=None) -> Any:
+        ret = self.decode(obj, self.raw(obj))
+        return when_none if ret is None else ret.strftime(format)
+
+
+class DatetimeField(Field[datetime]):
+    __slots__ = ()
+    setter = 'set_value_datetime'
+
+    def decode(self, obj:OdooDataClass, raw:Any) -> datetime|None:
+        if raw is None or raw is False:
+            return None
+        return obj._decode(self.name, raw, _parse_datetime)
+
+
+class _Relation(Field[T]):
+    """Relational field. The wrapper class of the related model is resolved the first time it is needed."""
+    __slots__ = ('relation', 'target', '_target_class')
+
+    def __init__(self, name:str, relation:str, target:str|None=None, readonly:bool=False):
+        super().__init__(name, None, readonly)
+        self.relation = relation
+        self.target = target # module of the wrapper class, "db.Partner" for class Partner.
+        self._target_class: type[OdooWrapperInterface]|None = None
+
+    def target_class(self) -> type[OdooWrapperInterface]:
+        cls = self._target_class
+        if cls is None:
+            if self.target:
+                cls = getattr(importlib.import_module(self.target), self.target.rpartition('.')[2])
+            else:
+                cls = model_class(self.relation) # type: ignore
+                if cls is None:
+                    raise ValueError(f"No wrapper class is registered for {self.relation}, used by {self.attr}.")
+            self._target_class = cls
+        return cls
+
+    @overload
+    def __get__(self, obj:None, owner:type|None=None) -> _Relation[T]: ...
+    @overload
+    def __get__(self, obj:OdooDataClass, owner:type|None=None) -> T: ...
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.value(obj)
+
+
+class Many2one(_Relation[T]):
+    __slots__ = ('required',)
+    setter = 'set_many2one'
+
+    def __init__(self, name:str, relation:str, target:str|None=None, required:bool=False, readonly:bool=False):
+        super().__init__(name, relation, target, readonly)
+        self.required = required
+
+    def get(self, obj:OdooDataClass, when_none:Any=None) -> Any:
+        ret = obj.get_many2one(self.name, self.target_class(), when_none)
+        return ret if ret else when_none
+
+    def value(self, obj:OdooDataClass) -> Any:
+        ret = obj.get_many2one(self.name, self.target_class())
+        if self.required and not ret:
+            raise ValueError(f'Key {self.attr} is not set.')
+        return ret
+
+
+class One2many(_Relation[T]):
+    __slots__ = ('inverse',)
+
+    def __init__(self, name:str, relation:str, target:str|None=None, inverse:str|None=None):
+        super().__init__(name, relation, target, readonly=True)
+        self.inverse = inverse
+
+    def get(self, obj:OdooDataClass, when_none:Any=None) -> Any:
+        return obj.get_one2many(self.name, self.target_class(), self.inverse) # type: ignore
+
+    def value(self, obj:OdooDataClass) -> Any:
+        return obj.get_one2many(self.name, self.target_class(), self.inverse) # type: ignore
+
+
+class Many2many(_Relation[T]):
+    __slots__ = ()
+
+    def __init__(self, name:str, relation:str, target:str|None=None):
+        super().__init__(name, relation, target, readonly=True)
+
+    def get(self, obj:OdooDataClass, when_none:Any=None) -> Any:
+        return obj.get_many2many(self.name, self.target_class())
+
+    def value(self, obj:OdooDataClass) -> Any:
+        return obj.get_many2many(self.name, self.target_class())
+
+    def append(self, obj:OdooDataClass, new_value:Any) -> None:
+        obj.append_many2many(self.name, self.target_class(), new_value)
@@ -1,6 +1,12 @@
+import hashlib
+import json
 import os
+from typing import Any
 from .api_wrapper import OdooTransaction
 
+MANIFEST = "wrappers_manifest.json" # in the db directory: class name -> hash of its generated B file.
+FIELD_COLUMNS = ['model', 'name', 'ttype', 'relation', 'relation_field', 'required', 'on_delete', 'readonly']
+
 
 class Klass:
     model_classes = {}
@@ -18,9 +24,7 @@ class Klass:
 
     def add_import(self,ifrom:str,iitem:str) -> str:
         if ifrom in self.imports:
-            if not (self.imports[ifrom].endswith(","+iitem) or 
-                    self.imports[ifrom].startswith(iitem+",") or
-                    ","+iitem+"," in self.imports[ifrom]):
+            if iitem not in self.imports[ifrom].split(","):
                 self.imports[ifrom] = ",".join([self.imports[ifrom], iitem])
         else:
             self.imports[ifrom] = iitem
@@ -37,160 +41,113 @@ class Klass:
         if field_name.startswith("x_"):
             prop_name = field_name.replace("x_", "", 1)
 
-        self.fields += f"    _{prop_name.upper()} = '{field_name}'\n"
+        const = f"_{prop_name.upper()}"
+        base = f"{self.name}B"
+        self.fields += f"    {const} = '{field_name}'\n"
+        readonly_arg = ", readonly=True" if read_only else ""
 
+        if db_type in ('many2one', 'one2many', 'many2many'):
+            other_class_name = self.model_classes.get(field['relation'], "OdooWrapperInterface")
+            # The descriptor imports the class on first use, classes that are not generated are found in the model registry.
+            target = f"'db.{other_class_name}'" if other_class_name != "OdooWrapperInterface" else "None"
+            self.type_only_forward_imports[f"db.{other_class_name}"] = other_class_name
 
         if db_type == 'many2one':
             rel_prop_name = prop_name
-            other_class_name = self.model_classes.get(field['relation'], "OdooWrapperInterface")
-            self.type_only_forward_imports[f"db.{other_class_name}"] = other_class_name
-            
+            descriptor = self.add_import("odoo_python_api_wrapper.fields", "Many2one")
             always_set_for_type_checking = (field['required'] or 
                                             "CASCADE" in str(field['on_delete']).upper() or
                                             "RESTRICT" in str(field['on_delete']).upper()
                                             ) 
             self.field_desc += f"    # {prop_name} is a many2one field of type {other_class_name}\n"
-            self.fields += f"    @property # many2one\n"
-            self.fields += f"    def {rel_prop_name}(self) -> {other_class_name}{"|None" if not always_set_for_type_checking else ""} : # required: {field['required']}, on delete: {field['on_delete']}\n"
-            if other_class_name != "OdooWrapperInterface":
-                self.fields += f"        from db.{other_class_name} import {other_class_name}\n"
-            self.fields += f"        ret = self.get_many2one(self._{prop_name.upper()}, {other_class_name}) \n"
-            if always_set_for_type_checking:
-                self.fields += f"        if not ret: raise ValueError(f'Key {prop_name} is not set.') \n"
-            self.fields += f"        return ret\n"
+            self.fields += f"    {rel_prop_name}: {descriptor}[{other_class_name}{"|None" if not always_set_for_type_checking else ""}] = {descriptor}({const}, '{field['relation']}', {target}, required={bool(always_set_for_type_checking)}{readonly_arg}) # required: {field['required']}, on delete: {field['on_delete']}\n"
             self.fields += f"    def get_{rel_prop_name}(self, when_none:T|None=None) -> {other_class_name}|T:\n"
-            if other_class_name != "OdooWrapperInterface":
-                self.fields += f"        from db.{other_class_name} import {other_class_name}\n"
-            self.fields += f"        ret = self.get_many2one(self._{prop_name.upper()}, {other_class_name},when_none)\n"
-            self.fields += f"        return ret if ret else when_none # type: ignore\n"
-            
+            self.fields += f"        return {base}.{rel_prop_name}.get(self, when_none)\n"
             if not read_only:
-                self.fields += f"    @{rel_prop_name}.setter\n"
-                self.fields += f"    def {rel_prop_name}(self, value:{other_class_name}|None) -> None:\n"
-                self.fields += f"        self.set_{rel_prop_name}(value)\n"
                 self.fields += f"    def set_{rel_prop_name}(self, value:{other_class_name}|None) -> None:\n"
-                self.fields += f"        self.set_many2one(self._{prop_name.upper()}, value)\n"
+                self.fields += f"        self.{rel_prop_name} = value\n"
+            self.fields += "\n"
 
         elif db_type == 'one2many':
-            # self.imports['typing'] = 'list'
-            other_class_name = self.model_classes.get(field['relation'], "OdooWrapperInterface")
+            descriptor = self.add_import("odoo_python_api_wrapper.fields", "One2many")
             self.field_desc += f"    # {prop_name} is a one2many field of type {other_class_name} \n"
-            self.type_only_forward_imports[f"{other_class_name}"] = other_class_name
-            self.fields += f"    @property # one2many\n"
-            self.fields += f"    def {prop_name}(self) -> list[{other_class_name}]:\n"
-            self.fields += f"        return self.get_{prop_name}()\n"
+            self.fields += f"    {prop_name}: {descriptor}[list[{other_class_name}]] = {descriptor}({const}, '{field['relation']}', {target}, '{field['relation_field']}')\n"
             self.fields += f"    def get_{prop_name}(self) -> list[{other_class_name}]:\n"
-            if other_class_name != "OdooWrapperInterface":
-                self.fields += f"        from db.{other_class_name} import {other_class_name}\n"
-            self.fields += f"        ret = self.get_one2many(self._{prop_name.upper()}, {other_class_name}, '{field['relation_field']}')\n"
-            self.fields += f"        return ret\n\n"
+            self.fields += f"        return {base}.{prop_name}.get(self)\n\n"
         elif db_type == 'many2many':
-            # self.imports['typing'] = 'list'
-            other_class_name = self.model_classes.get(field['relation'], "OdooWrapperInterface")
+            descriptor = self.add_import("odoo_python_api_wrapper.fields", "Many2many")
             self.field_desc += f"    # {prop_name} is a many2many field of type {other_class_name} \n"
-            self.type_only_forward_imports[f"db.{other_class_name}"] = other_class_name
-            self.fields += f"    @property # many2many\n"
-            self.fields += f"    def {prop_name}(self) -> tuple[{other_class_name}]:\n"
-            if other_class_name != "OdooWrapperInterface":
-                self.fields += f"        from db.{other_class_name} import {other_class_name}\n"
-            self.fields += f"        ret = self.get_many2many(self._{prop_name.upper()}, {other_class_name}) \n"
-            self.fields += f"        return ret\n"
+            self.fields += f"    {prop_name}: {descriptor}[tuple[{other_class_name}]] = {descriptor}({const}, '{field['relation']}', {target})\n"
             self.fields += f"    def {prop_name}_append(self, new_value:{other_class_name}|list[{other_class_name}]):\n"
-            if other_class_name != "OdooWrapperInterface":
-                self.fields += f"        from db.{other_class_name} import {other_class_name}\n"
-            self.fields += f"        self.append_many2many(self._{prop_name.upper()}, {other_class_name}, new_value) \n\n"
+            self.fields += f"        {base}.{prop_name}.append(self, new_value)\n\n"
         else:                    
-            
+            default = "None"
             match db_type:
-                case 'float': py_type = py_conversion = 'float'
+                case 'float':
+                    py_type = 'float'
+                    descriptor = 'FloatField'
+                    default = '0.0'
                 case 'date': 
                     py_type = self.add_import("datetime", "date")
-                    py_conversion = 'date'
+                    descriptor = 'DateField'
                 case 'datetime':  
                     py_type = self.add_import("datetime", "datetime")
-                    py_conversion = 'datetime'
-                case 'many2one':
-                    py_conversion = 'int'
+                    descriptor = 'DatetimeField'
+                case 'integer':
                     py_type = 'int'
-                case 'integer':  py_type = py_conversion = 'int'
-                case 'boolean':  py_type = py_conversion = 'bool'
-                case 'char':  py_type = py_conversion = 'str'
+                    descriptor = 'IntField'
+                    default = '0'
+                case 'boolean':
+                    py_type = 'bool'
+                    descriptor = 'BoolField'
+                case 'char':
+                    py_type = 'str'
+                    descriptor = 'StrField'
+                    default = "''"
                 case _:  # Default case
-                    py_type = py_conversion = 'str'
+                    py_type = 'str'
+                    descriptor = 'StrField'
+            self.add_import("odoo_python_api_wrapper.fields", descriptor)
 
             self.field_desc += f"    # {prop_name} is a {py_type} field  \n"
-                
-            if py_conversion == 'date':
+
+            # The property returns the default when the field is not set, use the get version to check for none.
+            default_arg = f", default={default}" if default != "None" else ""
+            self.fields += f"    {prop_name} = {descriptor}({const}{default_arg}{readonly_arg})\n"
+            if descriptor == 'DateField':
                 self.fields += f"    def get_{prop_name}_str(self, format:str = '%Y-%m-%d', when_none:str|T=None) -> str|T:\n"
-                self.fields += f"        ret = self.get_value_{py_conversion}(self._{prop_name.upper()})\n"
-                self.fields += f"        if ret is None: \n"
-                self.fields += f"            return when_none\n"
-                self.fields += f"        return ret.strftime(format)\n"
-                
+                self.fields += f"        return {base}.{prop_name}.get_str(self, format, when_none)\n"
             self.fields += f"    def get_{prop_name}(self, when_none:T=None) -> {py_type}|T:\n"
-            self.fields += f"        ret = self.get_value_{py_conversion}(self._{prop_name.upper()})\n"
-            self.fields += f"        if ret is None: \n"
-            self.fields += f"            return when_none\n"
-            self.fields += f"        return ret\n"
-
-            if (db_type == 'float' or db_type == 'integer' or db_type == 'char'):
-                self.fields += f"    @property # use get version to check for none, this will return 0 or empty string in the property.\n"
-                self.fields += f"    def {prop_name}(self) -> {py_type}:\n"
-                self.fields += f"        ret = self.get_{prop_name}()\n"
-                if db_type == 'float':
-                    self.fields += f"        if ret is None: return 0.00\n"
-                elif db_type == 'integer':
-                    self.fields += f"        if ret is None: return 0\n"
-                elif db_type == 'char':
-                    self.fields += f"        if ret is None: return ''\n"
-                else: 
-                    raise ValueError(f"Unknown type {db_type}")
-                    
-                self.fields += f"        return ret\n"
-            else:
-                self.fields += f"    @property\n"
-                self.fields += f"    def {prop_name}(self) -> {py_type}|None:\n"
-                self.fields += f"        ret = self.get_{prop_name}()\n"
-                # self.fields += f"        if ret is None: raise ValueError(f'Key {prop_name} is not set.')\n"
-                self.fields += f"        return ret\n"
-                
-            if not read_only:            
-                self.fields += f"    @{prop_name}.setter\n"
-                self.fields += f"    def {prop_name}(self, value:{py_type}|None) -> None:\n"
-                self.fields += f"        self.set_value_{py_conversion}(self._{prop_name.upper()}, value)\n"
-                            
-            self.fields += "\n\n"
-
-    def save(self, base_dir="."):
-        
-        self.file_name_base = f'{base_dir}/db/{self.name}B.py'
-        self.file_name_ext = f'{base_dir}/db/{self.name}.py'
-        self.init_py_path = f"{base_dir}/db/__init__.py"
+            self.fields += f"        return {base}.{prop_name}.get(self, when_none)\n"
+            self.fields += "\n"
 
+    def save(self, base_dir=".", force:bool=False) -> bool:
+        """Generates this model's wrapper. False when the generated code did not change and nothing was written."""
+        return bool(generate(self.odoo, [self], base_dir, force))
+
+    def render(self, fields:list) -> str:
+        """The source of db/<name>B.py for the ir.model.fields rows of the model."""
         self.field_desc = ""
         self.fields = ""
-        
-        for emodel in self.odoo.search_raw('ir.model',[("model","=", self.model)]):
-            print(f"Loading model {emodel.get_value('name')}")
 
-            fields = self.odoo.search_raw('ir.model.fields', [("model", "=", self.model)])
-            fields_sorted = sorted(fields, key=lambda field: (field.get_value("name") or "").lstrip("x_"))
+        fields_sorted = sorted(fields, key=lambda field: (field.get_value("name") or "").lstrip("x_"))
 
-            for field in fields_sorted:
-                if field.get_value("name") in ['id', 'create_uid', 'write_uid']:
-                    continue
-                
-                read_only = False
-                if field.get_value('readonly'):
-                    read_only = True
+        for field in fields_sorted:
+            if field.get_value("name") in ['id', 'create_uid', 'write_uid']:
+                continue
+            
+            read_only = False
+            if field.get_value('readonly'):
+                read_only = True
 
-                self.field(field, read_only)
+            self.field(field, read_only)
 
         header = ""
         header += f"\n"
         header += f"T = TypeVar('T')\n"
         header += f"\n"
         header += f"class {self.name}B(OdooDataClass):\n"
+        header += f"    __slots__ = ()\n"
         header += f"    @classmethod\n"
         header += f"    def _get_model(cls) -> str:\n"
         header += f"        return '{self.model}'\n"
@@ -199,12 +156,11 @@ class Klass:
         header += f"        super().__init__(trans, '{self.model}', id, wo)\n"
         header += f"\n"        
         
-        imports = ""
+        imports = f"from __future__ import annotations  # This is crucial for forward references\n" # the field annotations name classes only imported for type checking.
         if self.type_only_forward_imports:
             for k,v in self.type_only_forward_imports.items():            
                 if v != "OdooDataClass" and v != "OdooWrapperInterface":
                     if not "from typing import TYPE_CHECKING" in imports:
-                        imports += f"from __future__ import annotations  # This is crucial for forward references\n"
                         imports += f"from typing import TYPE_CHECKING\n"
                         imports += f"if TYPE_CHECKING:\n"
                     imports += f"    from {k} import {v} # Import only when type checking\n"
@@ -213,7 +169,13 @@ class Klass:
             imports += f"from {k} import {v}\n"
 
         
-        complete_class = imports+header+self.field_desc+self.fields
+        return imports+header+self.field_desc+self.fields
+
+    def write(self, complete_class:str, base_dir=".") -> bool:
+        """Writes the B file, the class to extend when there is none yet and the db import. False when it failed."""
+        self.file_name_base = f'{base_dir}/db/{self.name}B.py'
+        self.file_name_ext = f'{base_dir}/db/{self.name}.py'
+        self.init_py_path = f"{base_dir}/db/__init__.py"
 
         try:
             with open(self.file_name_base, 'w') as f:
@@ -222,7 +184,7 @@ class Klass:
 
             if not os.path.exists(self.file_name_ext):
                 with open(self.file_name_ext, 'w') as f:
-                    f.write(f"from db.{self.name}B import {self.name}B\nfrom typing import Any\nfrom odoo_python_api_wrapper.api_wrapper import OdooTransaction\n\nclass {self.name}({self.name}B):\n    def __init__(self, odoo:OdooTransaction, id:int|None=None,wo:dict[str,Any]|None = None):\n        super().__init__(odoo, id, wo)")
+                    f.write(f"from db.{self.name}B import {self.name}B\nfrom typing import Any\nfrom odoo_python_api_wrapper.api_wrapper import OdooTransaction\n\nclass {self.name}({self.name}B):\n    __slots__ = () # no __dict__ for the many cached records, remove it to give them other attributes.\n\n    def __init__(self, odoo:OdooTransaction, id:int|None=None,wo:dict[str,Any]|None = None):\n        super().__init__(odoo, id, wo)")
 
             import_statement = f"from .{self.name} import {self.name}\n"
 
@@ -236,9 +198,50 @@ class Klass:
                 content += import_statement
                 with open(self.init_py_path, 'w') as f:
                     f.write(content)
+            return True
 
         except Exception as e:
             print(f"Error writing to file: {e}")       
+            return False
+
+
+def generate(odoo:OdooTransaction, klasses:list[Klass], base_dir=".", force:bool=False) -> list[Klass]:
+    """
+    Generates the wrappers of several models, reading ir.model and ir.model.fields once for all of them.
+    A B file is only rewritten when its generated code differs from the hash kept in the manifest, so
+    unchanged modules keep their bytecode. force rewrites them all. Returns the classes that were written.
+    """
+    models = [k.model for k in klasses]
+    names = {m.get_value('model'): m.get_value('name') for m in odoo.search_raw('ir.model', [("model", "in", models)], ['model', 'name'])}
+    fields_by_model: dict[str, list] = {}
+    for field in odoo.search_raw('ir.model.fields', [("model", "in", models)], FIELD_COLUMNS):
+        fields_by_model.setdefault(field.get_value('model'), []).append(field)
+
+    manifest_path = f"{base_dir}/db/{MANIFEST}"
+    manifest: dict[str, Any] = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    written = []
+    for k in klasses:
+        if k.model not in names:
+            print(f"Model {k.model} not found")
+        complete_class = k.render(fields_by_model.get(k.model, []))
+        digest = hashlib.sha256(complete_class.encode()).hexdigest()
+        if not force and manifest.get(k.name) == digest and os.path.exists(f"{base_dir}/db/{k.name}B.py"):
+            continue
+        if not k.write(complete_class, base_dir):
+            continue # no digest, so the next run tries again.
+        manifest[k.name] = digest
+        written.append(k)
+
+    if written:
+        with open(manifest_path + ".tmp", 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    print(f"{len(written)} of {len(klasses)} wrappers written, {len(klasses) - len(written)} unchanged")
+    return written
 
          
 
@@ -253,5 +256,4 @@ class Klass:
 #      Klass(odoo, "x_cd.commission_forecast", "CDCommissionForecast"),
 #      ]
 
-# for model in models:
-#     model.save()
+# generate(odoo, models)
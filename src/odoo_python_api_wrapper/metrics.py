@@ -0,0 +1,148 @@
+from __future__ import annotations  # This is crucial for forward references
+import bisect
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+if TYPE_CHECKING:
+    from .record_store import ConcurrentRecordStore
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0) # seconds
+
+
+class _CallStats:
+    __slots__ = ('calls', 'errors', 'seconds', 'buckets', 'rows', 'bytes_sent', 'bytes_received')
+
+    def __init__(self, buckets:int):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (buckets + 1) # the last one counts the calls slower than every bucket.
+        self.rows = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class Metrics:
+    """
+    RPC counters of a backend by model and method: calls, errors, latency histogram, rows returned and
+    bytes on the wire. Also counts the hits and misses of the transaction caches, the backend cache
+    counts its own. Read it with snapshot(), to_json() or to_prometheus(). Disabled, it counts nothing.
+    """
+    def __init__(self, cache:ConcurrentRecordStore|None = None, enabled:bool = True, buckets:tuple[float, ...] = LATENCY_BUCKETS):
+        self.cache = cache
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._calls: dict[tuple[str, str], _CallStats] = {}
+        self._lookups: dict[str, list[int]] = {} # model -> [hits, misses] of the transaction caches.
+        self._local = threading.local() # the call running on this thread, its bytes are counted by the connection pool.
+
+    def _stats(self, model:str, method:str) -> _CallStats:
+        stats = self._calls.get((model, method))
+        if stats is None:
+            stats = self._calls[(model, method)] = _CallStats(len(self.buckets))
+        return stats
+
+    def started(self, model:str, method:str) -> None:
+        self._local.call = (model, method)
+
+    def finished(self, model:str, method:str, seconds:float, result:Any, error:bool = False) -> None:
+        self._local.call = None
+        with self._lock:
+            stats = self._stats(model, method)
+            stats.calls += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+            if isinstance(result, list):
+                stats.rows += len(result)
+
+    def transferred(self, path:str, sent:int, received:int) -> None:
+        """Bytes of one HTTP request, counted for the call running on this thread or else for the path."""
+        total = getattr(self._local, 'transfer', None) or (0, 0)
+        self._local.transfer = (total[0] + sent, total[1] + received) # for take_transfer(), even when disabled.
+        if not self.enabled:
+            return
+        model, method = getattr(self._local, 'call', None) or ('', path)
+        with self._lock:
+            stats = self._stats(model, method)
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+
+    def take_transfer(self) -> tuple[int, int]:
+        """Bytes sent and received on this thread since the last call."""
+        total = getattr(self._local, 'transfer', None) or (0, 0)
+        self._local.transfer = None
+        return total
+
+    def cache_lookup(self, model:str, hit:bool) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self._lookups.get(model)
+            if counts is None:
+                counts = self._lookups[model] = [0, 0]
+            counts[0 if hit else 1] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._lookups.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            rpc = [{
+                'model': model, 'method': method, 'calls': s.calls, 'errors': s.errors, 'seconds': s.seconds,
+                'rows': s.rows, 'bytes_sent': s.bytes_sent, 'bytes_received': s.bytes_received,
+                'latency': dict(zip([str(b) for b in self.buckets] + ['inf'], s.buckets)),
+            } for (model, method), s in self._calls.items()]
+            lookups = {model: {'hits': h, 'misses': m, 'hit_ratio': h / (h + m) if h + m else None}
+                       for model, (h, m) in self._lookups.items()}
+        return {
+            'rpc': rpc,
+            'cache': {'transaction': lookups, 'backend': self.cache.stats() if self.cache is not None else {}},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix:str = "odoo") -> str:
+        """The snapshot in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines: list[str] = []
+
+        def metric(name:str, kind:str, help:str, samples:list[tuple[str, dict[str, str], Any]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}")
+
+        calls = [({'model': r['model'], 'method': r['method']}, r) for r in snap['rpc']]
+        metric("rpc_calls_total", "counter", "RPC calls.", [("", l, r['calls']) for l, r in calls])
+        metric("rpc_errors_total", "counter", "RPC calls that raised.", [("", l, r['errors']) for l, r in calls])
+        metric("rpc_rows_total", "counter", "Rows returned by RPC calls.", [("", l, r['rows']) for l, r in calls])
+        metric("rpc_request_bytes_total", "counter", "Bytes sent.", [("", l, r['bytes_sent']) for l, r in calls])
+        metric("rpc_response_bytes_total", "counter", "Bytes received, before decompression.", [("", l, r['bytes_received']) for l, r in calls])
+        histogram = []
+        for l, r in calls:
+            cumulative = 0
+            for le, count in r['latency'].items():
+                cumulative += count
+                histogram.append(("_bucket", {**l, 'le': '+Inf' if le == 'inf' else le}, cumulative))
+            histogram.append(("_sum", l, r['seconds']))
+            histogram.append(("_count", l, r['calls']))
+        metric("rpc_duration_seconds", "histogram", "RPC call latency.", histogram)
+
+        caches = [({'cache': cache, 'model': model}, s) for cache, models in snap['cache'].items() for model, s in models.items()]
+        metric("cache_hits_total", "counter", "Cache lookups answered from the cache.", [("", l, s['hits']) for l, s in caches])
+        metric("cache_misses_total", "counter", "Cache lookups that were not.", [("", l, s['misses']) for l, s in caches])
+        backend = [({'model': model}, s) for model, s in snap['cache']['backend'].items()]
+        metric("cache_entries", "gauge", "Records in the backend cache.", [("", l, s['entries']) for l, s in backend])
+        metric("cache_bytes", "gauge", "Approximate memory of the backend cache.", [("", l, s['bytes']) for l, s in backend])
+        metric("cache_evictions_total", "counter", "Records evicted from the backend cache.", [("", l, s['evictions']) for l, s in backend])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value:str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,66 @@
+from __future__ import annotations  # This is crucial for forward references
+import json
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+
+class PersistentRecordCache:
+    """
+    SQLite file keeping search_read rows between processes, keyed by model and id and tagged with the
+    row's write_date so a later process can check in one query which rows are still current.
+    Several processes can share the file, writes are serialized by SQLite.
+    """
+    def __init__(self, path:str, timeout:float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS records (model TEXT NOT NULL, id INTEGER NOT NULL, "
+                         "write_date TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (model, id))")
+
+    def load(self, model:str) -> dict[int, dict[str,Any]]:
+        """Every row kept for model, by id. The rows include 'id' and 'write_date'."""
+        with self._lock:
+            rows = self._db.execute("SELECT id, data FROM records WHERE model = ?", (model,)).fetchall()
+        return {id: json.loads(data) for id, data in rows}
+
+    def store(self, model:str, rows:Iterable[dict[str,Any]]) -> None:
+        """Keeps full search_read rows. Rows without a write_date cannot be validated later and are skipped."""
+        values = []
+        for row in rows:
+            if not row.get('write_date') or not row.get('id'):
+                continue
+            try:
+                values.append((model, row['id'], str(row['write_date']), json.dumps(row)))
+            except TypeError:
+                continue # a value json cannot hold, such as an xmlrpc DateTime.
+        if not values:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO records (model, id, write_date, data) VALUES (?, ?, ?, ?)", values)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def discard(self, model:str, ids:Iterable[int]) -> None:
+        values = [(model, id) for id in ids if id and id > 0]
+        if not values:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM records WHERE model = ? AND id = ?", values)
+
+    def clear(self, model:str|None = None) -> None:
+        with self._lock:
+            if model is None:
+                self._db.execute("DELETE FROM records")
+            else:
+                self._db.execute("DELETE FROM records WHERE model = ?", (model,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,121 @@
+from __future__ import annotations  # This is crucial for forward references
+from collections import defaultdict
+import os
+import sys
+import sysconfig
+import threading
+from typing import Any, TextIO
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_STDLIB_DIRS = tuple({os.path.abspath(sysconfig.get_paths()[k]) for k in ('stdlib', 'platstdlib')})
+
+
+def call_site() -> str:
+    """file:line (function) of the innermost frame outside this package and the standard library."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_PACKAGE_DIR) and not filename.startswith(_STDLIB_DIRS):
+            return f"{frame.f_code.co_filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return f"<{threading.current_thread().name}>" # a page prefetched on a background thread.
+
+
+def domain_shape(domain:Any) -> str:
+    """The domain with its values left out, so searches that only differ by value are grouped."""
+    if not isinstance(domain, (list, tuple)):
+        return "?"
+    terms = []
+    for t in domain:
+        if isinstance(t, (list, tuple)) and len(t) == 3:
+            value = f"<{len(t[2])}>" if isinstance(t[2], (list, tuple)) else "?"
+            terms.append(f"({t[0]!r}, {t[1]!r}, {value})")
+        else:
+            terms.append(repr(t))
+    return f"[{', '.join(terms)}]"
+
+
+def single_id(method:str, args:list) -> bool:
+    """Whether the call reads one record by id, the call an N+1 pattern repeats."""
+    if not args or not isinstance(args[0], (list, tuple)):
+        return False
+    first = args[0]
+    if method == 'read':
+        return len(first) == 1
+    if method in ('search_read', 'search') and len(first) == 1 and isinstance(first[0], (list, tuple)) and len(first[0]) == 3:
+        field, op, value = first[0]
+        return field == 'id' and (op == '=' or (op == 'in' and isinstance(value, (list, tuple)) and len(value) == 1))
+    return False
+
+
+class RpcTrace:
+    __slots__ = ('model', 'method', 'shape', 'seconds', 'bytes_sent', 'bytes_received', 'rows', 'site', 'single_id')
+
+    def __init__(self, model:str, method:str, shape:str, seconds:float, bytes_sent:int, bytes_received:int, rows:int, site:str, single_id:bool):
+        self.model = model
+        self.method = method
+        self.shape = shape
+        self.seconds = seconds
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.rows = rows
+        self.site = site
+        self.single_id = single_id
+
+
+class RpcProfiler:
+    """
+    Records every RPC of a transaction with its model, method, domain shape, latency, payload size and the
+    line of user code that caused it. Call sites that read `n_plus_one` or more single records of the same
+    model by id are reported as N+1 patterns, the reads to batch. The report is printed to `file` when the
+    transaction commits, or on demand with report().
+    """
+    def __init__(self, n_plus_one:int = 5, file:TextIO|None = None, top:int = 20):
+        self.n_plus_one = n_plus_one
+        self.file = file
+        self.top = top
+        self.traces: list[RpcTrace] = []
+        self._lock = threading.Lock() # pages can be fetched on a background thread.
+
+    def record(self, model:str, method:str, args:list, seconds:float, result:Any, transferred:tuple[int, int]) -> None:
+        shape = domain_shape(args[0]) if method in ('search_read', 'search', 'search_count') and args else method
+        trace = RpcTrace(model, method, shape, seconds, transferred[0], transferred[1],
+                         len(result) if isinstance(result, list) else 0, call_site(), single_id(method, args))
+        with self._lock:
+            self.traces.append(trace)
+
+    def n_plus_one_sites(self) -> list[tuple[str, str, int, float]]:
+        """(model, call site, single id reads, seconds) of the sites that passed the threshold, the costliest first."""
+        groups: dict[tuple[str, str], list[RpcTrace]] = defaultdict(list)
+        for t in self.traces:
+            if t.single_id:
+                groups[(t.model, t.site)].append(t)
+        ret = [(model, site, len(ts), sum(t.seconds for t in ts)) for (model, site), ts in groups.items() if len(ts) >= self.n_plus_one]
+        return sorted(ret, key=lambda r: (r[3], r[2]), reverse=True)
+
+    def report(self) -> str:
+        traces = list(self.traces)
+        lines = [f"{len(traces)} RPCs, {sum(t.seconds for t in traces):.3f}s, "
+                 f"{sum(t.bytes_sent for t in traces)} bytes sent, {sum(t.bytes_received for t in traces)} received"]
+        groups: dict[tuple[str, str, str, str], list[RpcTrace]] = defaultdict(list)
+        for t in traces:
+            groups[(t.model, t.method, t.shape, t.site)].append(t)
+        ranked = sorted(groups.items(), key=lambda g: sum(t.seconds for t in g[1]), reverse=True)
+        if ranked:
+            lines.append("  calls   seconds      rows     bytes  model.method domain -- call site")
+        for (model, method, shape, site), ts in ranked[:self.top]:
+            lines.append(f"  {len(ts):5d} {sum(t.seconds for t in ts):9.3f} {sum(t.rows for t in ts):9d} "
+                         f"{sum(t.bytes_received for t in ts):9d}  {model}.{method} {shape} -- {site}")
+        for model, site, count, seconds in self.n_plus_one_sites():
+            lines.append(f"  N+1: {count} single id reads of {model} ({seconds:.3f}s) from {site}, read the ids in one search instead.")
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        """Prints the report and starts over, called when the transaction commits."""
+        if self.traces:
+            print(self.report(), file=self.file or sys.stderr)
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.traces = []
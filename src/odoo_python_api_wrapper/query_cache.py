@@ -0,0 +1,121 @@
+from __future__ import annotations  # This is crucial for forward references
+from collections import OrderedDict
+import threading
+import time
+from typing import Any
+
+
+_RELATED_OPS = ('child_of', 'parent_of', 'any', 'not any')
+
+
+def normalize_domain(domain:list|tuple, types:dict[str, str]|None = None) -> tuple|None:
+    """
+    Hashable form of a converted domain, the same for domains that only differ in the order of their
+    conjunction terms or 'in' values. None when it cannot be cached: unhashable values, or terms whose
+    results also depend on the records of other models, which do not invalidate the model's entries.
+    Those are dotted paths, child_of, parent_of and any, and with the field `types` of the model, x2many
+    fields and many2one fields matched by name.
+    """
+    types = types or {}
+    terms = []
+    for t in domain:
+        if isinstance(t, str):
+            terms.append(t)
+            continue
+        field, op, value = t
+        if not isinstance(field, str) or '.' in field or op.lower() in _RELATED_OPS:
+            return None
+        ttype = types.get(field)
+        if ttype in ('one2many', 'many2many'):
+            return None
+        if ttype == 'many2one' and any(isinstance(v, str) for v in (value if isinstance(value, (list, tuple, set)) else [value])):
+            return None
+        if isinstance(value, (list, tuple, set)):
+            try:
+                value = tuple(sorted(set(value), key=repr))
+            except TypeError:
+                return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        terms.append((field, op.lower(), value))
+    if all(not isinstance(t, str) for t in terms):
+        terms.sort(key=repr)
+    return tuple(terms)
+
+
+class _Entry:
+    __slots__ = ('ids', 'expires')
+
+    def __init__(self, ids:tuple[int, ...], expires:float):
+        self.ids = ids
+        self.expires = expires
+
+
+class QueryCache:
+    """
+    Ids returned by search() keyed by model, normalized domain and fields, so repeated searches skip the
+    round trip and only read the records that are not cached. A create, write or unlink of a model, and a
+    refresh() that finds rows written since its watermark, drop the model's entries. Entries also expire
+    after `ttl` seconds, None keeps them until then. The least recently used go beyond `max_entries`.
+    """
+    def __init__(self, ttl:float|None = 60.0, max_entries:int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {} # model -> invalidations, a search racing one is not stored.
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model:str, domain:list|tuple, fields:list[str]|tuple, types:dict[str, str]|None = None) -> tuple|None:
+        normalized = normalize_domain(domain, types)
+        if normalized is None:
+            return None
+        return (model, normalized, tuple(sorted(fields or ())))
+
+    def generation(self, model:str) -> int:
+        return self._generations.get(model, 0)
+
+    def get(self, key:tuple) -> tuple[int, ...]|None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.ids
+
+    def put(self, key:tuple, ids:list[int], generation:int) -> None:
+        """Keeps the ids of a search started at `generation`, unless the model was invalidated since."""
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            expires = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+            self._entries[key] = _Entry(tuple(ids), expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, model:str) -> None:
+        with self._lock:
+            self._generations[model] = self._generations.get(model, 0) + 1
+            for key in [k for k in self._entries if k[0] == model]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            for model in set(self._generations) | {k[0] for k in self._entries}:
+                self._generations[model] = self._generations.get(model, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'hit_ratio': self.hits / (self.hits + self.misses) if self.hits + self.misses else None}
@@ -0,0 +1,364 @@
+from __future__ import annotations  # This is crucial for forward references
+import contextlib
+import threading
+from typing import Any, Iterable
+from .cache_policy import CachePolicy, ModelUsage, approx_size
+from .data_class_interface import OdooWrapperInterface
+
+
+class _Unindexable(Exception): pass
+
+
+def _index_key(value:Any) -> Any:
+    """Hashable key used to bucket a field value. Records are matched by id, lists by their contents."""
+    if isinstance(value, OdooWrapperInterface):
+        if value.id is None or value.id < 0:
+            raise _Unindexable() # working ids change on commit, so the bucket would go stale.
+        return value.id
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2 and isinstance(value[0], int) and isinstance(value[1], str):
+            return value[0] # many2one as returned by search_read: [id, name]
+        return tuple(_index_key(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        raise _Unindexable()
+    return value
+
+
+class _FieldIndex:
+    def __init__(self, field:str):
+        self.field = field
+        self.buckets: dict[Any, dict[str, OdooWrapperInterface]] = {}
+        self.unindexed: dict[str, OdooWrapperInterface] = {} # always returned, the caller re-checks the match.
+        self.key_of: dict[str, Any] = {}
+
+    def key_for(self, x:OdooWrapperInterface) -> Any:
+        # Buckets the raw value, so a many2one is keyed by its id without loading the record. An empty value decodes
+        # to None, 0, '' or False depending on the field: the attribute gives the key lookups compare it with. That
+        # read may still load something, so this is never called while a shard is locked.
+        try:
+            descriptor_raw = getattr(getattr(type(x), self.field, None), 'raw', None) # fields.Field, which maps attr to name.
+            raw = descriptor_raw(x) if descriptor_raw is not None else x.get_value(self.field)
+            if raw is None or raw is False:
+                return _index_key(getattr(x, self.field))
+            return _index_key(raw)
+        except _Unindexable:
+            return _Unindexable
+
+    def put(self, key:str, x:OdooWrapperInterface, ik:Any) -> None:
+        self.remove(key)
+        if ik is _Unindexable:
+            self.unindexed[key] = x
+        else:
+            self.buckets.setdefault(ik, {})[key] = x
+        self.key_of[key] = ik
+
+    def remove(self, key:str) -> None:
+        if key not in self.key_of:
+            return
+        ik = self.key_of.pop(key)
+        if ik is _Unindexable:
+            del self.unindexed[key]
+            return
+        bucket = self.buckets[ik]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[ik]
+
+    def candidates(self, values:Iterable[Any], ret:dict[str, OdooWrapperInterface]) -> None:
+        for v in values:
+            try:
+                ik = _index_key(v)
+            except _Unindexable:
+                continue
+            bucket = self.buckets.get(ik)
+            if bucket:
+                ret.update(bucket)
+        ret.update(self.unindexed)
+
+
+class _Shard:
+    """Model buckets and field indexes for the share of the keys of a RecordStore that hash to it."""
+    def __init__(self, lock):
+        self.lock = lock
+        self.models: dict[str, dict[str, OdooWrapperInterface]] = {}
+        self.indexes: dict[str, dict[str, _FieldIndex]] = {}
+        self.building: dict[str, list[set[str]]] = {} # keys changed while an index of the model was being built.
+
+    def index_keys(self, x:OdooWrapperInterface) -> dict[str, Any]:
+        return {field: index.key_for(x) for field, index in list(self.indexes.get(x.MODEL, {}).items())}
+
+    def _changed(self, model:str, key:str) -> None:
+        for changed in self.building.get(model, ()):
+            changed.add(key)
+
+    def put(self, key:str, x:OdooWrapperInterface, iks:dict[str, Any]) -> None:
+        model = x.MODEL
+        self.models.setdefault(model, {})[key] = x
+        for field, index in self.indexes.get(model, {}).items():
+            index.put(key, x, iks.get(field, _Unindexable)) # index created after iks was computed.
+        self._changed(model, key)
+
+    def remove(self, key:str, x:OdooWrapperInterface) -> None:
+        model = x.MODEL
+        bucket = self.models.get(model)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.models[model]
+        for index in self.indexes.get(model, {}).values():
+            index.remove(key)
+        self._changed(model, key)
+
+    def index(self, model:str, field:str) -> _FieldIndex:
+        index = self.indexes.get(model, {}).get(field)
+        if index is not None:
+            return index
+        with self.lock:
+            items = list(self.models.get(model, {}).items())
+            changed: set[str] = set()
+            self.building.setdefault(model, []).append(changed)
+        try:
+            new_index = _FieldIndex(field)
+            computed = [(key, x, new_index.key_for(x)) for key, x in items]
+        finally:
+            with self.lock:
+                builders = [c for c in self.building[model] if c is not changed] # sets compare by value.
+                if builders:
+                    self.building[model] = builders
+                else:
+                    del self.building[model]
+        with self.lock:
+            index = self.indexes.get(model, {}).get(field)
+            if index is not None: # another thread finished first.
+                return index
+            bucket = self.models.get(model, {})
+            for key, x, ik in computed:
+                if bucket.get(key) is x:
+                    new_index.put(key, x, _Unindexable if key in changed else ik)
+            for key, x in bucket.items():
+                if key not in new_index.key_of: # added while building
+                    new_index.put(key, x, _Unindexable)
+            self.indexes.setdefault(model, {})[field] = new_index
+            return new_index
+
+
+class RecordStore(dict):
+    """
+    The "model:id" -> record dict used for the transaction and backend caches.
+    Records are also bucketed by model, and hash indexes on the fields used in
+    equality and 'in' lookups are built the first time a field is looked up.
+    Lookups return candidates, the caller still has to check the match.
+    """
+    def __init__(self, *args, shards:int = 1, **kwargs):
+        super().__init__()
+        self._shards = [_Shard(self._make_lock()) for _ in range(max(1, shards))]
+        self.update(*args, **kwargs)
+
+    def _make_lock(self):
+        return contextlib.nullcontext()
+
+    def _shard(self, key:str) -> _Shard:
+        shards = self._shards
+        return shards[hash(key) % len(shards)] if len(shards) > 1 else shards[0]
+
+    def _stored(self, key:str, x:OdooWrapperInterface) -> None:
+        pass # called after a record was stored, outside the shard lock.
+
+    def _removed(self, key:str, x:OdooWrapperInterface) -> None:
+        pass # called after a record was removed, outside the shard lock.
+
+    def __setitem__(self, key:str, x:OdooWrapperInterface) -> None:
+        shard = self._shard(key)
+        iks = shard.index_keys(x)
+        with shard.lock:
+            old = dict.get(self, key)
+            if old is not None:
+                shard.remove(key, old)
+            super().__setitem__(key, x)
+            shard.put(key, x, iks)
+        self._stored(key, x)
+
+    def __delitem__(self, key:str) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            x = dict.pop(self, key)
+            shard.remove(key, x)
+        self._removed(key, x)
+
+    def pop(self, key:str, *default):
+        shard = self._shard(key)
+        with shard.lock:
+            if key not in self:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            x = dict.pop(self, key)
+            shard.remove(key, x)
+        self._removed(key, x)
+        return x
+
+    def popitem(self):
+        while True:
+            key = next(iter(self))
+            try:
+                return key, self.pop(key)
+            except KeyError:
+                continue # removed by another thread in the meantime.
+
+    def setdefault(self, key:str, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, x in dict(*args, **kwargs).items():
+            self[key] = x
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                for key in [k for bucket in shard.models.values() for k in bucket]:
+                    dict.pop(self, key, None)
+                shard.models.clear()
+                shard.indexes.clear()
+        super().clear()
+
+    def models(self) -> set[str]:
+        ret: set[str] = set()
+        for shard in self._shards:
+            with shard.lock:
+                ret.update(shard.models)
+        return ret
+
+    def of_model(self, model:str) -> list[OdooWrapperInterface]:
+        ret = []
+        for shard in self._shards:
+            with shard.lock:
+                ret.extend(shard.models.get(model, {}).values())
+        return ret
+
+    def lookup(self, model:str, field:str, value:Any) -> list[OdooWrapperInterface]:
+        return self.lookup_in(model, field, [value])
+
+    def lookup_in(self, model:str, field:str, values:Iterable[Any]) -> list[OdooWrapperInterface]:
+        values = list(values)
+        ret: dict[str, OdooWrapperInterface] = {}
+        for shard in self._shards:
+            if model not in shard.models:
+                continue
+            index = shard.index(model, field)
+            with shard.lock:
+                index.candidates(values, ret)
+        return list(ret.values())
+
+    def reindex(self, x:OdooWrapperInterface) -> None:
+        """Refresh the index entries of a record after one of its fields changed."""
+        key = f"{x.MODEL}:{x.id}"
+        if dict.get(self, key) is not x:
+            return
+        shard = self._shard(key)
+        iks = shard.index_keys(x)
+        with shard.lock:
+            if dict.get(self, key) is x:
+                shard.put(key, x, iks)
+
+
+class ConcurrentRecordStore(RecordStore):
+    """
+    RecordStore that can be shared by transactions running on different threads.
+    Keys are spread over `shards` stripes, each with its own lock, so threads publishing
+    or reading different records rarely wait on each other. Field values are read
+    outside the locks, an index built while records change marks them for re-checking.
+
+    The records of each model are kept within the limits of its CachePolicy (the default
+    policy keeps everything) and hits, misses, evictions and approximate memory are counted.
+    """
+    def __init__(self, *args, shards:int = 16, policy:CachePolicy|None = None, **kwargs):
+        self.default_policy = policy or CachePolicy()
+        self.policies: dict[str, CachePolicy] = {}
+        self._usage: dict[str, ModelUsage] = {}
+        self.complete: set[str] = set() # models with every record cached, see OdooBackend.preload. An eviction clears it.
+        super().__init__(*args, shards=shards, **kwargs)
+
+    def _make_lock(self):
+        return threading.RLock()
+
+    def policy_for(self, model:str) -> CachePolicy:
+        return self.policies.get(model, self.default_policy)
+
+    def set_policy(self, model:str|None, policy:CachePolicy) -> None:
+        """Sets the policy of a model, or the default one when model is None, and evicts what no longer fits."""
+        if model is None:
+            self.default_policy = policy
+        else:
+            self.policies[model] = policy
+        for m in [model] if model is not None else list(self._usage):
+            self._trim(m)
+
+    def usage(self, model:str) -> ModelUsage:
+        usage = self._usage.get(model)
+        if usage is None:
+            usage = self._usage.setdefault(model, ModelUsage())
+        return usage
+
+    def _stored(self, key:str, x:OdooWrapperInterface) -> None:
+        model = x.MODEL
+        for k in self.usage(model).stored(key, approx_size(x), self.policy_for(model)):
+            self._evict(k, model)
+
+    def _removed(self, key:str, x:OdooWrapperInterface) -> None:
+        self.usage(x.MODEL).removed(key)
+
+    def _evict(self, key:str, model:str) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            x = dict.pop(self, key, None)
+            if x is not None:
+                shard.remove(key, x)
+        self.complete.discard(model)
+        self.usage(model).removed(key, evicted=x is not None)
+
+    def _trim(self, model:str) -> None:
+        for k in self.usage(model).over_limits(self.policy_for(model)):
+            self._evict(k, model)
+
+    def fetch(self, key:str) -> OdooWrapperInterface|None:
+        """self.get(key) that counts the hit or miss, and drops the record when it outlived its ttl."""
+        model = key.rpartition(":")[0]
+        x = dict.get(self, key)
+        if x is None:
+            self.usage(model).missed()
+            return None
+        if not self.usage(model).used(key, self.policy_for(model)):
+            self._evict(key, model)
+            return None
+        return x
+
+    def hit(self, x:OdooWrapperInterface) -> bool:
+        """Counts a record found by a lookup as a hit. False, and the record is dropped, when it outlived its ttl."""
+        key = f"{x.MODEL}:{x.id}"
+        if not self.usage(x.MODEL).used(key, self.policy_for(x.MODEL)):
+            self._evict(key, x.MODEL)
+            return False
+        return True
+
+    def miss(self, model:str) -> None:
+        self.usage(model).missed()
+
+    def clear(self) -> None:
+        super().clear()
+        self.complete.clear()
+        for usage in list(self._usage.values()):
+            with usage.lock:
+                usage.entries.clear()
+                usage.bytes = 0
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per model entries, approximate bytes, hits, misses, evictions and hit ratio."""
+        return {model: usage.stats() for model, usage in list(self._usage.items())}
@@ -0,0 +1,156 @@
+from __future__ import annotations  # This is crucial for forward references
+from abc import ABC, abstractmethod
+import http.client
+import itertools
+import json
+import time
+import xmlrpc.client
+from typing import TYPE_CHECKING, Any, Callable
+from .connection_pool import PooledTransport
+if TYPE_CHECKING:
+    from .api_wrapper import OdooBackend
+
+try: # decoding large search_read replies is much faster with orjson, when it is installed.
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Methods that change nothing: the query cache is kept when they run and they are sent again when a connection broke.
+READ_METHODS = frozenset(('search_read', 'search', 'search_count', 'read', 'read_group', 'fields_get', 'name_search', 'name_get', 'default_get'))
+
+
+class OdooRpcError(Exception): pass
+
+
+# Odoo's XML-RPC fault codes for AccessDenied (login) and AccessError, and the exception names JSON-RPC sends.
+_ACCESS_FAULT_CODES = (3, 4)
+_ACCESS_ERRORS = ('odoo.exceptions.AccessDenied', 'odoo.exceptions.AccessError')
+
+
+def not_record_error(error:Exception) -> bool:
+    """
+    True for errors no smaller request would avoid: a lost connection, a refused login or missing access rights. Any
+    other server fault may come from one of the records the call was about.
+    """
+    if isinstance(error, (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError)):
+        return True
+    if isinstance(error, xmlrpc.client.Fault):
+        return error.faultCode in _ACCESS_FAULT_CODES
+    if isinstance(error, OdooRpcError):
+        reply = error.args[0] if error.args else None
+        if not isinstance(reply, dict): # the HTTP call itself failed.
+            return True
+        return (reply.get('data') or {}).get('name') in _ACCESS_ERRORS
+    return False
+
+
+def read_only(service:str, method:str, args:list|tuple) -> bool:
+    """True for calls that change nothing on the server: the common service and execute_kw of a read method."""
+    if service == "common":
+        return True
+    return method == "execute_kw" and len(args) > 4 and args[4] in READ_METHODS
+
+
+class OdooRpcTransport(ABC):
+    """How a backend talks to Odoo. Every model call of a transaction goes through execute_kw."""
+    name = ""
+
+    def __init__(self, backend:OdooBackend):
+        self.backend = backend
+
+    @abstractmethod
+    def call(self, service:str, method:str, args:list) -> Any:
+        pass
+
+    def execute_kw(self, model:str, method:str, args:list, kwargs:dict[str,Any]|None=None) -> Any:
+        params = [self.backend.db, self.backend.uid, self.backend.api_key, model, method, args]
+        if kwargs is not None:
+            params.append(kwargs)
+        metrics = self.backend.metrics
+        if not metrics.enabled:
+            return self.call("object", "execute_kw", params)
+        metrics.started(model, method)
+        start = time.perf_counter()
+        try:
+            result = self.call("object", "execute_kw", params)
+        except BaseException:
+            metrics.finished(model, method, time.perf_counter() - start, None, error=True)
+            raise
+        metrics.finished(model, method, time.perf_counter() - start, result)
+        return result
+
+    def version(self) -> Any:
+        return self.call("common", "version", [])
+
+    def authenticate(self) -> Any:
+        return self.call("common", "authenticate", [self.backend.db, self.backend.username, self.backend.api_key, {}])
+
+
+class XmlRpcTransport(OdooRpcTransport):
+    name = "xmlrpc"
+
+    def __init__(self, backend:OdooBackend):
+        super().__init__(backend)
+        self._proxies: dict[str, xmlrpc.client.ServerProxy] = {}
+
+    def proxy(self, service:str) -> xmlrpc.client.ServerProxy:
+        proxy = self._proxies.get(service)
+        if proxy is None:
+            proxy = self._proxies[service] = xmlrpc.client.ServerProxy('{}/xmlrpc/2/{}'.format(self.backend.url, service),
+                                                                       transport=PooledTransport(self.backend.pool, self._replayable(service)),
+                                                                       allow_none=True)
+        return proxy
+
+    @staticmethod
+    def _replayable(service:str) -> Callable[[bytes], bool]:
+        def replayable(body:bytes) -> bool:
+            # Only parsed when a sent request failed on a broken connection.
+            args, method = xmlrpc.client.loads(body)
+            return read_only(service, method, args)
+        return replayable
+
+    def call(self, service:str, method:str, args:list) -> Any:
+        return getattr(self.proxy(service), method)(*args)
+
+
+class JsonRpcTransport(OdooRpcTransport):
+    name = "jsonrpc"
+
+    def __init__(self, backend:OdooBackend):
+        super().__init__(backend)
+        self._ids = itertools.count(1)
+
+    def call(self, service:str, method:str, args:list) -> Any:
+        data = {
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": args},
+            "id": next(self._ids),
+        }
+        response, content = self.backend.pool.request("/jsonrpc", json.dumps(data).encode(), {
+            "Content-Type": "application/json",
+        }, lambda: read_only(service, method, args))
+        if response.status != 200:
+            raise OdooRpcError(f"JSON-RPC call failed: {response.status} {response.reason}")
+        reply = _json_loads(content)
+        if reply.get("error"):
+            raise OdooRpcError(reply["error"])
+        return reply.get("result")
+
+
+TRANSPORTS: dict[str, type[OdooRpcTransport]] = {
+    XmlRpcTransport.name: XmlRpcTransport,
+    JsonRpcTransport.name: JsonRpcTransport,
+}
+
+def make_transport(transport:str|type[OdooRpcTransport]|OdooRpcTransport, backend:OdooBackend) -> OdooRpcTransport:
+    if isinstance(transport, OdooRpcTransport):
+        transport.backend = backend
+        return transport
+    if isinstance(transport, str):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport {transport}, expected one of {list(TRANSPORTS)}")
+        transport = TRANSPORTS[transport]
+    return transport(backend)
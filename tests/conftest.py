@@ -0,0 +1,58 @@
+import contextlib
+import importlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from odoo_python_api_wrapper import OdooBackend, Klass
+from odoo_python_api_wrapper.fake_server import FakeOdooServer
+from odoo_python_api_wrapper.generate_wrappers import generate
+
+MODELS = {'res.partner': 'Partner', 'res.partner.category': 'Category', 'account.move': 'Move', 'account.move.line': 'MoveLine'}
+
+
+@pytest.fixture(scope="session")
+def server():
+    with FakeOdooServer() as server:
+        yield server
+
+
+@pytest.fixture
+def store(server):
+    """The fake server's records, emptied before each test, and its call counts."""
+    for table in server.store.data.values():
+        table.clear()
+    server.store.calls.clear()
+    server.store.orders.clear()
+    return server.store
+
+
+@pytest.fixture(scope="session")
+def db(server, tmp_path_factory):
+    """The wrappers generated from the fake server's schema, imported as the `db` package."""
+    base = tmp_path_factory.mktemp("wrappers")
+    os.makedirs(base / "db")
+    backend = OdooBackend(server.url, username="admin", api_key="admin")
+    trans = backend.begin()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate(trans, [Klass(trans, model, name) for model, name in MODELS.items()], str(base))
+    backend.close()
+    sys.path.insert(0, str(base))
+    return importlib.import_module("db")
+
+
+@pytest.fixture
+def backend(server, store, db):
+    backend = OdooBackend(server.url, username="admin", api_key="admin")
+    yield backend
+    backend.close()
+
+
+def rpc(store, model=None, method=None) -> int:
+    """Model calls the fake server answered, of model and method when given."""
+    return sum(n for (m, meth), n in store.calls.items()
+               if m not in ('http', 'conn') and (model is None or m == model) and (method is None or meth == method))
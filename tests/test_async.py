@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import rpc
+from odoo_python_api_wrapper.async_api import AsyncOdooBackend
+
+
+@pytest.fixture
+def async_backend(server):
+    backend = AsyncOdooBackend(server.url, username="admin", api_key="admin", max_concurrency=8)
+    yield backend
+    backend.close()
+
+
+def test_gathered_gets_are_sent_in_parallel(async_backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(16)])
+    store.latency = 0.05
+
+    async def run():
+        trans = async_backend.begin()
+        start = time.perf_counter()
+        ret = await asyncio.gather(*[trans.get(db.Partner, 'email', f'p{i}@x') for i in range(16)])
+        elapsed = time.perf_counter() - start
+        assert await trans.get(db.Partner, 'email', 'p3@x') is ret[3]
+        return ret, elapsed
+
+    try:
+        ret, elapsed = asyncio.run(run())
+    finally:
+        store.latency = 0.0
+    assert [x.name for x in ret] == [f'P{i}' for i in range(16)]
+    assert elapsed < 16 * 0.05 / 2
+
+
+def test_get2(async_backend, store, db):
+    [a, _] = store.seed('res.partner', [{'name': 'A'}, {'name': 'B', 'email': 'b@x'}])
+
+    async def run():
+        trans = async_backend.begin()
+        new = db.Partner(trans.transaction)
+        new.name = 'new'
+        before = rpc(store)
+        assert await trans.get2(db.Partner, [('parent_id', '=', new.id)]) is None
+        assert await trans.get2(db.Partner, [('name', '=', 'new'), ('id', '=', new.id)]) is new
+        assert await trans.get2(db.Partner, [('name', '=', 'other'), ('id', '=', new.id)]) is None
+        assert rpc(store) == before
+        assert (await trans.get2(db.Partner, [('name', '=', 'A')])).id == a
+        assert (await trans.get2(db.Partner, [('name', '=', 'B'), ('email', '=', 'b@x')])).name == 'B'
+        assert await trans.get2(db.Partner, [('name', '=', 'C')]) is None
+
+    asyncio.run(run())
+
+
+def test_search_iter_and_commit(async_backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}'} for i in range(25)])
+
+    async def run():
+        trans = async_backend.begin()
+        names = []
+        async for x in trans.search_iter(db.Partner, [], page_size=10):
+            names.append(x.name)
+            if x.name == 'P3':
+                x.name = 'changed'
+        db.Partner(trans.transaction).name = 'new'
+        await trans.commit()
+        return names
+
+    assert asyncio.run(run()) == [f'P{i}' for i in range(25)]
+    names = {r['name'] for r in store.data['res.partner'].values()}
+    assert {'changed', 'new'} <= names and 'P3' not in names
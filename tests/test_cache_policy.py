@@ -0,0 +1,42 @@
+import time
+
+from conftest import rpc
+
+
+def test_max_entries_evicts_the_least_recently_used(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(50)])
+    backend.set_cache_policy('res.partner', max_entries=10)
+    backend.begin().search(db.Partner, [])
+    stats = backend.cache_stats()['res.partner']
+    assert stats['entries'] == 10 and stats['evictions'] == 40
+    assert len(backend.cache.of_model('res.partner')) == 10
+
+    before = rpc(store)
+    assert backend.begin().get(db.Partner, 'id', ids[-1]).name == 'P49'
+    assert rpc(store) == before
+    assert backend.begin().get(db.Partner, 'email', 'p0@x').name == 'P0'
+    assert rpc(store) == before + 1
+
+
+def test_max_bytes(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(50)])
+    backend.set_cache_policy('res.partner', max_bytes=5000)
+    backend.begin().search(db.Partner, [])
+    stats = backend.cache_stats()['res.partner']
+    assert 0 < stats['bytes'] <= 5000 and stats['entries'] < 50
+
+
+def test_ttl_and_pinned_models(backend, store, db):
+    store.seed('res.partner.category', [{'name': f'C{i}'} for i in range(3)])
+    backend.set_cache_policy(None, ttl=0.05)
+    backend.pin('res.partner.category')
+    backend.begin().search(db.Category, [])
+    time.sleep(0.1)
+    before = rpc(store)
+    assert backend.begin().get(db.Category, 'name', 'C1') is not None
+    assert rpc(store) == before
+
+    backend.set_cache_policy('res.partner.category', ttl=0.05)
+    time.sleep(0.1)
+    assert backend.begin().get(db.Category, 'name', 'C2') is not None
+    assert rpc(store) == before + 1
@@ -0,0 +1,24 @@
+from datetime import date, datetime
+
+
+def test_read_columns(backend, store):
+    [partner] = store.seed('res.partner', [{'name': 'P'}])
+    store.seed('account.move.line', [{'name': f'L{i}', 'partner_id': partner if i % 2 else False, 'price': i * 0.5}
+                                     for i in range(25)])
+    for row in store.data['account.move.line'].values():
+        row['write_date'] = '2024-01-02 03:04:05'
+    backend.search_page_size = 10
+    trans = backend.begin()
+    c = trans.read_columns('account.move.line', [('price', '>=', 0)], ['name', 'partner_id', 'price', 'write_date'])
+    assert len(c['id']) == 25 and list(c['name'][:2]) == ['L0', 'L1']
+    assert c['partner_id'][0] == 0 and c['partner_id'][1] == partner and c['partner_id.name'][1] == 'P'
+    assert c['price'][4] == 2.0
+    assert c['write_date'][0] == datetime(2024, 1, 2, 3, 4, 5)
+    assert not trans.cache and not backend.cache
+
+
+def test_every_field_and_empty_dates(backend, store):
+    store.seed('account.move', [{'name': 'M0'}, {'name': 'M1', 'invoice_date': '2024-05-02'}])
+    c = backend.begin().read_columns('account.move', [])
+    assert c['invoice_date'][0] is None and c['invoice_date'][1] == date(2024, 5, 2)
+    assert 'line_ids' in c
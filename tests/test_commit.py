@@ -0,0 +1,38 @@
+from conftest import rpc
+
+
+def test_identical_changes_are_written_together(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}', 'credit': 0.0} for i in range(30)])
+    trans = backend.begin()
+    partners = trans.search(db.Partner, [])
+    for x in partners:
+        x.credit = x.id % 3
+    partners[0].name = 'renamed'
+    trans.commit()
+    assert all(r['credit'] == r['id'] % 3 for r in store.data['res.partner'].values())
+    assert store.data['res.partner'][partners[0].id]['name'] == 'renamed'
+    assert rpc(store, 'res.partner', 'write') == 3 # credit 1, credit 2 and the renamed record, 0 is no change.
+    assert not any(x.changes for x in partners)
+
+
+def test_creates_and_writes(backend, store, db):
+    [id] = store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    a = trans.get(db.Partner, 'id', id)
+    a.email = 'a@x'
+    new = db.Partner(trans)
+    new.name = 'B'
+    new.parent_id = a
+    trans.commit()
+    assert new.id > 0
+    assert store.data['res.partner'][id]['email'] == 'a@x'
+    assert store.data['res.partner'][new.id]['parent_id'] == id
+    assert backend.begin().get(db.Partner, 'name', 'B').parent_id.id == id
+
+
+def test_nothing_is_written_without_changes(backend, store, db):
+    store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    trans.commit()
+    assert rpc(store, 'res.partner', 'write') == 0
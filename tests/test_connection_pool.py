@@ -0,0 +1,105 @@
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+
+from conftest import rpc
+from odoo_python_api_wrapper.transports import read_only
+
+
+@pytest.fixture
+def dropped(backend):
+    """Puts a connection in the backend's pool whose server reads the next request and closes without answering."""
+    listener = socket.create_server(('127.0.0.1', 0))
+    received = []
+
+    def serve():
+        sock = listener.accept()[0]
+        data = b''
+        while not data.endswith(b'</methodCall>\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        received.append(data)
+        sock.close()
+
+    def add() -> list[bytes]:
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        conn = http.client.HTTPConnection('127.0.0.1', listener.getsockname()[1])
+        conn.connect()
+        backend.pool._idle.append((conn, time.monotonic()))
+        return received
+
+    yield add
+    listener.close()
+
+
+class _Unsendable(http.client.HTTPConnection):
+    def request(self, *args, **kwargs):
+        raise BrokenPipeError
+
+
+def test_reads_are_sent_again_on_a_dropped_connection(backend, store, dropped):
+    store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    trans._execute_kw('res.partner', 'search', [[]])
+    received = dropped()
+    assert len(trans._execute_kw('res.partner', 'search_read', [[]], {'fields': ['name']})) == 1
+    assert b'search_read' in received[0]
+
+
+def test_writes_are_not_sent_again_once_sent(backend, store, dropped):
+    [id] = store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    trans._execute_kw('res.partner', 'search', [[]])
+    received = dropped()
+    with pytest.raises((http.client.RemoteDisconnected, ConnectionResetError)):
+        trans._execute_kw('res.partner', 'write', [[id], {'name': 'B'}])
+    assert b'write' in received[0] # the dropped connection got it, it may have been run.
+    assert rpc(store, 'res.partner', 'write') == 0
+
+
+def test_writes_are_sent_again_when_they_were_not_sent(backend, store):
+    [id] = store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    trans._execute_kw('res.partner', 'search', [[]])
+    backend.pool._idle.append((_Unsendable(backend.pool.host), time.monotonic()))
+    trans._execute_kw('res.partner', 'write', [[id], {'name': 'B'}])
+    assert store.data['res.partner'][id]['name'] == 'B'
+    assert rpc(store, 'res.partner', 'write') == 1
+
+
+def test_pool_is_bounded_and_shared_by_threads(backend, store):
+    store.seed('res.partner', [{'name': 'A'}])
+    store.latency = 0.02
+    errors = []
+
+    def work():
+        try:
+            for _ in range(5):
+                backend.begin()._execute_kw('res.partner', 'search', [[]])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(16)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        store.latency = 0.0
+    assert not errors
+    assert len(backend.pool._idle) <= backend.pool.size
+    assert store.calls[('conn', 'open')] <= backend.pool.size
+
+
+def test_read_only():
+    assert read_only('common', 'version', [])
+    assert read_only('object', 'execute_kw', ['db', 1, 'key', 'res.partner', 'search_read', [[]]])
+    assert not read_only('object', 'execute_kw', ['db', 1, 'key', 'res.partner', 'write', [[1], {}]])
+    assert not read_only('object', 'execute_kw', ['db', 1, 'key', 'res.partner', 'action_post', [[1]]])
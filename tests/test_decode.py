@@ -0,0 +1,24 @@
+from datetime import date, datetime
+
+from odoo_python_api_wrapper.data_class import _parse_date, _parse_datetime
+
+
+def test_parse():
+    assert _parse_date("2024-03-05") == date(2024, 3, 5)
+    assert _parse_date("2024-03-05 10:00:00") == datetime(2024, 3, 5, 10)
+    assert _parse_datetime("2024-03-05 10:11:12") == datetime(2024, 3, 5, 10, 11, 12)
+    assert _parse_datetime("2024-03-05") == datetime(2024, 3, 5)
+
+
+def test_typed_values_are_decoded_once_and_follow_changes(backend, store, db):
+    store.seed('res.partner', [{'name': 'A', 'date': '2024-02-03', 'credit': 1.5}])
+    [x] = backend.begin().search(db.Partner, [])
+    assert x.date == date(2024, 2, 3)
+    assert x.get_value_date('date') is x.get_value_date('date')
+    assert x.credit == 1.5
+    x.date = date(2024, 3, 4)
+    assert x.date == date(2024, 3, 4)
+    x.credit = None
+    assert x.credit == 0.0
+    x.date = None
+    assert x.get_value_date('date') is None
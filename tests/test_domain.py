@@ -0,0 +1,109 @@
+import pytest
+
+from conftest import rpc
+from odoo_python_api_wrapper.domain import UnsupportedDomain, compile_domain
+
+
+@pytest.fixture
+def partners(store):
+    companies = store.seed('res.partner', [{'name': f'K{i}', 'email': f'k{i}@x'} for i in range(3)])
+    categories = store.seed('res.partner.category', [{'name': f'C{i}'} for i in range(3)])
+    store.seed('res.partner', [{'name': f'Contact {i}', 'email': f'p{i}@x' if i % 3 else False, 'active': i % 5 != 0,
+                                'credit': float(i), 'date': f'2024-01-{i % 28 + 1:02d}', 'parent_id': companies[i % 3],
+                                'category_id': [categories[i % 3]]} for i in range(30)])
+    return companies, categories
+
+
+def domains(companies, categories):
+    return [
+        [('credit', '>', 10), ('credit', '<=', 20)],
+        ['|', ('email', '=', False), ('credit', '<', 3)],
+        [('email', '!=', False)],
+        [('name', 'ilike', 'contact 1')],
+        [('name', 'not like', 'Contact')],
+        [('name', '=like', 'Contact _')],
+        [('name', 'like', 'Contact 1_')],
+        [('name', 'ilike', 'contact%5')],
+        [('name', 'not like', 't 2_')],
+        [('email', 'like', 'P_@')],
+        [('email', 'ilike', 'P_@')],
+        [('date', '>=', '2024-01-10')],
+        [('parent_id', '=', companies[0])],
+        [('parent_id', '!=', companies[0])],
+        ['!', ('parent_id', '=', companies[1])],
+        [('parent_id', 'in', [companies[1], companies[2]])],
+        [('parent_id', 'not in', [companies[1]])],
+        [('parent_id', '=', False)],
+        [('parent_id', 'ilike', 'k2')],
+        [('category_id', 'in', [categories[1]])],
+        [('category_id', '=', categories[2])],
+        [('active', '=', False)],
+        [('active', 'in', [True, False]), ('credit', '=', 5.0)],
+        [],
+    ]
+
+
+def test_preloaded_model_answers_like_the_server(backend, store, db, partners):
+    trans = backend.begin()
+    expected = [sorted(x.id for x in trans.search(db.Partner, d)) for d in domains(*partners)]
+
+    backend.preload(db.Partner)
+    before = rpc(store)
+    trans = backend.begin()
+    for d, ids in zip(domains(*partners), expected):
+        assert sorted(x.id for x in trans.search(db.Partner, d)) == ids, d
+    assert rpc(store) == before
+
+
+def test_unsupported_domain_asks_the_server(backend, store, db, partners):
+    backend.preload(db.Partner)
+    before = rpc(store)
+    backend.begin().search(db.Partner, [('parent_id.name', '=', 'K1')])
+    assert rpc(store) == before + 1
+
+
+def test_get2_on_many2one_is_answered_from_cache(backend, store, db, partners):
+    companies, _ = partners
+    trans = backend.begin()
+    trans.search(db.Partner, [('name', 'like', 'K')])
+    before = rpc(store)
+    k1 = trans.get2(db.Partner, [('name', '=', 'K1'), ('parent_id', '=', False)])
+    assert k1.id == companies[1]
+    contact = backend.begin().search(db.Partner, [('name', '=', 'Contact 4')])[0]
+    before = rpc(store)
+    assert contact.transaction.get2(db.Partner, [('name', '=', 'Contact 4'), ('parent_id', '=', companies[1])]) is contact
+    assert rpc(store) == before
+
+
+def test_pending_changes_and_unsaved_records(backend, db, partners):
+    trans = backend.begin()
+    k0 = trans.search(db.Partner, [('name', '=', 'K0')])[0]
+    k0.name = 'Renamed'
+    assert trans.get2(db.Partner, [('name', '=ilike', 'renamed')]) is k0
+    new = db.Partner(trans)
+    new.name = 'New'
+    new.parent_id = k0
+    assert trans.search(db.Partner, [('parent_id', '=', k0.id), ('id', '=', new.id)]) == [new]
+    assert trans.search(db.Partner, [('id', '=', new.id), ('name', '=', 'other')]) == []
+
+
+def test_child_of_follows_cached_parents(backend, db, partners):
+    companies, _ = partners
+    backend.preload(db.Partner)
+    trans = backend.begin()
+    predicate = compile_domain('res.partner', ['&', ('id', 'child_of', companies[0]), ('name', 'like', 'Contact')], trans._cached_record)
+    assert sum(predicate(x) for x in backend.cache.of_model('res.partner')) == 10
+
+
+def test_compile_domain_rejects_what_it_cannot_answer():
+    with pytest.raises(UnsupportedDomain):
+        compile_domain('res.partner', [('name', 'any', [])])
+    with pytest.raises(UnsupportedDomain):
+        compile_domain('res.partner', ['|', ('name', '=', 'x')])
+
+
+def test_eviction_clears_completeness(backend, db, partners):
+    backend.preload(db.Partner)
+    assert backend.cache.complete == {'res.partner'}
+    backend.set_cache_policy('res.partner', max_entries=5)
+    assert not backend.cache.complete
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from odoo_python_api_wrapper import OdooBackend
+
+
+@pytest.mark.parametrize("transport", ["xmlrpc", "jsonrpc"])
+def test_crud_over_both_protocols(server, store, transport):
+    backend = OdooBackend(server.url, username="admin", api_key="admin", transport=transport)
+    trans = backend.begin()
+    [id] = trans.create('res.partner', [[{'name': 'A', 'email': 'a@x'}]])
+    trans.write('res.partner', id, {'name': 'B'})
+    rows = trans._execute_kw('res.partner', 'search_read', [[('name', '=', 'B')]], {'fields': ['name', 'email']})
+    assert rows == [{'id': id, 'name': 'B', 'email': 'a@x'}]
+    trans._execute_kw('res.partner', 'unlink', [[id]])
+    assert store.data['res.partner'] == {}
+    backend.close()
+
+
+def test_domains_and_relations(server, store):
+    parent = store.seed('res.partner', [{'name': 'Company'}])[0]
+    store.seed('res.partner', [{'name': 'Kid', 'parent_id': parent}, {'name': 'Archived', 'parent_id': parent, 'active': False}])
+    assert store.call('res.partner', 'search', [['|', ('name', '=like', 'K%'), ('parent_id', 'ilike', 'comp')]], {}) == [parent + 1]
+    assert len(store.call('res.partner', 'search', [[('parent_id', '=', parent)]], {'context': {'active_test': False}})) == 2
+    [row] = store.call('res.partner', 'read', [[parent]], {'fields': ['child_ids']})
+    assert row['child_ids'] == [parent + 1, parent + 2]
+
+
+def test_calls_do_not_wait_for_delayed_acks(backend, store):
+    trans = backend.begin()
+    trans._execute_kw('res.partner', 'search', [[]])
+    start = time.perf_counter()
+    for _ in range(50):
+        trans._execute_kw('res.partner', 'search', [[]])
+    assert time.perf_counter() - start < 1.0 # about 2s when each response waits on Nagle's algorithm.
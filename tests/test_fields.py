@@ -0,0 +1,23 @@
+import inspect
+from datetime import date
+
+from odoo_python_api_wrapper.data_class import model_class
+from odoo_python_api_wrapper.fields import Field
+
+
+def test_generated_classes_are_registered_by_model(db):
+    assert model_class('res.partner') is db.Partner
+    assert model_class('account.move.line') is db.MoveLine
+    assert isinstance(inspect.getattr_static(db.Partner, 'name'), Field)
+
+
+def test_field_descriptors(backend, store, db):
+    [parent] = store.seed('res.partner', [{'name': 'C'}])
+    store.seed('res.partner', [{'name': 'K', 'credit': 1.5, 'date': '2024-02-03', 'parent_id': parent}])
+    x = backend.begin().get(db.Partner, 'name', 'K')
+    assert (x.name, x.credit, x.date) == ('K', 1.5, date(2024, 2, 3))
+    assert x.parent_id.name == 'C' and x.get_parent_id() is x.parent_id
+    x.name = 'renamed'
+    assert x.name == 'renamed' and x.get_name() == 'renamed' and x.changes == {'name': 'renamed'}
+    x.credit = None
+    assert x.credit == 0.0
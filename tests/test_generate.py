@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+
+from conftest import MODELS
+from odoo_python_api_wrapper import Klass
+from odoo_python_api_wrapper.generate_wrappers import MANIFEST, generate
+
+
+def run(backend, base) -> list[str]:
+    trans = backend.begin()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [k.name for k in generate(trans, [Klass(trans, model, name) for model, name in MODELS.items()], str(base))]
+
+
+def test_only_changed_classes_are_written(backend, store, tmp_path):
+    os.makedirs(tmp_path / "db")
+    assert sorted(run(backend, tmp_path)) == sorted(MODELS.values())
+    assert (tmp_path / "db" / MANIFEST).exists()
+    stamp = os.path.getmtime(tmp_path / "db" / "PartnerB.py")
+    ext = tmp_path / "db" / "Partner.py"
+    ext.write_text(ext.read_text() + "\n    # mine\n")
+
+    assert run(backend, tmp_path) == []
+    assert os.path.getmtime(tmp_path / "db" / "PartnerB.py") == stamp
+    assert ext.read_text().endswith("# mine\n") # the classes to extend are never overwritten.
+
+    (tmp_path / "db" / "MoveB.py").unlink()
+    assert run(backend, tmp_path) == ['Move']
+
+
+def test_a_class_that_could_not_be_written_is_tried_again(backend, store, tmp_path):
+    os.makedirs(tmp_path / "db" / "MoveB.py") # a directory, so the file cannot be opened.
+    assert sorted(run(backend, tmp_path)) == sorted(set(MODELS.values()) - {'Move'})
+    os.rmdir(tmp_path / "db" / "MoveB.py")
+    assert run(backend, tmp_path) == ['Move']
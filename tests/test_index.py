@@ -0,0 +1,46 @@
+from conftest import rpc
+
+
+def test_get_and_get2_use_the_field_indexes(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(50)])
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    before = rpc(store)
+    assert trans.get(db.Partner, 'email', 'p7@x').name == 'P7'
+    assert trans.get2(db.Partner, [('name', '=', 'P8'), ('email', '=', 'p8@x')]).email == 'p8@x'
+    assert trans.get2(db.Partner, [('email', 'in', ['none@x', 'p9@x'])]).name == 'P9'
+    assert rpc(store) == before
+    assert trans.cache.lookup('res.partner', 'email', 'p7@x')[0].name == 'P7'
+    assert [x.name for x in trans.cache.lookup_in('res.partner', 'email', ['p1@x', 'p2@x'])] == ['P1', 'P2']
+
+
+def test_indexes_follow_changes_and_deletes(backend, store, db):
+    store.seed('res.partner', [{'name': 'A', 'email': 'a@x'}])
+    trans = backend.begin()
+    p = trans.get(db.Partner, 'email', 'a@x')
+    p.email = 'new@x'
+    assert trans.get(db.Partner, 'email', 'new@x') is p
+    assert trans.cache.lookup('res.partner', 'email', 'a@x') == []
+    p.delete()
+    assert trans.cache.lookup('res.partner', 'email', 'new@x') == []
+    assert backend.cache.lookup('res.partner', 'email', 'new@x') == []
+
+
+def test_many2one_values_are_indexed_by_id(backend, store, db):
+    [parent] = store.seed('res.partner', [{'name': 'C'}])
+    store.seed('res.partner', [{'name': 'K', 'parent_id': parent}])
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    assert [x.name for x in trans.cache.lookup('res.partner', 'parent_id', parent)] == ['K']
+    assert [x.name for x in trans.cache.lookup('res.partner', 'parent_id', [parent, 'C'])] == ['K']
+
+
+def test_building_a_many2one_index_loads_no_relation(backend, store, db):
+    parents = store.seed('res.partner', [{'name': f'C{i}'} for i in range(30)])
+    store.seed('res.partner', [{'name': f'K{i}', 'parent_id': parents[i]} for i in range(30)])
+    backend.begin().search(db.Partner, [('name', 'like', 'K')])
+    trans = backend.begin()
+    p = trans.get(db.Partner, 'id', parents[7])
+    before = rpc(store)
+    assert trans.get(db.Partner, 'parent_id', p).name == 'K7'
+    assert rpc(store) == before
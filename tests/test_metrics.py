@@ -0,0 +1,31 @@
+import json
+import logging
+
+
+def rpc_stats(backend, model, method):
+    return next(r for r in backend.metrics.snapshot()['rpc'] if r['model'] == model and r['method'] == method)
+
+
+def test_rpc_and_cache_metrics(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}'} for i in range(10)])
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    trans.get(db.Partner, 'name', 'P3')
+    stats = rpc_stats(backend, 'res.partner', 'search_read')
+    assert stats['calls'] == 1 and stats['rows'] == 10 and stats['errors'] == 0
+    assert backend.metrics.snapshot()['cache']['transaction']['res.partner']['hits'] >= 1
+    assert json.loads(backend.metrics.to_json())['rpc']
+    assert 'odoo_rpc_calls_total{model="res.partner",method="search_read"} 1' in backend.metrics.to_prometheus()
+
+
+def test_disabled_metrics_record_nothing(backend, store, db):
+    backend.metrics.enabled = False
+    backend.begin().search(db.Partner, [])
+    assert backend.metrics.snapshot()['rpc'] == []
+
+
+def test_searches_are_logged_at_debug_level(backend, store, db, caplog):
+    store.seed('res.partner', [{'name': 'A'}])
+    with caplog.at_level(logging.DEBUG, logger='odoo_python_api_wrapper.api_wrapper'):
+        backend.begin().search(db.Partner, [('name', '=', 'A')])
+    assert any('res.partner' in r.getMessage() for r in caplog.records)
@@ -0,0 +1,28 @@
+from conftest import rpc
+from odoo_python_api_wrapper import OdooBackend
+
+
+def test_warm_start_from_disk(server, store, db, tmp_path):
+    path = str(tmp_path / 'cache.db')
+    ids = store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(100)])
+    for row in store.data['res.partner'].values():
+        row['write_date'] = '2024-01-01 00:00:00'
+    backend = OdooBackend(server.url, username="admin", api_key="admin", persistent_cache=path)
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    trans.get(db.Partner, 'id', ids[0]).name = 'renamed'
+    trans.commit()
+    backend.close()
+
+    store.data['res.partner'][ids[1]].update(name='server', write_date='2099-01-01 00:00:00')
+    del store.data['res.partner'][ids[2]]
+    backend = OdooBackend(server.url, username="admin", api_key="admin", persistent_cache=path)
+    trans = backend.begin()
+    before = rpc(store, 'res.partner', 'search_read')
+    assert trans.get(db.Partner, 'email', 'p50@x').id == ids[50]
+    assert rpc(store, 'res.partner', 'search_read') == before + 2 # the ids still there and the rows written since.
+    assert trans.get(db.Partner, 'id', ids[1]).name == 'server'
+    assert trans.get(db.Partner, 'id', ids[0]).name == 'renamed'
+    assert f"res.partner:{ids[2]}" not in backend.cache
+    backend.close()
+
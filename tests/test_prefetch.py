@@ -0,0 +1,51 @@
+from conftest import rpc
+
+
+def test_many2one_is_read_for_every_record_of_the_transaction(backend, store, db):
+    parents = store.seed('res.partner', [{'name': f'C{i}'} for i in range(5)])
+    store.seed('res.partner', [{'name': f'K{i}', 'parent_id': parents[i]} for i in range(5)])
+    kids = backend.begin().search(db.Partner, [('name', 'like', 'K')])
+    before = rpc(store, 'res.partner', 'search_read')
+    assert [x.parent_id.name for x in kids] == [f'C{i}' for i in range(5)]
+    assert rpc(store, 'res.partner', 'search_read') == before + 1
+
+
+def test_archived_and_deleted_many2one(backend, store, db):
+    [archived, deleted] = store.seed('res.partner', [{'name': 'Archived', 'active': False}, {'name': 'Deleted'}])
+    store.seed('res.partner', [{'name': f'K{i}', 'parent_id': [archived, deleted][i % 2]} for i in range(4)])
+    del store.data['res.partner'][deleted]
+    kids = backend.begin().search(db.Partner, [('name', 'like', 'K')])
+    before = rpc(store)
+    assert [kids[0].parent_id.name, kids[2].parent_id.name] == ['Archived', 'Archived']
+    for x in kids[1::2]:
+        assert not isinstance(x.parent_id, db.Partner) # the raw many2one value, as when get finds nothing.
+    assert rpc(store) == before + 1
+
+
+def test_x2many_is_read_for_every_record_of_the_transaction(backend, store, db):
+    cats = store.seed('res.partner.category', [{'name': f'T{i}'} for i in range(4)])
+    store.seed('res.partner', [{'name': 'A', 'category_id': cats[:2]}, {'name': 'B', 'category_id': cats[1:]}])
+    del store.data['res.partner.category'][cats[3]]
+    [a, b] = backend.begin().search(db.Partner, [])
+    before = rpc(store)
+    assert [x.name for x in a.category_id] == ['T0', 'T1']
+    assert [x.name for x in b.category_id] == ['T1', 'T2']
+    assert rpc(store) == before + 1
+
+
+def test_one2many_children_are_read_in_one_search(backend, store, db):
+    parents = store.seed('res.partner', [{'name': f'C{i}'} for i in range(3)])
+    store.seed('res.partner', [{'name': f'K{i}', 'parent_id': parents[i % 3]} for i in range(6)])
+    companies = backend.begin().search(db.Partner, [('id', 'in', parents)], fields=['name'])
+    before = rpc(store)
+    assert [sorted(k.name for k in x.child_ids) for x in companies] == [['K0', 'K3'], ['K1', 'K4'], ['K2', 'K5']]
+    assert rpc(store) == before + 1
+
+
+def test_one2many_ids_of_sibling_records_are_read_together(backend, store, db):
+    moves = store.seed('account.move', [{'name': f'M{i}'} for i in range(4)])
+    store.seed('account.move.line', [{'name': f'L{i}', 'move_id': moves[i % 4]} for i in range(12)])
+    ret = backend.begin().search(db.Move, [])
+    before = rpc(store)
+    assert [[l.name for l in m.line_ids] for m in ret] == [[f'L{i}', f'L{i + 4}', f'L{i + 8}'] for i in range(4)]
+    assert rpc(store) == before + 1
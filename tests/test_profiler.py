@@ -0,0 +1,24 @@
+import io
+
+
+def test_n_plus_one_reads_are_reported(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    trans = backend.begin()
+    out = io.StringIO()
+    trans.profile(n_plus_one=5, file=out)
+    for id in ids[:10]:
+        trans.get(db.Partner, 'id', id)
+    trans.search(db.Partner, [('name', '=', 'P15')])
+    trans.commit()
+    assert 'N+1: 10 single id reads of res.partner' in out.getvalue()
+
+
+def test_no_report_below_the_threshold(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(3)])
+    trans = backend.begin()
+    out = io.StringIO()
+    trans.profile(n_plus_one=5, file=out)
+    for id in ids:
+        trans.get(db.Partner, 'id', id)
+    trans.commit()
+    assert 'N+1' not in out.getvalue()
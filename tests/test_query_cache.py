@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from conftest import rpc
+from odoo_python_api_wrapper import OdooBackend, QueryCache
+from odoo_python_api_wrapper.async_api import AsyncOdooBackend
+from odoo_python_api_wrapper.query_cache import normalize_domain
+
+
+@pytest.fixture
+def cached(server):
+    backend = OdooBackend(server.url, username="admin", api_key="admin", query_cache=QueryCache())
+    yield backend
+    backend.close()
+
+
+def test_repeated_search_is_answered_by_the_query_cache(cached, store, db):
+    ids = store.seed('res.partner', [{'name': 'A'}, {'name': 'B'}, {'name': 'A'}])
+    assert [x.id for x in cached.begin().search(db.Partner, [('name', '=', 'A')])] == [ids[0], ids[2]]
+    before = rpc(store)
+    assert [x.id for x in cached.begin().search(db.Partner, [('name', '=', 'A')])] == [ids[0], ids[2]]
+    assert rpc(store) == before
+
+    trans = cached.begin()
+    trans.write('res.partner', ids[1], {'name': 'A'})
+    assert len(trans.search(db.Partner, [('name', '=', 'A')])) == 3
+
+
+def test_async_search_shares_the_query_cache(server, store, db):
+    ids = store.seed('res.partner', [{'name': 'A'}, {'name': 'B'}])
+    backend = AsyncOdooBackend(server.url, username="admin", api_key="admin", query_cache=QueryCache())
+
+    async def run():
+        ret = await backend.begin().search(db.Partner, [('name', '=', 'A')])
+        before = rpc(store)
+        again = await backend.begin().search(db.Partner, [('name', '=', 'A')])
+        return ret, again, rpc(store) - before
+
+    ret, again, calls = asyncio.run(run())
+    assert [x.id for x in ret] == [x.id for x in again] == [ids[0]]
+    assert calls == 0
+    assert backend.query_cache.stats()['hits'] == 1
+    assert [x.id for x in backend.begin().transaction.search(db.Partner, [('name', '=', 'A')])] == [ids[0]]
+    assert backend.query_cache.stats()['hits'] == 2
+    backend.close()
+
+
+@pytest.mark.parametrize("domain", [
+    [('parent_id', 'child_of', 1)],
+    [('parent_id', 'parent_of', 1)],
+    [('child_ids', 'in', [1])],
+    [('category_id', '=', 1)],
+    [('parent_id', 'ilike', 'comp')],
+    [('parent_id', 'in', ['Company'])],
+    [('parent_id', 'any', [('name', '=', 'x')])],
+    [('parent_id.name', '=', 'x')],
+])
+def test_domains_reaching_other_models_are_not_cached(cached, store, db, domain):
+    assert normalize_domain(domain, cached.field_types('res.partner')) is None
+    if domain[0][1] != 'any':
+        cached.begin().search(db.Partner, domain)
+    assert cached.query_cache.stats()['entries'] == 0
+
+
+def test_normalized_domains():
+    assert normalize_domain([('a', 'in', [2, 1]), ('b', '=', 1)]) == normalize_domain([('b', '=', 1), ('a', 'IN', [1, 2, 1])])
+    assert normalize_domain(['|', ('a', '=', 1), ('b', '=', 1)]) != normalize_domain(['|', ('b', '=', 1), ('a', '=', 1)])
+    assert normalize_domain([('parent_id', '=', 1)], {'parent_id': 'many2one'}) is not None
+    assert normalize_domain([('a', '=', {})]) is None
@@ -0,0 +1,19 @@
+import pytest
+
+
+def test_records_have_no_instance_dict(backend, store, db):
+    store.seed('res.partner', [{'name': 'A'}])
+    [x] = backend.begin().search(db.Partner, [])
+    assert not hasattr(x, '__dict__')
+    with pytest.raises(AttributeError):
+        x.not_a_field = 1
+
+
+def test_changes_and_relations_are_created_on_first_use(backend, store, db):
+    store.seed('res.partner', [{'name': 'A'}])
+    [x] = backend.begin().search(db.Partner, [])
+    assert x._changes is None and x._related is None and x._decoded is None
+    assert x.changes == {}
+    x.name = 'B'
+    assert x.changes == {'name': 'B'} and x.name == 'B'
+    assert x.category_id == () and x._related is not None
@@ -0,0 +1,76 @@
+from conftest import rpc
+
+
+def write(store, id, **vals):
+    store.data['res.partner'][id].update(vals, write_date='2099-01-01 00:00:00')
+
+
+def test_refresh_reads_written_records_and_drops_deleted_ones(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(10)])
+    for id in ids:
+        store.data['res.partner'][id]['write_date'] = '2024-01-01 00:00:00'
+    backend.begin().search(db.Partner, [('name', 'like', 'P')])
+    backend.refresh(db.Partner)
+
+    write(store, ids[0], name='changed')
+    del store.data['res.partner'][ids[1]]
+    assert backend.refresh(db.Partner) == (9, 1) # the rows written at the watermark's second are read again.
+    assert backend.refresh(db.Partner) == (1, 0)
+    assert backend.begin().get(db.Partner, 'id', ids[0]).name == 'changed'
+    assert f"res.partner:{ids[1]}" not in backend.cache
+    assert len(backend.cache.of_model('res.partner')) == 9
+
+
+def test_refresh_ignores_uncached_records_unless_preloaded(backend, store, db):
+    store.seed('res.partner', [{'name': 'P0'}])
+    backend.begin().search(db.Partner, [('name', '=', 'P0')])
+    store.seed('res.partner', [{'name': 'Other'}])
+    backend.refresh(db.Partner)
+    assert len(backend.cache.of_model('res.partner')) == 1
+
+    backend.preload(db.Partner)
+    new = store.seed('res.partner', [{'name': 'Outside'}])[0]
+    store.data['res.partner'][new]['write_date'] = '2099-01-01 00:00:00'
+    backend.refresh(db.Partner)
+    before = rpc(store)
+    assert [x.id for x in backend.begin().search(db.Partner, [('name', '=', 'Outside')])] == [new]
+    assert rpc(store) == before
+
+
+def test_refresh_updates_archived_records(backend, store, db):
+    k1 = store.seed('res.partner', [{'name': 'K1'}, {'name': 'K2'}])[0]
+    backend.preload(db.Partner)
+    write(store, k1, active=False)
+    backend.refresh(db.Partner)
+    assert backend.cache[f"res.partner:{k1}"].get_value('active') is False
+    assert [x.name for x in backend.begin().search(db.Partner, [])] == ['K2']
+
+
+def test_refresh_of_every_cached_model(backend, store, db):
+    store.seed('res.partner', [{'name': 'P0'}])
+    store.seed('res.partner.category', [{'name': 'C0'}])
+    trans = backend.begin()
+    trans.search(db.Partner, [])
+    trans.search(db.Category, [])
+    assert backend.refresh() == (2, 0) # the first refresh reads the rows at the cached write_date again.
+
+
+def test_refresh_without_write_date_reads_the_cached_ids_in_chunks(backend, store, db, monkeypatch):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(25)])
+    for id in ids:
+        del store.data['res.partner'][id]['write_date']
+    backend.search_page_size = 10
+    backend.begin().search(db.Partner, [])
+    store.data['res.partner'][ids[20]]['name'] = 'changed'
+    domains = []
+    call = store._call
+
+    def record(model, method, args, kwargs):
+        if method == 'search_read':
+            domains.append(args[0])
+        return call(model, method, args, kwargs)
+
+    monkeypatch.setattr(store, '_call', record)
+    assert backend.refresh(db.Partner) == (25, 0)
+    assert max(len(d[0][2]) for d in domains) == 10
+    assert backend.begin().get(db.Partner, 'id', ids[20]).name == 'changed'
@@ -0,0 +1,38 @@
+import asyncio
+
+from conftest import rpc
+from odoo_python_api_wrapper.async_api import AsyncOdooBackend
+
+
+def test_only_the_missing_ids_are_read(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    trans = backend.begin()
+    trans.search(db.Partner, [('id', 'in', ids[:5])])
+    before = rpc(store)
+    ret = trans.search(db.Partner, [('id', 'in', [ids[10], ids[2], 9999, ids[0], ids[2]])])
+    assert [x.id for x in ret] == [ids[10], ids[2], ids[0]] # in the requested order, without duplicates.
+    assert rpc(store) == before + 1
+    assert [x.id for x in trans.search(db.Partner, [('id', 'in', [ids[10], ids[1]])])] == [ids[10], ids[1]]
+    assert rpc(store) == before + 1
+
+
+def test_ids_are_read_in_pages(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(25)])
+    backend.search_page_size = 10
+    assert len(backend.begin().search(db.Partner, [('id', 'in', ids)])) == 25
+    assert rpc(store, 'res.partner', 'search_read') == 3
+
+
+def test_async_search_reads_only_the_missing_ids(server, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(5)])
+    backend = AsyncOdooBackend(server.url, username="admin", api_key="admin")
+
+    async def run():
+        trans = backend.begin()
+        await trans.search(db.Partner, [('id', 'in', ids[:2])])
+        before = rpc(store)
+        ret = await trans.search(db.Partner, [('id', 'in', [ids[3], ids[1], ids[0]])])
+        return [x.id for x in ret], rpc(store) - before
+
+    assert asyncio.run(run()) == ([ids[3], ids[1], ids[0]], 1)
+    backend.close()
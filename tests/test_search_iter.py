@@ -0,0 +1,94 @@
+import pytest
+
+from conftest import rpc
+
+
+def test_search_reads_every_page(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i % 7}'} for i in range(25)])
+    backend.search_page_size = 10
+    ret = backend.begin().search(db.Partner, [('name', 'like', 'P')])
+    assert [x.id for x in ret] == ids
+    assert rpc(store, 'res.partner', 'search_read') == 3 # the first page, then the ids it did not have in two chunks.
+    assert rpc(store, 'res.partner', 'search') == 1
+
+
+def test_search_keeps_the_default_order(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i:02}'} for i in range(25)])
+    store.orders['res.partner'] = 'name desc'
+    names = [f'P{i:02}' for i in reversed(range(25))]
+    trans = backend.begin()
+    assert [x.name for x in trans.search(db.Partner, [])] == names
+    assert rpc(store) == 1 # it fits in one page.
+    backend.search_page_size = 10
+    trans = backend.begin()
+    assert [x.name for x in trans.search(db.Partner, [])] == names
+    assert trans.search_first(db.Partner, [('name', 'like', 'P')]).name == 'P24'
+    assert [x.get_value('name') for x in trans.search_raw('res.partner', [], ['name'])] == names
+    assert [x.name for x in trans.search_iter(db.Partner, [])] == sorted(names) # search_iter reads by id.
+
+
+def test_search_leaves_out_rows_deleted_while_paging(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(25)])
+    backend.search_page_size = 10
+    call = store._call
+
+    def delete_after_search(model, method, args, kwargs):
+        ret = call(model, method, args, kwargs)
+        if method == 'search':
+            del store.data['res.partner'][ids[20]]
+        return ret
+
+    store._call = delete_after_search
+    try:
+        ret = backend.begin().search(db.Partner, [])
+    finally:
+        del store._call
+    assert [x.id for x in ret] == ids[:20] + ids[21:]
+
+
+def test_search_iter_does_not_keep_the_records(backend, store, db):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(25)])
+    trans = backend.begin()
+    seen = [x.id for x in trans.search_iter(db.Partner, [], page_size=10)]
+    assert seen == ids
+    assert not trans.cache and not trans.objects
+    assert not backend.cache.of_model('res.partner')
+
+
+def test_search_iter_records_join_the_transaction_when_changed(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}'} for i in range(5)])
+    trans = backend.begin()
+    for x in trans.search_iter(db.Partner, [], page_size=2):
+        if x.name == 'P3':
+            x.name = 'changed'
+    assert len(trans.objects) == 1
+    trans.commit()
+    assert sorted(r['name'] for r in store.data['res.partner'].values()) == ['P0', 'P1', 'P2', 'P4', 'changed']
+
+
+def test_search_iter_yields_the_records_the_transaction_has(backend, store, db):
+    store.seed('res.partner', [{'name': 'P0'}])
+    trans = backend.begin()
+    [p] = trans.search(db.Partner, [])
+    p.name = 'pending'
+    assert [x for x in trans.search_iter(db.Partner, [])] == [p]
+    assert next(iter(trans.search_iter(db.Partner, []))) is p
+
+
+def test_search_raw_iter_with_order(backend, store, db):
+    store.seed('res.partner', [{'name': n} for n in 'cab'])
+    names = [x.get_value('name') for x in backend.begin().search_raw_iter('res.partner', [], ['name'], page_size=2, order='name')]
+    assert names == ['a', 'b', 'c']
+
+
+def test_changing_a_record_read_again_since_it_was_yielded(backend, store, db):
+    [id] = store.seed('res.partner', [{'name': 'A'}])
+    trans = backend.begin()
+    [yielded] = trans.search_iter(db.Partner, [])
+    again = trans.get(db.Partner, 'id', id)
+    assert again is not yielded
+    with pytest.raises(ValueError, match="read again"):
+        yielded.name = 'lost'
+    again.name = 'B'
+    trans.commit()
+    assert store.data['res.partner'][id]['name'] == 'B'
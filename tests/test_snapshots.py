@@ -0,0 +1,27 @@
+def test_transactions_share_snapshots_until_they_change_them(backend, store, db):
+    [id] = store.seed('res.partner', [{'name': 'A'}])
+    first = backend.begin().get(db.Partner, 'id', id)
+    snapshot = backend.cache[f"res.partner:{id}"]
+    assert snapshot.transaction is backend.snapshots
+
+    trans = backend.begin()
+    x = trans.get(db.Partner, 'id', id)
+    assert x is not snapshot and x.transaction is trans
+    assert x.peek_wrapped_oject() is snapshot.peek_wrapped_oject()
+
+    x.name = 'B'
+    assert snapshot.name == 'A' and first.name == 'A'
+    trans.commit()
+    assert store.data['res.partner'][id]['name'] == 'B'
+    assert backend.cache[f"res.partner:{id}"].name == 'B'
+    assert snapshot.name == 'A'
+
+
+def test_relations_of_adopted_records_stay_in_their_transaction(backend, store, db):
+    [parent] = store.seed('res.partner', [{'name': 'C'}])
+    [kid] = store.seed('res.partner', [{'name': 'K', 'parent_id': parent}])
+    backend.begin().get(db.Partner, 'id', kid).parent_id
+    trans = backend.begin()
+    p = trans.get(db.Partner, 'id', kid).parent_id
+    assert p.transaction is trans and p.id == parent
+    assert trans.get(db.Partner, 'id', parent) is p
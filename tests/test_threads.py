@@ -0,0 +1,54 @@
+import threading
+
+from odoo_python_api_wrapper.record_store import ConcurrentRecordStore
+
+
+def test_workers_share_the_backend_cache(backend, store, db):
+    parents = store.seed('res.partner', [{'name': f'C{i}'} for i in range(5)])
+    store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x', 'parent_id': parents[i % 5]} for i in range(200)])
+    backend.begin().search(db.Partner, [])
+    errors = []
+
+    def work(n:int) -> None:
+        try:
+            for k in range(5):
+                trans = backend.begin()
+                for i in range(n, 200, 8):
+                    p = trans.get(db.Partner, 'email', f'p{i}@x')
+                    assert p.name in (f'P{i}', f'T{i}')
+                    assert p.parent_id.id == parents[i % 5]
+                trans.get(db.Partner, 'email', f'p{n * 10 + k}@x').name = f'T{n * 10 + k}'
+                trans.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    trans = backend.begin()
+    for n in range(8):
+        for k in range(5):
+            assert trans.get(db.Partner, 'name', f'T{n * 10 + k}').email == f'p{n * 10 + k}@x'
+
+
+def test_concurrent_store_keeps_its_indexes(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}', 'email': f'p{i}@x'} for i in range(400)])
+    records = backend.begin().search(db.Partner, [])
+    cache = ConcurrentRecordStore()
+
+    def fill(part:int) -> None:
+        for x in records[part::4]:
+            cache[f"res.partner:{x.id}"] = x
+            if x.id % 2:
+                cache.pop(f"res.partner:{x.id}")
+
+    threads = [threading.Thread(target=fill, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) == 200
+    assert all(cache.lookup('res.partner', 'email', x.email) == ([] if x.id % 2 else [x]) for x in records)
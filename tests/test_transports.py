@@ -0,0 +1,39 @@
+import pytest
+
+from odoo_python_api_wrapper import OdooBackend
+from odoo_python_api_wrapper.transports import JsonRpcTransport, OdooRpcError, XmlRpcTransport
+
+
+@pytest.mark.parametrize("transport", ["xmlrpc", "jsonrpc", JsonRpcTransport])
+def test_records_are_the_same_over_every_transport(server, store, db, transport):
+    store.seed('res.partner', [{'name': 'A', 'email': 'a@x'}, {'name': 'B'}])
+    backend = OdooBackend(server.url, username="admin", api_key="admin", transport=transport)
+    [a, b] = backend.begin().search(db.Partner, [])
+    assert (a.name, a.email, b.name, b.email) == ('A', 'a@x', 'B', '')
+    backend.close()
+
+
+def test_transport_choice(server):
+    backend = OdooBackend(server.url, username="admin", api_key="admin")
+    assert isinstance(backend.transport, XmlRpcTransport)
+    with pytest.raises(ValueError, match="Unknown transport"):
+        OdooBackend(server.url, username="admin", api_key="admin", transport="soap")
+    backend.close()
+
+
+def test_jsonrpc_errors(server, store):
+    backend = OdooBackend(server.url, username="admin", api_key="admin", transport="jsonrpc")
+    with pytest.raises(OdooRpcError, match="does not exist"):
+        backend.begin()._execute_kw('res.partner', 'write', [[12345], {'name': 'x'}])
+    backend.close()
+
+
+@pytest.mark.parametrize("transport", ["xmlrpc", "jsonrpc"])
+def test_execute_actionj_returns_the_result_of_the_call(server, store, transport):
+    ids = store.seed('res.partner', [{'name': 'A'}, {'name': 'B'}])
+    backend = OdooBackend(server.url, username="admin", api_key="admin", transport=transport)
+    trans = backend.begin()
+    assert trans.execute_actionj('res.partner', 'search', [[('name', '=', 'B')]]) == [ids[1]]
+    assert trans.execute_model_action('res.partner', 'search_count', [[]]) == 2
+    assert trans.execute_loginj() == 2 # the uid.
+    backend.close()
@@ -0,0 +1,64 @@
+import pytest
+
+from conftest import rpc
+from odoo_python_api_wrapper import OdooBackend
+from odoo_python_api_wrapper.fake_server import FakeOdooAccessError, FakeOdooError
+
+
+def test_deletes_are_sent_in_chunks(backend, store, db):
+    store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    backend.unlink_chunk_size = 8
+    trans = backend.begin()
+    for x in trans.search(db.Partner, []):
+        x.delete()
+    trans.commit()
+    assert store.data['res.partner'] == {}
+    assert rpc(store, 'res.partner', 'unlink') == 3
+
+
+def test_failing_records_are_isolated(backend, store):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    backend.unlink_chunk_size = 8
+    del store.data['res.partner'][ids[12]]
+    del store.data['res.partner'][ids[13]]
+    with pytest.raises(ValueError, match=rf"ids \[{ids[12]}, {ids[13]}\]"):
+        backend.begin().execute_delete('res.partner', ids)
+    assert store.data['res.partner'] == {}
+
+
+def test_constraint_faults_are_split_down_to_the_record(backend, store, monkeypatch):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    backend.unlink_chunk_size = 16
+    bad = {ids[2], ids[11]}
+    call = store._call
+
+    def constrained(model, method, args, kwargs):
+        if method == 'unlink' and bad & set(args[0]):
+            raise FakeOdooError("The operation cannot be completed: another model requires the record being deleted.")
+        return call(model, method, args, kwargs)
+
+    monkeypatch.setattr(store, '_call', constrained)
+    with pytest.raises(ValueError, match=rf"ids \[{ids[2]}, {ids[11]}\]"):
+        backend.begin().execute_delete('res.partner', ids)
+    assert sorted(store.data['res.partner']) == sorted(bad) # the 14 others of the chunk and the next chunk are gone.
+
+
+@pytest.mark.parametrize("transport", ["xmlrpc", "jsonrpc"])
+def test_access_errors_are_raised_as_they_are(server, store, monkeypatch, transport):
+    ids = store.seed('res.partner', [{'name': f'P{i}'} for i in range(20)])
+    backend = OdooBackend(server.url, username="admin", api_key="admin", transport=transport)
+    backend.unlink_chunk_size = 8
+    call = store._call
+
+    def denied(model, method, args, kwargs):
+        if method == 'unlink':
+            raise FakeOdooAccessError("You are not allowed to delete 'Contact' records.")
+        return call(model, method, args, kwargs)
+
+    monkeypatch.setattr(store, '_call', denied)
+    with pytest.raises(Exception, match="not allowed") as e:
+        backend.begin().execute_delete('res.partner', ids)
+    assert not isinstance(e.value, ValueError)
+    assert rpc(store, 'res.partner', 'unlink') == 1 # no smaller chunk would pass.
+    assert len(store.data['res.partner']) == 20
+    backend.close()